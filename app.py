@@ -3,9 +3,11 @@ import json
 import sys
 import subprocess
 from pathlib import Path
-from gui import create_crypto_ui
 from trader import CryptoTrader
-import asyncio
+from logger import setup_logging
+from metrics import start_metrics_server
+from profiler import install_profiler_controls
+from startup import record_startup
 import threading
 import time
 
@@ -50,6 +52,7 @@ def run_crewai_workflow():
         else:
             print("❌ CrewAI workflow failed")
             print(f"Error: {result.stderr}")
+            print("🔁 Completed steps were checkpointed; run again to resume from the failed step (CREW_RESUME=0 starts over)")
             return False
             
     except subprocess.TimeoutExpired:
@@ -59,35 +62,41 @@ def run_crewai_workflow():
         print(f"❌ Error running CrewAI workflow: {e}")
         return False
 
-def trading_loop(trader):
+def trading_loop(trader, interval: float = 30, stop: threading.Event = None):
     print("🤖 Trading bot started independently")
-    while True:
+    stop = stop or threading.Event()
+    while not stop.is_set():
         try:
             trader.refresh()
-            time.sleep(30)
+            stop.wait(interval)
         except Exception as e:
             print(f"❌ Trading error: {e}")
-            time.sleep(5)
+            stop.wait(5)
 
 def run_gui():
     """Launch the crypto trading bot GUI"""
+    setup_logging()
     try:
         print("🚀" + "=" * 60)
         print("🚀 CRYPTO TRADING BOT DASHBOARD")
         print("🚀" + "=" * 60)
         print("=" * 62)
         print("🌐 Dashboard URL: http://localhost:7860")
-        print("🔄 Auto-refresh: Every 30 seconds")
+        print("🔄 Live updates: pushed as candles, fills and logs arrive")
         print("📱 Responsive design for all devices")
         print("=" * 62)
         print("🛑 Press Ctrl+C to stop the dashboard")
         print("=" * 62)
         
-        ui = create_crypto_ui()
+        from gui import create_crypto_ui
         
         trader = CryptoTrader("CryptoBot")
+        ui = create_crypto_ui(trader)
+        start_metrics_server()
+        install_profiler_controls()
+        record_startup("gui")
         
-        trading_thread = threading.Thread(target=trading_loop, args=(trader,), daemon=True)
+        trading_thread = threading.Thread(target=trading_loop, args=(trader,), name="trading-loop", daemon=True)
         trading_thread.start()
         
         print("✅ Trading bot started independently")
@@ -110,6 +119,7 @@ def run_gui():
 
 def main():
     """Main pipeline function"""
+    setup_logging()
     print("🚀 Crypto Trading Bot")
     print("=" * 40)
     
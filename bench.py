@@ -0,0 +1,157 @@
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def measure(fn, setup=None, iterations: int = 30, budget: float = 10.0, warmup: int = 1, memory: bool = True) -> dict:
+    """Time fn() until `iterations` runs or `budget` seconds, then trace one extra run for peak memory
+
+    `setup` runs before every call and is not timed; its return value is passed to fn.
+    """
+    if setup is None:
+        setup, target = (lambda: None), (lambda _: fn())
+    else:
+        target = fn
+
+    for _ in range(warmup):
+        target(setup())
+
+    samples = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < iterations and (not samples or time.perf_counter() < deadline):
+        arg = setup()
+        start = time.perf_counter()
+        target(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    peak_mb = None
+    if memory:
+        arg = setup()
+        tracemalloc.start()
+        try:
+            target(arg)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
+
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    mean = statistics.fmean(samples)
+    return {
+        "runs": len(samples),
+        "mean_ms": mean,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1],
+        "ops_per_s": 1000 / mean if mean else 0.0,
+        "peak_mb": peak_mb,
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "ts": time.time(),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, suite: str, results: dict, params: dict = None) -> dict:
+    report = {"suite": suite, "env": environment(), "params": params or {}, "results": results}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2, metric: str = "p50_ms") -> list:
+    """Rows of (case, baseline, current, change) for cases present in both; change is relative"""
+    rows = []
+    for case, result in current["results"].items():
+        before = baseline["results"].get(case)
+        if not before or not before.get(metric):
+            continue
+        change = result[metric] / before[metric] - 1
+        rows.append({"case": case, "baseline": before[metric], "current": result[metric],
+                     "change": change, "regressed": change > threshold})
+    return rows
+
+
+def format_results(results: dict) -> str:
+    per_bar = any("ns_per_bar" in r for r in results.values())
+    header = f"{'case':<48} {'runs':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'peak MB':>9}"
+    lines = [header + (f" {'ns/bar':>9}" if per_bar else "")]
+    for case, r in results.items():
+        peak = f"{r['peak_mb']:.1f}" if r.get("peak_mb") is not None else "-"
+        line = (f"{case:<48} {r['runs']:>5} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['p99_ms']:>10.3f} "
+                f"{r['ops_per_s']:>10.1f} {peak:>9}")
+        if per_bar:
+            line += f" {r['ns_per_bar']:>9.0f}" if "ns_per_bar" in r else f" {'-':>9}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_comparison(rows: list) -> str:
+    lines = [f"{'case':<48} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for row in rows:
+        flag = "  ❌" if row["regressed"] else ""
+        lines.append(f"{row['case']:<48} {row['baseline']:>10.3f} {row['current']:>10.3f} {row['change']:>+7.1%}{flag}")
+    return "\n".join(lines)
+
+
+def add_arguments(parser, default_output: str, default_baseline: str):
+    parser.add_argument("--output", default=default_output, help="Where to write this run's JSON results")
+    parser.add_argument("--baseline", default=default_baseline, help="Stored results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_THRESHOLD", "0.2")),
+                        help="Relative p50 slowdown that counts as a regression (default 0.2 = 20%%)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds to spend timing each case")
+
+
+def finish(args, suite: str, results: dict, params: dict) -> int:
+    """Write results, compare with the baseline and return a non-zero exit code on regression"""
+    report = write_results(args.output, suite, results, params)
+    print(format_results(results))
+    print(f"\n📄 Results written to {args.output}")
+
+    status = 0
+    if args.baseline and Path(args.baseline).exists() and not args.save_baseline:
+        rows = compare(report, load_results(args.baseline), args.threshold)
+        print(f"\n📊 Compared with {args.baseline} (threshold {args.threshold:+.0%}):")
+        regressed = [row["case"] for row in rows if row["regressed"]]
+        if not rows:
+            print("⚠️ No cases in common with the baseline")
+        else:
+            print(format_comparison(rows))
+        if regressed:
+            print(f"\n❌ {len(regressed)} case(s) regressed: {', '.join(regressed)}")
+            status = 1
+        else:
+            print("\n✅ No regressions")
+    if args.save_baseline:
+        write_results(args.baseline, suite, results, params)
+        print(f"📌 Baseline saved to {args.baseline}")
+    return status
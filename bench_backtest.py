@@ -0,0 +1,115 @@
+import argparse
+import logging
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+import bench
+from mock_exchange import GENERATORS, synthetic_ohlcv
+
+RULES = {
+    "ema_cross": (
+        "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+        "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))",
+    ),
+    "rsi_reversion": (
+        "df['rsi_14'] < 30",
+        "df['rsi_14'] > 70",
+    ),
+    "macd_momentum": (
+        "(df['macd'] > df['macd_signal']) & (df['macd_hist'] > 0)",
+        "df['macd'] < df['macd_signal']",
+    ),
+    "bollinger_breakout": (
+        "df['close'] > df['bb_upper']",
+        "df['close'] < df['ema_20']",
+    ),
+    "rolling_breakout": (
+        "df['close'] > df['close'].rolling(50).max().shift(1)",
+        "df['close'] < df['close'].rolling(20).min().shift(1)",
+    ),
+    "multi_condition": (
+        "(df['ema_10'] > df['ema_50']) & (df['rsi_14'] > 40) & (df['rsi_14'] < 60) & (df['close'] > df['vwap'])",
+        "(df['ema_10'] < df['ema_50']) | (df['rsi_14'] > 75)",
+    ),
+}
+
+
+def enrich(df: pd.DataFrame) -> pd.DataFrame:
+    """Same indicator pass and gap filling FetchOHLCV applies before saving its CSV"""
+    from crypto.tools.fetch_tool import FetchOHLCVTool
+
+    df = FetchOHLCVTool()._add_indicators(df.copy())
+    return df.bfill().ffill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark reading, enriching and backtesting synthetic OHLCV data")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Comma-separated bar counts (up to 10000000)")
+    parser.add_argument("--generators", default=",".join(GENERATORS))
+    parser.add_argument("--rules", default=",".join(RULES))
+    parser.add_argument("--timeframe", default="1m")
+    bench.add_arguments(parser, "output/bench/backtest.json", "output/bench/backtest_baseline.json")
+    args = parser.parse_args(argv)
+
+    from crypto.backtest import performance_metrics, run_backtest
+    from crypto.tools.backtest_tool import BacktestTool
+
+    warnings.filterwarnings("ignore", category=RuntimeWarning)
+    logging.getLogger("crypto").setLevel(logging.WARNING)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    generators = args.generators.split(",")
+    rules = args.rules.split(",")
+
+    def measure(bars, fn, setup=None):
+        big = bars >= 1_000_000
+        result = bench.measure(fn, setup, iterations=1 if big else args.iterations, budget=args.budget,
+                               warmup=0 if big else 1)
+        result["ns_per_bar"] = result["p50_ms"] * 1e6 / bars
+        return result
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for bars in sizes:
+            for generator in generators:
+                print(f"⏱️ {generator} × {bars:,} bars")
+                raw = synthetic_ohlcv(bars, args.timeframe, kind=generator)
+                raw.index.name = "timestamp"
+
+                enrich_key = f"enrich/{generator}@{bars}"
+                results[enrich_key] = measure(bars, lambda: enrich(raw))
+                df = enrich(raw)
+
+                csv_path = Path(workdir) / f"{generator}_{bars}.csv"
+                df.to_csv(csv_path)
+                read_key = f"read/{generator}@{bars}"
+                results[read_key] = measure(bars, lambda: pd.read_csv(csv_path, parse_dates=True, index_col="timestamp"))
+
+                for rule in rules:
+                    entry_rules, exit_rules = RULES[rule]
+
+                    def backtest():
+                        run = run_backtest(df, entry_rules, exit_rules, 2, 4, 50)
+                        return performance_metrics(run["equity"], run["trades"])
+
+                    def end_to_end():
+                        return BacktestTool()._run(rule, "BTCUSDT", entry_rules, exit_rules, 2, 4, 50,
+                                                   args.timeframe, str(csv_path))
+
+                    results[f"backtest/{generator}/{rule}@{bars}"] = measure(bars, backtest)
+                    results[f"end_to_end/{generator}/{rule}@{bars}"] = measure(bars, end_to_end)
+                    print(f"   {rule}: {results[f'backtest/{generator}/{rule}@{bars}']['ns_per_bar']:.0f} ns/bar backtest, "
+                          f"{results[f'end_to_end/{generator}/{rule}@{bars}']['p50_ms']:.1f} ms end to end")
+                csv_path.unlink()
+
+    params = {"sizes": sizes, "generators": generators, "rules": {rule: RULES[rule] for rule in rules},
+              "timeframe": args.timeframe}
+    return bench.finish(args, "backtest", results, params)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+import bench
+from logger import setup_logging
+from mock_exchange import MockExchange, synthetic_ohlcv
+
+STRATEGY = {
+    "strategy_id": "bench_ema_rsi",
+    "coin_symbol": "BTCUSDT",
+    "timeframe": "1m",
+    "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['rsi_14'] < 70)",
+    "exit_rules": "(df['ema_10'] < df['ema_20']) | (df['rsi_14'] > 80)",
+    "stop_loss": 2,
+    "take_profit": 4,
+    "allocation": 50,
+}
+
+
+def make_trader(rows: int, extra: int, workdir: str, seed: int = 0):
+    """CryptoTrader on a mock exchange with `rows` candles buffered and `extra` left to reveal"""
+    from ledger import TradeLedger
+    from notifier import NotificationDispatcher
+    from trader import CryptoTrader
+    from tsdb import TimeSeriesStore
+
+    strategy_file = Path(workdir) / "strategy.json"
+    strategy_file.write_text(json.dumps({"strategy": STRATEGY, "performance": {}}))
+    exchange = MockExchange("BTCUSDT", "1m", candles=synthetic_ohlcv(rows + extra, "1m", seed=seed), cursor=rows - 1)
+    trader = CryptoTrader("Bench", strategy_file=str(strategy_file), data_client=exchange, trading_client=exchange,
+                          clock=exchange.now, notifier=NotificationDispatcher([]), candle_bus=False,
+                          ledger=TradeLedger(":memory:"), telemetry=TimeSeriesStore(":memory:", clock=exchange.now))
+    if trader.buffer_size != rows:
+        trader.buffer_size = rows
+        trader.initialize()
+    return trader, exchange
+
+
+def fill_ledger(trader, count: int):
+    start = trader.clock() - count * 60
+    for i in range(count):
+        side = "BUY" if i % 2 == 0 else "SELL"
+        pnl = None if side == "BUY" else (i % 7 - 3) * 0.5
+        trader.ledger.record(side, trader.symbol, STRATEGY["strategy_id"], 0.01, 50000 + i % 100,
+                             order_id=i, pnl_pct=pnl, pnl_value=pnl, ts=start + i * 60)
+
+
+def run_size(rows: int, iterations: int, budget: float) -> dict:
+    extra = iterations * 8 + 50
+    with tempfile.TemporaryDirectory() as workdir:
+        trader, exchange = make_trader(rows, extra, workdir)
+        fill_ledger(trader, rows)
+        pages = trader.get_transaction_pages()
+
+        def next_candle():
+            exchange.advance()
+            return exchange.get_klines(symbol=trader.symbol, interval=trader.timeframe, limit=1)[0]
+
+        def after_new_candle():
+            trader.update_with_new_candle(next_candle())
+
+        def before_refresh():
+            trader.post_trade.join()
+            exchange.advance()
+
+        cases = {
+            "refresh": dict(fn=lambda _: trader.refresh(), setup=before_refresh),
+            "update_with_new_candle": dict(fn=trader.update_with_new_candle, setup=next_candle),
+            "check_strategy_signals": dict(fn=lambda: trader.check_strategy_signals(trader.strategy)),
+            "get_coin_price_chart[Live]": dict(fn=lambda _: trader.get_coin_price_chart("Live"), setup=after_new_candle),
+            "get_coin_price_chart[All]": dict(fn=lambda _: trader.get_coin_price_chart("All"), setup=after_new_candle),
+            "get_transactions_df[first]": dict(fn=lambda: trader.get_transactions_df(0)),
+            "get_transactions_df[last]": dict(fn=lambda: trader.get_transactions_df(pages - 1)),
+        }
+        results = {}
+        for name, case in cases.items():
+            results[f"{name}@{rows}"] = bench.measure(case["fn"], case.get("setup"), iterations=iterations, budget=budget)
+            print(f"   {name}@{rows}: p50 {results[f'{name}@{rows}']['p50_ms']:.3f} ms")
+        trader.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark one live trading tick and the dashboard reads it triggers")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated buffer sizes in candles")
+    bench.add_arguments(parser, "output/bench/live.json", "output/bench/live_baseline.json")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    for name in ("crypto.trader", "crypto.worker"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {}
+    for rows in sizes:
+        print(f"⏱️ Buffer of {rows:,} candles")
+        results.update(run_size(rows, args.iterations, args.budget))
+    return bench.finish(args, "live", results, {"sizes": sizes, "strategy": STRATEGY})
+
+
+if __name__ == "__main__":
+    sys.exit(main())
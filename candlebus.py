@@ -0,0 +1,301 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from logger import get_logger, setup_logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+log = get_logger("candlebus")
+
+CANDLE_DIR = os.getenv("CANDLE_BUS_DIR", "output/candles")
+
+MAGIC = b"CNDLRNG1"
+HEADER_SIZE = 4096
+NAME_SIZE = 32
+# magic, capacity, column count, then the seqlock counter and the number of rows ever written
+LAYOUT = struct.Struct("<8sII")
+SEQ_OFFSET = 16
+COUNT_OFFSET = 24
+NAMES_OFFSET = 64
+MAX_COLUMNS = (HEADER_SIZE - NAMES_OFFSET) // NAME_SIZE
+
+
+def ring_path(symbol: str, timeframe: str, directory: str = CANDLE_DIR) -> Path:
+    return Path(directory) / f"{symbol.upper()}_{timeframe}.ring"
+
+
+class CandleRing:
+    """Memory-mapped ring of candles plus indicator columns, shared between processes through one file
+
+    Every row is stored twice, at slot i and slot i + capacity, so the latest n rows are always one
+    contiguous slice and readers get NumPy views straight onto the shared pages.
+    """
+
+    def __init__(self, path, writable: bool = False):
+        self.path = Path(path)
+        self._file = open(self.path, "r+b" if writable else "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        magic, self.capacity, ncols = LAYOUT.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a candle ring")
+        names = self._map[NAMES_OFFSET:NAMES_OFFSET + ncols * NAME_SIZE]
+        self.columns = [names[i * NAME_SIZE:(i + 1) * NAME_SIZE].rstrip(b"\0").decode() for i in range(ncols)]
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._seq = np.ndarray((1,), np.uint64, self._map, SEQ_OFFSET)
+        self._count = np.ndarray((1,), np.uint64, self._map, COUNT_OFFSET)
+        slots = 2 * self.capacity
+        self.timestamps = np.ndarray((slots,), np.int64, self._map, HEADER_SIZE)
+        self.values = np.ndarray((ncols, slots), np.float64, self._map, HEADER_SIZE + slots * 8)
+
+    @staticmethod
+    def size(capacity: int, ncols: int) -> int:
+        return HEADER_SIZE + 2 * capacity * 8 * (ncols + 1)
+
+    @property
+    def seq(self) -> int:
+        return int(self._seq[0])
+
+    @property
+    def count(self) -> int:
+        return int(self._count[0])
+
+    def close(self):
+        for name in ("timestamps", "values", "_seq", "_count"):
+            self.__dict__.pop(name, None)
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # windows handed out still reference the pages; the mapping goes away with them
+        self._file.close()
+
+    def replaced(self) -> bool:
+        """Whether the file was recreated (new capacity or columns) since this ring was opened"""
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except OSError:
+            return True
+
+
+class CandleRingWriter(CandleRing):
+    """The single feed for one symbol and timeframe; holds an exclusive lock on the ring for its lifetime"""
+
+    def __init__(self, symbol: str, timeframe: str, columns, capacity: int = 4096, directory: str = CANDLE_DIR):
+        columns = [str(c) for c in columns]
+        if len(columns) > MAX_COLUMNS:
+            raise ValueError(f"At most {MAX_COLUMNS} columns fit in a ring header, got {len(columns)}")
+        path = ring_path(symbol, timeframe, directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(path.with_suffix(".lock"), "a+")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                raise RuntimeError(f"Another process is already feeding {path}")
+
+        if not self._compatible(path, columns, capacity):
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.truncate(self.size(capacity, len(columns)))
+                f.seek(0)
+                f.write(LAYOUT.pack(MAGIC, capacity, len(columns)))
+                f.seek(NAMES_OFFSET)
+                f.write(b"".join(name.encode()[:NAME_SIZE].ljust(NAME_SIZE, b"\0") for name in columns))
+            os.replace(tmp, path)
+        super().__init__(path, writable=True)
+        if self.seq % 2:
+            self._seq[0] += 1
+
+    @staticmethod
+    def _compatible(path: Path, columns, capacity: int) -> bool:
+        if not path.exists():
+            return False
+        try:
+            ring = CandleRing(path)
+        except (ValueError, OSError):
+            return False
+        same = ring.columns == columns and ring.capacity == capacity
+        ring.close()
+        return same
+
+    def _write(self, timestamps: np.ndarray, values: np.ndarray, count: int):
+        """Seqlock-protected write of rows (timestamps[m], values[ncols, m]) starting at row `count`"""
+        m = len(timestamps)
+        if m > self.capacity:
+            count += m - self.capacity
+            timestamps, values = timestamps[-self.capacity:], values[:, -self.capacity:]
+            m = self.capacity
+        slots = np.arange(count, count + m) % self.capacity
+        self._seq[0] += 1
+        self.timestamps[slots] = timestamps
+        self.timestamps[slots + self.capacity] = timestamps
+        self.values[:, slots] = values
+        self.values[:, slots + self.capacity] = values
+        self._count[0] = count + m
+        self._seq[0] += 1
+
+    def publish_frame(self, df: pd.DataFrame):
+        """Replace the ring's contents with a whole history, for example the trader's initial buffer"""
+        timestamps = df.index.as_unit("ms").asi8
+        values = df.reindex(columns=self.columns).to_numpy(dtype=np.float64, na_value=np.nan).T
+        self._write(timestamps, values, 0)
+
+    def append(self, timestamp, row):
+        """Add one candle; a candle with the same open time as the last one replaces it in place"""
+        ts = pd.DatetimeIndex([timestamp]).as_unit("ms").asi8[0]
+        values = np.array([[float(row.get(name, np.nan))] for name in self.columns])
+        count = self.count
+        if count and int(self.timestamps[(count - 1) % self.capacity]) == ts:
+            count -= 1
+        self._write(np.array([ts], np.int64), values, count)
+
+    def close(self):
+        super().close()
+        if fcntl is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._lock_file.close()
+
+
+class CandleWindow:
+    """The latest rows of a ring as column arrays; views onto shared memory unless copied"""
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray, columns, seq: int, count: int):
+        self.timestamps = timestamps
+        self.values = values
+        self.columns = columns
+        self.seq = seq
+        self.count = count
+        self._index = {name: i for i, name in enumerate(columns)}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.values[self._index[column]]
+
+    def frame(self) -> pd.DataFrame:
+        index = pd.DatetimeIndex(pd.to_datetime(self.timestamps, unit="ms"), name="timestamp")
+        return pd.DataFrame(dict(zip(self.columns, self.values)), index=index)
+
+
+class CandleReader(CandleRing):
+    """Lock-free reader: retries while the writer is mid-update, never blocks it"""
+
+    def __init__(self, symbol: str, timeframe: str, directory: str = CANDLE_DIR):
+        super().__init__(ring_path(symbol, timeframe, directory))
+
+    def window(self, n: int = None, copy: bool = False, spins: int = 10000) -> CandleWindow:
+        """Latest `n` rows (all available when None)
+
+        Views alias the shared pages: they stay valid until the writer laps them, `capacity - n`
+        appends later, and the newest row changes in place while its candle is still open. Pass
+        copy=True for a snapshot that never changes. A retry yields the CPU, so a writer descheduled
+        mid-update gets to finish it.
+        """
+        for _ in range(spins):
+            seq = self.seq
+            if seq % 2:
+                time.sleep(0)
+                continue
+            count = self.count
+            rows = min(count, self.capacity) if n is None else min(n, count, self.capacity)
+            start = (count - rows) % self.capacity
+            timestamps = self.timestamps[start:start + rows]
+            values = self.values[:, start:start + rows]
+            if copy:
+                timestamps, values = timestamps.copy(), values.copy()
+            if self.seq == seq:
+                return CandleWindow(timestamps, values, self.columns, seq, count)
+            time.sleep(0)
+        raise TimeoutError(f"Writer of {self.path} kept the ring busy")
+
+    def frame(self, n: int = None, columns=None) -> pd.DataFrame:
+        """Latest rows as a DataFrame, for code that expects the trader's data_buffer"""
+        df = self.window(n, copy=True).frame()
+        return df if columns is None else df[list(columns)]
+
+    def latest(self) -> dict:
+        window = self.window(1, copy=True)
+        if not len(window):
+            return {}
+        return {"timestamp": pd.to_datetime(int(window.timestamps[0]), unit="ms"),
+                **{name: float(window.values[i, 0]) for i, name in enumerate(window.columns)}}
+
+    def wait(self, seq: int, timeout: float = None, interval: float = 0.05) -> bool:
+        """Poll until the ring changes past `seq`; True if it did before the timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.seq <= seq:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+        return True
+
+    def writer_alive(self) -> bool:
+        """Whether some process currently holds the feed lock for this ring"""
+        if fcntl is None:
+            return True
+        with open(self.path.with_suffix(".lock"), "a+") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            fcntl.flock(f, fcntl.LOCK_UN)
+            return False
+
+
+def open_reader(symbol: str, timeframe: str, directory: str = CANDLE_DIR):
+    """Reader for a ring that exists and has a live feed, else None"""
+    if not ring_path(symbol, timeframe, directory).exists():
+        return None
+    try:
+        reader = CandleReader(symbol, timeframe, directory)
+    except (ValueError, OSError) as e:
+        log.warning("⚠️ Ignoring unreadable candle ring for %s %s: %s", symbol, timeframe, e)
+        return None
+    if reader.count == 0 or not reader.writer_alive():
+        reader.close()
+        return None
+    return reader
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the latest candles published on the shared candle bus")
+    parser.add_argument("symbol")
+    parser.add_argument("timeframe")
+    parser.add_argument("--tail", type=int, default=5)
+    parser.add_argument("--columns", help="Comma-separated columns (default: all)")
+    parser.add_argument("--follow", action="store_true", help="Keep printing new candles as they are published")
+    parser.add_argument("--dir", default=CANDLE_DIR)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if not ring_path(args.symbol, args.timeframe, args.dir).exists():
+        print(f"❌ No candle ring for {args.symbol} {args.timeframe} in {args.dir}")
+        return 1
+    reader = CandleReader(args.symbol, args.timeframe, args.dir)
+    columns = args.columns.split(",") if args.columns else None
+    print(f"🕯️ {reader.path}: {reader.count} candles written, capacity {reader.capacity}, "
+          f"feed {'live' if reader.writer_alive() else 'stopped'}")
+    with pd.option_context("display.width", 200, "display.max_columns", 12):
+        print(reader.frame(args.tail, columns))
+        seq = reader.seq
+        while args.follow and reader.wait(seq):
+            seq = reader.seq
+            print(reader.frame(1, columns).to_string(header=False))
+    reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
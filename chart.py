@@ -0,0 +1,358 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+LINE_TRACES = [
+    ('close', dict(
+        name='Price',
+        line=dict(color='#00d4aa', width=2),
+        hovertemplate='<b>%{x}</b><br>Price: $%{y:.2f}<extra></extra>'
+    )),
+    ('ema_10', dict(
+        name='EMA 10',
+        line=dict(color='#ff6b6b', width=1, dash='dash'),
+        opacity=0.7,
+        hovertemplate='<b>%{x}</b><br>EMA 10: $%{y:.2f}<extra></extra>'
+    )),
+    ('ema_20', dict(
+        name='EMA 20',
+        line=dict(color='#4dabf7', width=1, dash='dash'),
+        opacity=0.7,
+        hovertemplate='<b>%{x}</b><br>EMA 20: $%{y:.2f}<extra></extra>'
+    )),
+    ('bb_upper', dict(
+        name='BB Upper',
+        line=dict(color='rgba(255,255,255,0.3)', width=1),
+        opacity=0.5,
+        showlegend=False,
+        hovertemplate='<b>%{x}</b><br>BB Upper: $%{y:.2f}<extra></extra>'
+    )),
+    ('bb_lower', dict(
+        name='BB Lower',
+        line=dict(color='rgba(255,255,255,0.3)', width=1),
+        opacity=0.5,
+        fill='tonexty',
+        fillcolor='rgba(255,255,255,0.05)',
+        showlegend=False,
+        hovertemplate='<b>%{x}</b><br>BB Lower: $%{y:.2f}<extra></extra>'
+    )),
+]
+
+SIGNAL_TRACES = [
+    ('entry', dict(
+        name='Entry Signal',
+        marker=dict(color='#00d4aa', size=15, symbol='triangle-up', line=dict(color='white', width=2)),
+        hovertemplate='<b>Entry Signal</b><br>Price: $%{y:.2f}<extra></extra>'
+    )),
+    ('exit', dict(
+        name='Exit Signal',
+        marker=dict(color='#ff6b6b', size=15, symbol='triangle-down', line=dict(color='white', width=2)),
+        hovertemplate='<b>Exit Signal</b><br>Price: $%{y:.2f}<extra></extra>'
+    )),
+]
+
+
+VIEWS = {
+    "Live": None,
+    "1D": pd.Timedelta(days=1),
+    "1W": pd.Timedelta(weeks=1),
+    "2W": pd.Timedelta(weeks=2),
+    "All": pd.Timedelta.max,
+}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of n_out points that preserve the visual shape of y"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_start = edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the first and last point plus the min and max of (n_out - 2) // 2 equal buckets in between,
+    keeping every spike within n_out points"""
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 4:
+        return np.array([0, n - 1])
+    buckets = (n_out - 2) // 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    mins = np.minimum.reduceat(y, edges[:-1])
+    maxs = np.maximum.reduceat(y, edges[:-1])
+    indices = []
+    for start, end, low, high in zip(edges[:-1], edges[1:], mins, maxs):
+        window = y[start:end]
+        indices.append(start + int(np.argmax(window == low)))
+        indices.append(start + int(np.argmax(window == high)))
+    indices.extend([0, n - 1])
+    return np.unique(indices)
+
+
+def downsample(chart_data: pd.DataFrame, n_out: int, method: str = "lttb") -> pd.DataFrame:
+    y = chart_data['close'].to_numpy(dtype=float)
+    if method == "minmax":
+        indices = minmax(y, n_out)
+    else:
+        x = chart_data.index.asi8.astype(float)
+        indices = lttb(x, y, n_out)
+    return chart_data.iloc[indices]
+
+
+def equity_figure(points: list, symbol: str = ""):
+    """Equity curve above its drawdown from the running peak, from (ts, value) telemetry points"""
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.05)
+    if points:
+        ts, equity = np.array(points, dtype=float).T
+        x = pd.to_datetime(ts, unit="s")
+        drawdown = (equity / np.maximum.accumulate(equity) - 1) * 100
+        fig.add_trace(go.Scatter(
+            x=x, y=equity, mode="lines", name="Equity",
+            line=dict(color="#00d4aa", width=2),
+            hovertemplate="<b>%{x}</b><br>Equity: $%{y:,.2f}<extra></extra>"
+        ), row=1, col=1)
+        fig.add_trace(go.Scatter(
+            x=x, y=drawdown, mode="lines", name="Drawdown",
+            line=dict(color="#ff6b6b", width=1), fill="tozeroy", fillcolor="rgba(255,107,107,0.2)",
+            hovertemplate="<b>%{x}</b><br>Drawdown: %{y:.2f}%<extra></extra>"
+        ), row=2, col=1)
+    else:
+        fig.add_annotation(
+            text="No telemetry recorded yet",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False,
+            font=dict(size=14, color="gray")
+        )
+    fig.update_layout(
+        height=400,
+        margin=dict(l=50, r=30, t=60, b=50),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white", size=12),
+        title=dict(text=f"{symbol} Equity & Drawdown".strip(), font=dict(size=16, color="white"), x=0.5, xanchor="center"),
+        showlegend=False,
+        hovermode="x unified"
+    )
+    fig.update_xaxes(gridcolor="rgba(255,255,255,0.1)", linecolor="rgba(255,255,255,0.2)", tickfont=dict(size=10, color="white"))
+    fig.update_yaxes(gridcolor="rgba(255,255,255,0.1)", linecolor="rgba(255,255,255,0.2)", tickfont=dict(size=10, color="white"))
+    fig.update_yaxes(tickformat=",.2f", row=1, col=1)
+    fig.update_yaxes(ticksuffix="%", row=2, col=1)
+    return fig
+
+
+class PriceChart:
+    """Price chart cached per candle; new candles are appended to the existing traces instead of rebuilding
+
+    One instance serves every dashboard session, so building, appending and downsampling happen under a lock.
+    """
+
+    def __init__(self, symbol: str, window: int = 200, max_points: int = 1000, method: str = "lttb"):
+        self.symbol = symbol
+        self.window = window
+        self.max_points = max_points
+        self.method = method
+        self.fig = None
+        self.columns = []
+        self.candle_time = None
+        self.version = 0
+        self.views = {}
+        self._lock = threading.Lock()
+
+    def figure(self, data_buffer, get_signals, view: str = "Live"):
+        with self._lock:
+            return self._figure(data_buffer, get_signals, view)
+
+    def _figure(self, data_buffer, get_signals, view):
+        if data_buffer is not None and VIEWS.get(view) is not None:
+            return self._history_figure(data_buffer, get_signals, view)
+
+        if data_buffer is None:
+            if self.fig is None or self.candle_time is not None:
+                self.fig = self._empty_figure()
+                self.candle_time = None
+                self.version += 1
+            return self.fig
+
+        last_time = data_buffer.index[-1]
+        if self.fig is not None and last_time == self.candle_time:
+            return self.fig
+
+        new_rows = data_buffer.loc[data_buffer.index > self.candle_time] if self.candle_time is not None else None
+        if self.fig is not None and new_rows is not None and 0 < len(new_rows) < self.window:
+            self._append(new_rows)
+        else:
+            self._build(data_buffer.tail(self.window))
+
+        self._update_signals(data_buffer, get_signals())
+        self.candle_time = last_time
+        self.version += 1
+        return self.fig
+
+    def view_version(self, view: str):
+        """Changes whenever the figure returned for this view changes"""
+        with self._lock:
+            if VIEWS.get(view) is None:
+                return (view, self.version)
+            cached = self.views.get(view)
+            return (view, cached[0] if cached else None)
+
+    def _history_figure(self, data_buffer, get_signals, view):
+        """Downsampled long-range figure, cached per view until the next candle"""
+        last_time = data_buffer.index[-1]
+        cached = self.views.get(view)
+        if cached is not None and cached[0] == last_time:
+            return cached[1]
+
+        span = VIEWS[view]
+        chart_data = data_buffer if span is pd.Timedelta.max else data_buffer.loc[data_buffer.index >= last_time - span]
+        sampled = downsample(chart_data, self.max_points, self.method)
+        fig, columns = self._make_figure(sampled)
+        fig.update_layout(
+            title=dict(text=f"{self.symbol} Price History ({view}, {len(sampled)} of {len(chart_data)} candles)"),
+            xaxis=dict(
+                rangeselector=dict(
+                    buttons=[
+                        dict(count=1, label="1D", step="day", stepmode="backward"),
+                        dict(count=7, label="1W", step="day", stepmode="backward"),
+                        dict(step="all", label="All"),
+                    ],
+                    bgcolor="rgba(0,0,0,0.5)",
+                    activecolor="#00a085",
+                    font=dict(color="white"),
+                ),
+                type="date",
+            ),
+        )
+        self._mark_signals(fig, columns, data_buffer, get_signals())
+        self.views[view] = (last_time, fig)
+        return fig
+
+    def _make_figure(self, chart_data):
+        columns = [column for column, _ in LINE_TRACES if column in chart_data.columns]
+        if 'bb_upper' not in chart_data.columns or 'bb_lower' not in chart_data.columns:
+            columns = [column for column in columns if not column.startswith('bb_')]
+
+        fig = go.Figure()
+        for column, style in LINE_TRACES:
+            if column in columns:
+                fig.add_trace(go.Scatter(x=chart_data.index, y=chart_data[column], mode='lines', **style))
+        for _, style in SIGNAL_TRACES:
+            fig.add_trace(go.Scatter(x=[], y=[], mode='markers', visible=False, **style))
+        self._apply_layout(fig)
+        return fig, columns
+
+    def _build(self, chart_data):
+        self.fig, self.columns = self._make_figure(chart_data)
+
+    def _append(self, new_rows):
+        with self.fig.batch_update():
+            for trace, column in zip(self.fig.data, self.columns):
+                x = tuple(trace.x) + tuple(new_rows.index)
+                y = tuple(trace.y) + tuple(new_rows[column])
+                trace.x = x[-self.window:]
+                trace.y = y[-self.window:]
+
+    def _update_signals(self, data_buffer, signals):
+        self._mark_signals(self.fig, self.columns, data_buffer, signals)
+
+    def _mark_signals(self, fig, columns, data_buffer, signals):
+        current_time = data_buffer.index[-1]
+        current_price = data_buffer['close'].iloc[-1]
+        markers = fig.data[len(columns):]
+        with fig.batch_update():
+            for trace, (key, _) in zip(markers, SIGNAL_TRACES):
+                active = bool(signals.get(key))
+                trace.x = [current_time] if active else []
+                trace.y = [current_price] if active else []
+                trace.visible = active
+
+    def _apply_layout(self, fig):
+        fig.update_layout(
+            height=400,
+            margin=dict(l=50, r=30, t=60, b=50),
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="white", size=12),
+            title=dict(
+                text=f"{self.symbol} Price Chart with Technical Indicators",
+                font=dict(size=16, color="white"),
+                x=0.5,
+                xanchor="center"
+            ),
+            xaxis=dict(
+                gridcolor="rgba(255,255,255,0.1)",
+                linecolor="rgba(255,255,255,0.2)",
+                tickformat="%m/%d %H:%M",
+                tickangle=45,
+                tickfont=dict(size=10, color="white")
+            ),
+            yaxis=dict(
+                gridcolor="rgba(255,255,255,0.1)",
+                linecolor="rgba(255,255,255,0.2)",
+                tickformat=",.2f",
+                tickfont=dict(size=10, color="white")
+            ),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1,
+                bgcolor="rgba(0,0,0,0.5)",
+                bordercolor="rgba(255,255,255,0.2)"
+            ),
+            hovermode='x unified'
+        )
+
+    def _empty_figure(self):
+        fig = go.Figure()
+        fig.update_layout(
+            height=400,
+            xaxis_title="Time",
+            yaxis_title=f"{self.symbol} Price",
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="white", size=12),
+            title=dict(
+                text=f"{self.symbol} Price Chart",
+                font=dict(size=16, color="white"),
+                x=0.5
+            ),
+            showlegend=False,
+            xaxis=dict(
+                gridcolor="rgba(255,255,255,0.1)",
+                linecolor="rgba(255,255,255,0.2)",
+                tickfont=dict(size=10, color="white")
+            ),
+            yaxis=dict(
+                gridcolor="rgba(255,255,255,0.1)",
+                linecolor="rgba(255,255,255,0.2)",
+                tickfont=dict(size=10, color="white")
+            )
+        )
+        fig.add_annotation(
+            text="No market data available",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False,
+            font=dict(size=14, color="gray"),
+            align="center"
+        )
+        return fig
@@ -0,0 +1,130 @@
+import argparse
+import os
+import signal
+import sys
+import threading
+
+from logger import get_logger, setup_logging
+
+log = get_logger("daemon")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the trading engine headless, without the dashboard")
+    parser.add_argument("--name", default=os.getenv("TRADER_NAME", "CryptoBot"))
+    parser.add_argument("--strategy-file", default=os.getenv("STRATEGY_FILE", "output/backtest_results.json"))
+    parser.add_argument("--interval", type=float, default=float(os.getenv("TRADE_INTERVAL", "30")),
+                        help="Seconds between refreshes (TRADE_INTERVAL, default 30)")
+    parser.add_argument("--generate", action="store_true", default=os.getenv("GENERATE_IF_MISSING", "false").lower() == "true",
+                        help="Run the CrewAI workflow first if no strategy file exists")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Override METRICS_PORT")
+    parser.add_argument("--no-metrics", action="store_true", help="Do not start the /metrics endpoint")
+    parser.add_argument("--once", action="store_true", help="Run a single refresh and exit")
+    parser.add_argument("--mock", action="store_true", default=os.getenv("MOCK_EXCHANGE", "false").lower() == "true",
+                        help="Trade against the local mock exchange instead of Binance (MOCK_EXCHANGE)")
+    parser.add_argument("--mock-data", default=os.getenv("MOCK_DATA"), help="Recorded OHLCV CSV to replay; synthetic if omitted")
+    parser.add_argument("--mock-seed", type=int, default=int(os.getenv("MOCK_SEED", "0")))
+    parser.add_argument("--mock-latency", type=float, default=float(os.getenv("MOCK_LATENCY", "0")),
+                        help="Seconds added to every mock API call")
+    parser.add_argument("--mock-error-rate", type=float, default=float(os.getenv("MOCK_ERROR_RATE", "0")),
+                        help="Probability that any mock API call fails")
+    parser.add_argument("--mock-ledger", default=os.getenv("MOCK_TRADE_LEDGER", ":memory:"),
+                        help="Trade ledger for mock fills, kept apart from TRADE_LEDGER (default in memory)")
+    parser.add_argument("--mock-telemetry", default=os.getenv("MOCK_TELEMETRY_DB", ":memory:"),
+                        help="Telemetry store for mock runs, kept apart from TELEMETRY_DB (default in memory)")
+    parser.add_argument("--startup-report", action="store_true", help="Print recorded cold starts for both modes and exit")
+    return parser.parse_args(argv)
+
+
+def build_mock_exchange(args):
+    """Mock exchange for the strategy's symbol with one buffer of history visible and the rest left to replay"""
+    import json
+    from mock_exchange import INTERVAL_MS, MockExchange, synthetic_ohlcv
+
+    with open(args.strategy_file) as f:
+        strategy = json.load(f).get("strategy", {})
+    symbol = strategy.get("coin_symbol", "BTCUSDT")
+    timeframe = strategy.get("timeframe", "15m")
+    warmup = 42 * 24 * 3600 * 1000 // INTERVAL_MS[timeframe]
+
+    if args.mock_data:
+        import pandas as pd
+        candles = pd.read_csv(args.mock_data, index_col=0, parse_dates=True)
+    else:
+        candles = synthetic_ohlcv(warmup * 2, timeframe, seed=args.mock_seed)
+    return MockExchange(symbol, timeframe, candles=candles, cursor=min(warmup, len(candles)) - 1,
+                        latency=args.mock_latency, error_rate=args.mock_error_rate, seed=args.mock_seed)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging()
+
+    if args.startup_report:
+        from startup import summary
+        print(summary())
+        return 0
+
+    from app import load_strategy, run_crewai_workflow, trading_loop
+    from ledger import TradeLedger
+    from trader import CryptoTrader
+    from tsdb import TimeSeriesStore
+    from notifier import ConsoleSink, NotificationDispatcher
+    from metrics import start_metrics_server
+    from profiler import install_profiler_controls
+    from startup import record_startup
+
+    if not os.path.exists(args.strategy_file):
+        if not args.generate:
+            log.error("❌ No strategy at %s - run 'uv run run_crew' or pass --generate", args.strategy_file)
+            return 2
+        if not run_crewai_workflow() or load_strategy() is None:
+            log.error("❌ Failed to generate strategy")
+            return 1
+
+    exchange = build_mock_exchange(args) if args.mock else None
+    if exchange is not None:
+        log.info("🧪 Mock exchange: %s %s, %d candles to replay", exchange.symbol, exchange.interval, exchange.remaining)
+    trader = CryptoTrader(args.name, strategy_file=args.strategy_file, data_client=exchange, trading_client=exchange,
+                          clock=exchange.now if exchange else None,
+                          notifier=NotificationDispatcher([ConsoleSink()]) if exchange else None,
+                          candle_bus=False if exchange else None,
+                          ledger=TradeLedger(args.mock_ledger) if exchange else None,
+                          telemetry=TimeSeriesStore(args.mock_telemetry, clock=exchange.now) if exchange else None)
+    if not trader.strategy:
+        log.error("❌ Could not load strategy from %s", args.strategy_file)
+        return 2
+
+    if not args.no_metrics:
+        start_metrics_server(args.metrics_port)
+    install_profiler_controls()
+    record_startup("daemon")
+
+    stop = threading.Event()
+
+    def shutdown(signum, frame):
+        log.info("🛑 Received %s, stopping after the current tick", signal.Signals(signum).name)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    try:
+        if args.once:
+            trader.refresh()
+        elif exchange is not None:
+            log.info("🤖 Replaying %s on %s against the mock exchange (headless)", trader.symbol, trader.timeframe)
+            while not stop.is_set() and exchange.advance():
+                trader.refresh()
+                stop.wait(args.interval)
+            log.info("🏁 Mock run finished: %d orders, equity %.2f %s", len(exchange.orders), exchange.equity(), exchange.quote_asset)
+        else:
+            log.info("🤖 Trading %s on %s every %.0fs (headless)", trader.symbol, trader.timeframe, args.interval)
+            trading_loop(trader, interval=args.interval, stop=stop)
+    finally:
+        trader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import threading
+import time
+
+
+class Subscription:
+    """Set of topics published since the subscriber last looked; repeated events coalesce"""
+
+    def __init__(self, topics=None):
+        self.topics = set(topics) if topics else None
+        self.pending = set()
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+
+    def _push(self, topic: str):
+        if self.topics is not None and topic not in self.topics:
+            return
+        with self._lock:
+            self.pending.add(topic)
+        self._event.set()
+
+    def wait(self, timeout: float = None, settle: float = 0.0) -> set:
+        """Block until something is published, then wait `settle` seconds for the burst to finish"""
+        if not self._event.wait(timeout):
+            return set()
+        if settle:
+            time.sleep(settle)
+        with self._lock:
+            topics, self.pending = self.pending, set()
+            self._event.clear()
+        return topics
+
+
+class EventBus:
+    """In-process publish/subscribe for engine change events (candle, fill, log, balance)"""
+
+    def __init__(self):
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics=None) -> Subscription:
+        subscription = Subscription(topics)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, topic: str):
+        for subscription in self._subscriptions:
+            subscription._push(topic)
+
+
+bus = EventBus()
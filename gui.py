@@ -1,17 +1,35 @@
 import gradio as gr
 from util import css, js, Color
+from chart import VIEWS
 from trader import CryptoTrader
+from events import bus
 import pandas as pd
 
+PANELS = {
+    "candle": {"portfolio", "chart", "holdings", "latency"},
+    "fill": {"portfolio", "holdings", "transactions", "latency"},
+    "balance": {"portfolio", "holdings"},
+    "log": {"logs"},
+    "tick": {"equity"},
+}
+
 class CryptoTraderView:
     def __init__(self, trader: CryptoTrader):
         self.trader = trader
         self.portfolio_value = None
         self.chart = None
+        self.equity_chart = None
         self.holdings_table = None
         self.transactions_table = None
         self.strategy_info = None
         self.logs = None
+        self.latency = None
+        self.chart_view = None
+        self.views = {}
+        self.pages = {}
+        self.newer_button = None
+        self.older_button = None
+        self.page_label = None
 
     def make_ui(self):
         with gr.Column():
@@ -30,12 +48,31 @@ class CryptoTraderView:
                         <h3 style='color: #00d4aa; margin: 0; font-size: 1.2rem; font-weight: 700;'>📈 Market Price Chart</h3>
                     </div>
                     """)
+                    self.chart_view = gr.Radio(
+                        choices=list(VIEWS),
+                        value="Live",
+                        show_label=False,
+                        container=False
+                    )
                     self.chart = gr.Plot(
                         self.trader.get_coin_price_chart, 
                         container=True, 
                         show_label=False
                     )
             
+            with gr.Row():
+                with gr.Column():
+                    gr.HTML("""
+                    <div style='text-align: center; margin-bottom: 16px; padding: 12px; background: rgba(0, 212, 170, 0.1); border: 1px solid #00d4aa; border-radius: 8px;'>
+                        <h3 style='color: #00d4aa; margin: 0; font-size: 1.2rem; font-weight: 700;'>📉 Equity & Drawdown</h3>
+                    </div>
+                    """)
+                    self.equity_chart = gr.Plot(
+                        self.trader.get_equity_chart,
+                        container=True,
+                        show_label=False
+                    )
+            
             gr.HTML("""
             <div style='text-align: center; margin-bottom: 16px; padding: 12px; background: rgba(0, 212, 170, 0.1); border: 1px solid #00d4aa; border-radius: 8px;'>
                 <h3 style='color: #00d4aa; margin: 0; font-size: 1.2rem; font-weight: 700;'>💼 Current Holdings</h3>
@@ -67,6 +104,10 @@ class CryptoTraderView:
                 elem_classes=["dataframe-fix"],
                 show_label=False
             )
+            with gr.Row():
+                self.newer_button = gr.Button("◀ Newer", size="sm")
+                self.page_label = gr.HTML(self.page_label_html(0))
+                self.older_button = gr.Button("Older ▶", size="sm")
             
             gr.HTML("""
             <div style='text-align: center; margin-bottom: 16px; padding: 12px; background: rgba(0, 212, 170, 0.1); border: 1px solid #00d4aa; border-radius: 8px;'>
@@ -74,51 +115,104 @@ class CryptoTraderView:
             </div>
             """)
             self.logs = gr.HTML(self.trader.get_logs_html)
+            
+            gr.HTML("""
+            <div style='text-align: center; margin-bottom: 16px; padding: 12px; background: rgba(0, 212, 170, 0.1); border: 1px solid #00d4aa; border-radius: 8px;'>
+                <h3 style='color: #00d4aa; margin: 0; font-size: 1.2rem; font-weight: 700;'>⏱️ Stage Latency</h3>
+            </div>
+            """)
+            self.latency = gr.HTML(self.trader.get_latency_html)
 
-        timer = gr.Timer(value=30)
-        timer.tick(
-            fn=self.refresh,
+    def connect(self, ui: gr.Blocks):
+        """Stream engine change events into the panels for as long as the page is open"""
+        ui.load(
+            fn=self.stream,
             inputs=[],
             outputs=[
                 self.portfolio_value,
                 self.chart,
+                self.equity_chart,
                 self.holdings_table,
                 self.transactions_table,
-                self.strategy_info,
+                self.logs,
+                self.latency,
             ],
             show_progress="hidden",
-            queue=False,
+            concurrency_limit=None,
         )
         
-        log_timer = gr.Timer(value=10)
-        log_timer.tick(
-            fn=self.refresh_logs,
-            inputs=[self.logs],
-            outputs=[self.logs],
+        for button, fn in ((self.newer_button, self.newer_page), (self.older_button, self.older_page)):
+            button.click(
+                fn=fn,
+                inputs=[],
+                outputs=[self.transactions_table, self.page_label],
+                show_progress="hidden",
+                queue=False,
+            )
+        
+        self.chart_view.change(
+            fn=self.change_view,
+            inputs=[self.chart_view],
+            outputs=[self.chart, self.equity_chart],
             show_progress="hidden",
             queue=False,
         )
 
-    def refresh(self):
-        self.trader.refresh()
-        self.trader.force_gui_refresh()
-        return (
-            self.trader.get_portfolio_value_display(),
-            self.trader.get_coin_price_chart(),
-            self.trader.get_holdings_df(),
-            self.trader.get_transactions_df(),
-            self.trader.get_strategy_info(),
-        )
+    def stream(self, request: gr.Request):
+        session = request.session_hash
+        subscription = bus.subscribe()
+        chart_version = None
+        try:
+            while True:
+                topics = subscription.wait(timeout=30, settle=0.25)
+                panels = set()
+                for topic in topics:
+                    panels |= PANELS.get(topic, set())
+                
+                chart = gr.update()
+                if "chart" in panels:
+                    view = self.views.get(session, "Live")
+                    fig = self.trader.get_coin_price_chart(view)
+                    version = self.trader.price_chart.view_version(view)
+                    if version != chart_version:
+                        chart, chart_version = fig, version
+                
+                yield (
+                    self.trader.get_portfolio_value_display() if "portfolio" in panels else gr.update(),
+                    chart,
+                    self.trader.get_equity_chart(self.views.get(session, "Live")) if "equity" in panels else gr.update(),
+                    self.trader.get_holdings_df() if "holdings" in panels else gr.update(),
+                    self.trader.get_transactions_df(self.pages.get(session, 0)) if "transactions" in panels else gr.update(),
+                    self.trader.get_logs_html() if "logs" in panels else gr.update(),
+                    self.trader.get_latency_html() if "latency" in panels else gr.update(),
+                )
+        finally:
+            bus.unsubscribe(subscription)
+            self.views.pop(session, None)
+            self.pages.pop(session, None)
+
+    def page_label_html(self, page: int) -> str:
+        return f"<div style='text-align: center; color: #b0b0b0; padding: 8px;'>Page {page + 1} of {self.trader.get_transaction_pages()}</div>"
+
+    def change_page(self, step: int, request: gr.Request):
+        page = self.pages.get(request.session_hash, 0) + step
+        page = min(max(page, 0), self.trader.get_transaction_pages() - 1)
+        self.pages[request.session_hash] = page
+        return self.trader.get_transactions_df(page), self.page_label_html(page)
+
+    def newer_page(self, request: gr.Request):
+        return self.change_page(-1, request)
+
+    def older_page(self, request: gr.Request):
+        return self.change_page(1, request)
 
-    def refresh_logs(self, current_logs):
-        new_logs = self.trader.get_logs_html()
-        if new_logs != current_logs:
-            return new_logs
-        return gr.update()
+    def change_view(self, view, request: gr.Request):
+        self.views[request.session_hash] = view
+        return self.trader.get_coin_price_chart(view), self.trader.get_equity_chart(view)
 
 
-def create_crypto_ui():
-    trader = CryptoTrader("CryptoBot")
+def create_crypto_ui(trader: CryptoTrader = None):
+    trader = trader or CryptoTrader("CryptoBot")
     trader_view = CryptoTraderView(trader)
 
     with gr.Blocks(
@@ -146,6 +240,7 @@ def create_crypto_ui():
         
         with gr.Row():
             trader_view.make_ui()
+        trader_view.connect(ui)
 
     return ui
 
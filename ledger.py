@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    symbol TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    side TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    value REAL NOT NULL,
+    order_id TEXT,
+    pnl_pct REAL,
+    pnl_value REAL
+);
+CREATE INDEX IF NOT EXISTS trades_ts ON trades (ts);
+CREATE INDEX IF NOT EXISTS trades_symbol_ts ON trades (symbol, ts);
+CREATE INDEX IF NOT EXISTS trades_strategy_ts ON trades (strategy_id, ts);
+
+CREATE TABLE IF NOT EXISTS pnl_summary (
+    symbol TEXT NOT NULL,
+    strategy_id TEXT NOT NULL,
+    trades INTEGER NOT NULL DEFAULT 0,
+    closed INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    gross_profit REAL NOT NULL DEFAULT 0,
+    gross_loss REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, strategy_id)
+);
+"""
+
+COLUMNS = ["id", "ts", "symbol", "strategy_id", "side", "quantity", "price", "value", "order_id", "pnl_pct", "pnl_value"]
+
+
+class TradeLedger:
+    """Append-only SQLite trade history with incrementally maintained realized P&L per symbol and strategy"""
+
+    def __init__(self, path: str = "output/trades.db"):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def record(self, side: str, symbol: str, strategy_id: str, quantity: float, price: float,
+               order_id=None, pnl_pct: float = None, pnl_value: float = None, ts: float = None) -> int:
+        ts = time.time() if ts is None else ts
+        closed = 1 if pnl_value is not None else 0
+        win = 1 if closed and pnl_value > 0 else 0
+        loss = 1 if closed and pnl_value <= 0 else 0
+        realized = pnl_value or 0.0
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO trades (ts, symbol, strategy_id, side, quantity, price, value, order_id, pnl_pct, pnl_value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, symbol, strategy_id, side, quantity, price, quantity * price,
+                 None if order_id is None else str(order_id), pnl_pct, pnl_value),
+            )
+            self._conn.execute(
+                "INSERT INTO pnl_summary (symbol, strategy_id, trades, closed, wins, losses, realized_pnl, gross_profit, gross_loss) "
+                "VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (symbol, strategy_id) DO UPDATE SET "
+                "trades = trades + 1, closed = closed + excluded.closed, wins = wins + excluded.wins, "
+                "losses = losses + excluded.losses, realized_pnl = realized_pnl + excluded.realized_pnl, "
+                "gross_profit = gross_profit + excluded.gross_profit, gross_loss = gross_loss + excluded.gross_loss",
+                (symbol, strategy_id, closed, win, loss, realized, max(realized, 0.0), max(-realized, 0.0)),
+            )
+            return cursor.lastrowid
+
+    def _where(self, symbol, strategy_id, start, end):
+        clauses, params = [], []
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if strategy_id is not None:
+            clauses.append("strategy_id = ?")
+            params.append(strategy_id)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, offset: int = 0, limit: int = 20, symbol: str = None, strategy_id: str = None,
+             start: float = None, end: float = None) -> list:
+        """Most recent trades first, as dicts"""
+        where, params = self._where(symbol, strategy_id, start, end)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM trades{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, symbol: str = None, strategy_id: str = None, start: float = None, end: float = None) -> int:
+        where, params = self._where(symbol, strategy_id, start, end)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM trades{where}", params).fetchone()[0]
+
+    def realized_pnl(self, symbol: str = None, strategy_id: str = None) -> dict:
+        """Aggregated from pnl_summary, which is updated on every insert rather than recomputed"""
+        where, params = self._where(symbol, strategy_id, None, None)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(trades), 0), COALESCE(SUM(closed), 0), COALESCE(SUM(wins), 0), "
+                "COALESCE(SUM(losses), 0), COALESCE(SUM(realized_pnl), 0), COALESCE(SUM(gross_profit), 0), "
+                f"COALESCE(SUM(gross_loss), 0) FROM pnl_summary{where}",
+                params,
+            ).fetchone()
+        trades, closed, wins, losses, realized, gross_profit, gross_loss = row
+        return {
+            "trades": trades,
+            "closed": closed,
+            "wins": wins,
+            "losses": losses,
+            "realized_pnl": realized,
+            "win_rate": (wins / closed * 100) if closed else 0.0,
+            "profit_factor": (gross_profit / gross_loss) if gross_loss > 0 else float("inf") if gross_profit > 0 else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
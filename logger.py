@@ -0,0 +1,138 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+from events import bus
+
+LOG_DIR = Path(os.getenv("LOG_DIR", "output/logs"))
+
+
+class LogTypeFilter(logging.Filter):
+    """Give every record a log_type so handlers can color and route it"""
+
+    def filter(self, record):
+        if not hasattr(record, "log_type"):
+            if record.levelno >= logging.ERROR:
+                record.log_type = "error"
+            elif record.levelno >= logging.WARNING:
+                record.log_type = "warning"
+            elif record.levelno <= logging.DEBUG:
+                record.log_type = "debug"
+            else:
+                record.log_type = "info"
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands raw records to the listener thread; formatting happens there, never on the caller"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        event = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "type": record.log_type,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            event.update(fields)
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+        return f"{timestamp} [{record.log_type.upper()}] {record.getMessage()}"
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the most recent (timestamp, log_type, message) entries for the dashboard"""
+
+    def __init__(self, capacity: int = 200, level=logging.INFO):
+        super().__init__(level)
+        self.entries = deque(maxlen=capacity)
+
+    def emit(self, record):
+        timestamp = datetime.fromtimestamp(record.created).strftime("%H:%M:%S")
+        self.entries.append((timestamp, record.log_type, record.getMessage()))
+        bus.publish("log")
+
+    def recent(self, count: int = 15):
+        entries = list(self.entries)
+        return entries[-count:]
+
+
+log_ring = RingBufferHandler(capacity=int(os.getenv("LOG_RING_SIZE", "200")))
+
+_listener = None
+_lock = threading.Lock()
+
+
+def setup_logging():
+    """Route the 'crypto' logger through a bounded queue to console, ring buffer and rotating JSONL files
+
+    Called once by each entry point; importing a module only creates its logger.
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+
+        console = logging.StreamHandler()
+        console.setFormatter(ConsoleFormatter())
+        handlers = [console, log_ring]
+
+        try:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            json_file = RotatingFileHandler(
+                LOG_DIR / "trader.jsonl",
+                maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+                backupCount=int(os.getenv("LOG_BACKUPS", "5")),
+                encoding="utf-8",
+            )
+            json_file.setFormatter(JsonFormatter())
+            handlers.append(json_file)
+        except OSError as e:
+            print(f"⚠️ File logging disabled: {e}")
+
+        queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=10000))
+        queue_handler.addFilter(LogTypeFilter())
+
+        root = logging.getLogger("crypto")
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+        root.propagate = False
+
+        _listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"crypto.{name}")
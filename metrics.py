@@ -0,0 +1,145 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from logger import get_logger
+
+log = get_logger("metrics")
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples in milliseconds"""
+
+    def __init__(self, window: int = 1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        with self._lock:
+            self.samples.append(ms)
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ordered = sorted(self.samples)
+            count = self.count
+            last = self.samples[-1] if self.samples else 0.0
+        if not ordered:
+            return {"count": count, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "last": 0.0}
+
+        def pct(p):
+            return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+        return {
+            "count": count,
+            "p50": pct(50),
+            "p95": pct(95),
+            "p99": pct(99),
+            "max": ordered[-1],
+            "last": last,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.histograms = {}
+        self.gauges = {}
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(name, LatencyHistogram(self.window))
+        return hist
+
+    def observe(self, name: str, ms: float):
+        self.histogram(name).record(ms)
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block into the named histogram"""
+        ident = threading.get_ident()
+        parent = self.phases.get(ident)
+        self.phases[ident] = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+            if parent is None:
+                self.phases.pop(ident, None)
+            else:
+                self.phases[ident] = parent
+
+    def current_phase(self, ident: int) -> str:
+        """Innermost span currently open on the given thread, or 'idle'"""
+        return self.phases.get(ident, "idle")
+
+    def snapshot(self) -> dict:
+        return {name: hist.snapshot() for name, hist in sorted(self.histograms.items())}
+
+
+class MetricsServer:
+    """Serves the registry snapshot as JSON on /metrics"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = json.dumps(dict(registry.snapshot(), gauges=dict(registry.gauges))).encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-server", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+metrics = MetricsRegistry()
+
+
+def start_metrics_server(port: int = None):
+    """Start the /metrics endpoint on METRICS_PORT (default 9108); returns None if it cannot bind"""
+    port = int(os.getenv("METRICS_PORT", "9108")) if port is None else port
+    try:
+        server = MetricsServer(metrics, port=port).start()
+        log.info("📈 Metrics endpoint: %s", server.url)
+        return server
+    except OSError as e:
+        log.warning("⚠️ Could not start metrics endpoint on port %s: %s", port, e)
+        return None
@@ -0,0 +1,267 @@
+import itertools
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from logger import get_logger
+
+log = get_logger("mock_exchange")
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000, "8h": 28_800_000,
+    "12h": 43_200_000, "1d": 86_400_000, "3d": 259_200_000, "1w": 604_800_000,
+}
+
+
+class MockAPIError(Exception):
+    """Raised like BinanceAPIException, with the same status_code / code / message attributes"""
+
+    def __init__(self, code: int, message: str, status_code: int = 400):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.code = code
+        self.message = message
+        self.status_code = status_code
+
+
+GENERATORS = ("random_walk", "trending", "choppy")
+
+
+def synthetic_ohlcv(n: int, interval: str = "15m", start: str = "2024-01-01", price: float = 50000.0,
+                    drift: float = 0.0, volatility: float = 0.004, seed: int = 0, kind: str = "random_walk") -> pd.DataFrame:
+    """Synthetic candles with plausible wicks and volume
+
+    random_walk: geometric random walk; trending: the same with a steady upward drift;
+    choppy: noise around a slow cycle, so price keeps reverting instead of wandering off.
+    """
+    rng = np.random.default_rng(seed)
+    if kind == "random_walk":
+        log_price = np.cumsum(rng.normal(drift, volatility, n))
+    elif kind == "trending":
+        log_price = np.cumsum(rng.normal(drift or volatility / 10, volatility, n))
+    elif kind == "choppy":
+        cycle = 0.03 * np.sin(2 * np.pi * np.arange(n) / 240)
+        log_price = cycle + rng.normal(0, volatility * 2, n)
+    else:
+        raise ValueError(f"Unknown generator {kind!r}, expected one of {GENERATORS}")
+    close = price * np.exp(log_price)
+    open_ = np.concatenate(([price], close[:-1]))
+    wick = np.abs(rng.normal(0, volatility / 2, (2, n)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(3, 0.5, n)
+    index = pd.date_range(start, periods=n, freq=pd.Timedelta(milliseconds=INTERVAL_MS[interval]))
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close, "volume": volume}, index=index)
+
+
+class MockExchange:
+    """In-process stand-in for the python-binance Client subset used by CryptoTrader
+
+    Candles up to `cursor` are visible; `advance()` reveals the next one. Market orders fill
+    at the visible close against simulated balances. Latency and errors can be injected per method.
+    """
+
+    def __init__(self, symbol: str = "BTCUSDT", interval: str = "15m", candles: pd.DataFrame = None,
+                 balances: dict = None, cursor: int = None, step_size: float = 0.00001, min_notional: float = 5.0,
+                 fee_rate: float = 0.001, slippage_bps: float = 0.0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, errors: dict = None, seed: int = 0):
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.base_asset = symbol[:-4] if symbol.endswith("USDT") else symbol[:-3]
+        self.quote_asset = symbol[len(self.base_asset):]
+        candles = synthetic_ohlcv(5000, interval, seed=seed) if candles is None else candles
+        self.open_times = pd.DatetimeIndex(candles.index).as_unit("ms").asi8.astype(np.int64)
+        self.ohlcv = candles[["open", "high", "low", "close", "volume"]].to_numpy(dtype=float)
+        self.cursor = len(candles) - 1 if cursor is None else cursor
+        self.balances = dict(balances or {self.quote_asset: 10000.0})
+        self.step_size = step_size
+        self.min_notional = min_notional
+        self.fee_rate = fee_rate
+        self.slippage_bps = slippage_bps
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors = dict(errors or {})
+        self.orders = []
+        self.calls = {}
+        self._scripted = {}
+        self._order_ids = itertools.count(1)
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_csv(cls, path: str, symbol: str, interval: str, **kwargs):
+        """Replay candles recorded by FetchOHLCV (data/<symbol>_<timeframe>_enriched.csv)"""
+        candles = pd.read_csv(path, index_col=0, parse_dates=True)
+        return cls(symbol, interval, candles=candles, **kwargs)
+
+    @classmethod
+    def synthetic(cls, symbol: str = "BTCUSDT", interval: str = "15m", n: int = 5000, seed: int = 0,
+                  synthetic_kwargs: dict = None, **kwargs):
+        candles = synthetic_ohlcv(n, interval, seed=seed, **(synthetic_kwargs or {}))
+        return cls(symbol, interval, candles=candles, seed=seed, **kwargs)
+
+    @property
+    def price(self) -> float:
+        return float(self.ohlcv[self.cursor, 3])
+
+    @property
+    def remaining(self) -> int:
+        return len(self.ohlcv) - 1 - self.cursor
+
+    def now(self) -> float:
+        """Simulation clock in epoch seconds: the close of the latest visible candle"""
+        return (self.open_times[self.cursor] + self.interval_ms) / 1000
+
+    def advance(self, candles: int = 1) -> bool:
+        """Reveal the next candle(s); returns False once the recording is exhausted"""
+        with self._lock:
+            if self.cursor + candles >= len(self.ohlcv):
+                self.cursor = len(self.ohlcv) - 1
+                return False
+            self.cursor += candles
+            return True
+
+    def fail_next(self, method: str, count: int = 1, error: Exception = None):
+        """Make the next `count` calls to `method` raise `error`"""
+        error = error or MockAPIError(-1001, "Internal error; unable to process your request. Please try again.", 503)
+        self._scripted.setdefault(method, []).extend([error] * count)
+
+    def equity(self) -> float:
+        return self.balances.get(self.quote_asset, 0.0) + self.balances.get(self.base_asset, 0.0) * self.price
+
+    def _call(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        scripted = self._scripted.get(method)
+        if scripted:
+            raise scripted.pop(0)
+        rate = self.errors.get(method, self.error_rate)
+        if rate and self._rng.random() < rate:
+            raise MockAPIError(-1001, "Internal error; unable to process your request. Please try again.", 503)
+
+    def get_server_time(self, **params) -> dict:
+        self._call("get_server_time")
+        return {"serverTime": int(self.open_times[self.cursor] + self.interval_ms - 1)}
+
+    def get_klines(self, symbol: str = None, interval: str = None, limit: int = 500,
+                   startTime: int = None, endTime: int = None, **params) -> list:
+        self._call("get_klines")
+        if symbol not in (None, self.symbol):
+            raise MockAPIError(-1121, "Invalid symbol.")
+        if interval not in (None, self.interval):
+            raise MockAPIError(-1120, f"Mock exchange only serves {self.interval} klines.")
+        limit = min(limit or 500, 1000)
+        with self._lock:
+            last = self.cursor + 1
+            if endTime is not None:
+                last = min(last, int(np.searchsorted(self.open_times, endTime, side="right")))
+            first = 0
+            if startTime is not None:
+                first = int(np.searchsorted(self.open_times, startTime, side="left"))
+                last = min(last, first + limit)
+            else:
+                first = max(last - limit, 0)
+            return [self._kline(i) for i in range(first, last)]
+
+    def _kline(self, i: int) -> list:
+        open_, high, low, close, volume = self.ohlcv[i]
+        open_time = int(self.open_times[i])
+        return [
+            open_time, f"{open_:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close:.8f}", f"{volume:.8f}",
+            open_time + self.interval_ms - 1, f"{volume * close:.8f}", 100,
+            f"{volume / 2:.8f}", f"{volume * close / 2:.8f}", "0",
+        ]
+
+    def get_account(self, **params) -> dict:
+        self._call("get_account")
+        with self._lock:
+            return {
+                "makerCommission": 10, "takerCommission": 10,
+                "canTrade": True, "accountType": "SPOT",
+                "balances": [{"asset": asset, "free": f"{free:.8f}", "locked": "0.00000000"}
+                             for asset, free in self.balances.items()],
+            }
+
+    def get_exchange_info(self, **params) -> dict:
+        self._call("get_exchange_info")
+        return {
+            "serverTime": self.get_server_time()["serverTime"],
+            "symbols": [{
+                "symbol": self.symbol,
+                "status": "TRADING",
+                "baseAsset": self.base_asset,
+                "quoteAsset": self.quote_asset,
+                "filters": [
+                    {"filterType": "LOT_SIZE", "minQty": f"{self.step_size:.8f}", "maxQty": "9000.00000000",
+                     "stepSize": f"{self.step_size:.8f}"},
+                    {"filterType": "NOTIONAL", "minNotional": f"{self.min_notional:.8f}"},
+                ],
+            }],
+        }
+
+    def get_symbol_info(self, symbol: str) -> dict:
+        return next((s for s in self.get_exchange_info()["symbols"] if s["symbol"] == symbol), None)
+
+    def order_market_buy(self, symbol: str = None, quantity: float = None, **params) -> dict:
+        self._call("order_market_buy")
+        return self._fill("BUY", symbol, quantity)
+
+    def order_market_sell(self, symbol: str = None, quantity: float = None, **params) -> dict:
+        self._call("order_market_sell")
+        return self._fill("SELL", symbol, quantity)
+
+    def _fill(self, side: str, symbol: str, quantity: float) -> dict:
+        if symbol != self.symbol:
+            raise MockAPIError(-1121, "Invalid symbol.")
+        quantity = float(quantity)
+        steps = quantity / self.step_size
+        if quantity <= 0 or abs(steps - round(steps)) > 1e-6:
+            raise MockAPIError(-1013, "Filter failure: LOT_SIZE")
+
+        with self._lock:
+            slip = self.slippage_bps / 10000
+            price = self.price * (1 + slip if side == "BUY" else 1 - slip)
+            quote = quantity * price
+            if quote < self.min_notional:
+                raise MockAPIError(-1013, "Filter failure: NOTIONAL")
+
+            if side == "BUY":
+                if quote > self.balances.get(self.quote_asset, 0.0) + 1e-9:
+                    raise MockAPIError(-2010, "Account has insufficient balance for requested action.")
+                commission, commission_asset = quantity * self.fee_rate, self.base_asset
+                self.balances[self.quote_asset] -= quote
+                self.balances[self.base_asset] = self.balances.get(self.base_asset, 0.0) + quantity - commission
+            else:
+                if quantity > self.balances.get(self.base_asset, 0.0) + 1e-12:
+                    raise MockAPIError(-2010, "Account has insufficient balance for requested action.")
+                commission, commission_asset = quote * self.fee_rate, self.quote_asset
+                self.balances[self.base_asset] -= quantity
+                self.balances[self.quote_asset] = self.balances.get(self.quote_asset, 0.0) + quote - commission
+
+            order_id = next(self._order_ids)
+            transact_time = int(self.open_times[self.cursor] + self.interval_ms - 1)
+            order = {
+                "symbol": self.symbol,
+                "orderId": order_id,
+                "clientOrderId": f"mock-{order_id}",
+                "transactTime": transact_time,
+                "price": "0.00000000",
+                "origQty": f"{quantity:.8f}",
+                "executedQty": f"{quantity:.8f}",
+                "cummulativeQuoteQty": f"{quote:.8f}",
+                "status": "FILLED",
+                "timeInForce": "GTC",
+                "type": "MARKET",
+                "side": side,
+                "fills": [{"price": f"{price:.8f}", "qty": f"{quantity:.8f}",
+                           "commission": f"{commission:.8f}", "commissionAsset": commission_asset}],
+            }
+            self.orders.append(order)
+        log.debug("🧪 Mock %s %.8f %s @ %.2f", side, quantity, self.symbol, price)
+        return order
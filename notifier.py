@@ -0,0 +1,201 @@
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from logger import get_logger
+
+log = get_logger("notifier")
+
+
+class NtfySink:
+    """Posts messages to an ntfy topic over a keep-alive session"""
+
+    def __init__(self, server: str, topic: str, timeout: float = 5.0):
+        self.url = f"{server.rstrip('/')}/{topic}"
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, message: str):
+        response = self.session.post(self.url, data=message.encode(encoding='utf-8'), timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code} - {response.text}")
+
+    def close(self):
+        self.session.close()
+
+
+class ConsoleSink:
+    """Prints messages instead of delivering them"""
+
+    def send(self, message: str):
+        log.warning("⚠️ Push notification not configured: %s", message)
+
+    def close(self):
+        pass
+
+
+class NotificationDispatcher:
+    """Non-blocking notification queue with coalescing, rate limiting and retry"""
+
+    def __init__(self, sinks, coalesce_window: float = 2.0, min_interval: float = 1.0,
+                 max_queue: int = 100, retries: int = 3, backoff: float = 1.0):
+        self.sinks = list(sinks)
+        self.coalesce_window = coalesce_window
+        self.min_interval = min_interval
+        self.max_queue = max_queue
+        self.retries = retries
+        self.backoff = backoff
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._pending = 0
+        self._closed = False
+        self._pending_lock = threading.Lock()
+        self._last_send = 0.0
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="notifier", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        ntfy_topic = os.getenv("NTFY_TOPIC")
+        ntfy_server = os.getenv("NTFY_SERVER", "https://ntfy.sh")
+        sink = NtfySink(ntfy_server, ntfy_topic) if ntfy_topic else ConsoleSink()
+        return cls([sink], **kwargs)
+
+    def notify(self, message: str):
+        """Queue a message from any thread and return immediately; dropped once the dispatcher is closed"""
+        with self._pending_lock:
+            if self._closed:
+                log.debug("Notifier closed, dropped: %s", message)
+                return
+            self._pending += 1
+            self._loop.call_soon_threadsafe(self._enqueue, message)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued message has been delivered or given up on"""
+        deadline = time.time() + timeout
+        while self._pending > 0:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        with self._pending_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.flush(timeout)
+        self._loop.call_soon_threadsafe(self._stop)
+        self._thread.join(timeout)
+        for sink in self.sinks:
+            sink.close()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._consumer = self._loop.create_task(self._consume())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    def _stop(self):
+        self._consumer.cancel()
+        self._loop.call_soon(self._loop.stop)
+
+    def _enqueue(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._done(1)
+            log.warning("⚠️ Notification queue full, dropped: %s", message)
+
+    def _done(self, count: int):
+        with self._pending_lock:
+            self._pending -= count
+
+    async def _consume(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.coalesce_window
+            while True:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            wait = self._last_send + self.min_interval - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            message = "\n\n".join(batch)
+            await asyncio.gather(*(self._deliver(sink, message) for sink in self.sinks))
+            self._last_send = time.time()
+            self._done(len(batch))
+
+    async def _deliver(self, sink, message: str):
+        for attempt in range(1, self.retries + 1):
+            try:
+                await self._loop.run_in_executor(None, sink.send, message)
+                self.sent += 1
+                return
+            except Exception as e:
+                if attempt == self.retries:
+                    self.failed += 1
+                    log.error("❌ Failed to send push notification: %s", e)
+                    return
+                await asyncio.sleep(self.backoff * (2 ** (attempt - 1)))
+
+
+class LocalNtfyServer:
+    """In-process HTTP stand-in for an ntfy server, for tests and offline runs"""
+
+    def __init__(self, delay: float = 0.0, fail_first: int = 0):
+        self.messages = []
+        self.delay = delay
+        self.fail_first = fail_first
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+                if server.delay:
+                    time.sleep(server.delay)
+                if server.fail_first > 0:
+                    server.fail_first -= 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                server.messages.append((self.path.lstrip('/'), body))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-ntfy", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,109 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from metrics import metrics
+from logger import get_logger
+
+log = get_logger("profiler")
+
+
+class SamplingProfiler:
+    """Samples the stacks of running threads and writes them as collapsed stacks"""
+
+    def __init__(self, duration: float = 30.0, interval: float = 0.005, thread_names=None, output_dir: str = "output/profiles"):
+        self.duration = duration
+        self.interval = interval
+        self.thread_names = thread_names
+        self.output_dir = Path(output_dir)
+        self.stacks = Counter()
+        self.phases = Counter()
+        self.samples = 0
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            log.warning("⚠️ Profiler already running")
+            return self
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        log.info("🔬 Profiling %.0fs at %.0fms intervals...", self.duration, self.interval * 1000)
+        return self
+
+    def _wanted(self, thread: threading.Thread) -> bool:
+        if thread.ident == threading.get_ident():
+            return False
+        if not self.thread_names:
+            return True
+        return any(thread.name.startswith(prefix) for prefix in self.thread_names)
+
+    def _run(self):
+        deadline = time.time() + self.duration
+        while time.time() < deadline:
+            threads = {t.ident: t for t in threading.enumerate() if self._wanted(t)}
+            frames = sys._current_frames()
+            for ident, thread in threads.items():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                phase = metrics.current_phase(ident)
+                self.stacks[self._collapse(thread.name, phase, frame)] += 1
+                self.phases[phase] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        self.write()
+
+    def _collapse(self, thread_name: str, phase: str, frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return ";".join([thread_name, f"phase:{phase}"] + names)
+
+    def write(self) -> Path:
+        """Write collapsed stacks (flamegraph.pl / speedscope input) labelled with the busiest tick phase"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        busy = [(phase, n) for phase, n in self.phases.most_common() if phase != "idle"]
+        label = busy[0][0] if busy else "idle"
+        path = self.output_dir / f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{label}.folded"
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        log.info("🔬 Profile written: %s (%d samples, top phase: %s)", path, self.samples, label)
+        return path
+
+
+_active = None
+
+
+def start_profile(duration: float = None) -> SamplingProfiler:
+    """Start a capture using PROFILE_SECONDS / PROFILE_INTERVAL_MS / PROFILE_THREADS defaults"""
+    global _active
+    if _active is not None and _active.running:
+        log.warning("⚠️ Profiler already running")
+        return _active
+    duration = float(os.getenv("PROFILE_SECONDS", "30")) if duration is None else duration
+    interval = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+    thread_names = [name for name in os.getenv("PROFILE_THREADS", "").split(",") if name]
+    _active = SamplingProfiler(duration=duration, interval=interval, thread_names=thread_names).start()
+    return _active
+
+
+def install_profiler_controls():
+    """Start a capture on SIGUSR1, and immediately if PROFILE_ON_START is set; call from the main thread"""
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: start_profile())
+        log.info("🔬 Send SIGUSR1 to pid %d to capture a profile", os.getpid())
+    if os.getenv("PROFILE_ON_START", "False").lower() == "true":
+        start_profile()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from logger import get_logger, setup_logging
+from mock_exchange import INTERVAL_MS, MockExchange, synthetic_ohlcv
+
+log = get_logger("replay")
+
+
+def load_strategy(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f).get("strategy", {})
+
+
+def live_trades(exchange: MockExchange) -> list:
+    """Pair the mock exchange's fills into round trips, keyed by the candle each order was placed on"""
+    trades, open_trade = [], None
+    for order in exchange.orders:
+        fill = order["fills"][0]
+        candle = pd.to_datetime(order["transactTime"] - exchange.interval_ms + 1, unit="ms")
+        if order["side"] == "BUY":
+            open_trade = {"entry_time": candle, "entry_price": float(fill["price"])}
+        elif open_trade is not None:
+            open_trade["exit_time"] = candle
+            open_trade["exit_price"] = float(fill["price"])
+            open_trade["pnl_pct"] = (open_trade["exit_price"] - open_trade["entry_price"]) / open_trade["entry_price"] * 100
+            trades.append(open_trade)
+            open_trade = None
+    if open_trade is not None:
+        trades.append(dict(open_trade, exit_time=None, exit_price=None, pnl_pct=None))
+    return trades
+
+
+def diff_trades(live: list, backtest: list) -> list:
+    """One row per entry candle seen by either engine, marking where they disagree"""
+    live_by_entry = {trade["entry_time"]: trade for trade in live}
+    backtest_by_entry = {trade["entry_time"]: trade for trade in backtest}
+    rows = []
+    for entry_time in sorted(set(live_by_entry) | set(backtest_by_entry)):
+        a, b = live_by_entry.get(entry_time), backtest_by_entry.get(entry_time)
+        if a and b:
+            status = "match" if a["exit_time"] == b["exit_time"] else "exit differs"
+        else:
+            status = "live only" if a else "backtest only"
+        rows.append({
+            "entry_time": entry_time,
+            "status": status,
+            "live_exit": a["exit_time"] if a else None,
+            "backtest_exit": b["exit_time"] if b else None,
+            "backtest_reason": b["reason"] if b else None,
+            "live_pnl_pct": a["pnl_pct"] if a else None,
+            "backtest_pnl_pct": b["pnl_pct"] if b else None,
+        })
+    return rows
+
+
+def replay(strategy_file: str, candles: pd.DataFrame, balance: float = 10000.0, fee_rate: float = 0.001,
+           slippage_bps: float = 0.0, progress_every: int = 0) -> dict:
+    """Feed candles through CryptoTrader.refresh() against a mock exchange on a simulated clock,
+    then backtest the same candles and compare trades"""
+    from crypto.backtest import performance_metrics, run_backtest
+    from ledger import TradeLedger
+    from notifier import NotificationDispatcher
+    from trader import CryptoTrader
+    from tsdb import TimeSeriesStore
+
+    strategy = load_strategy(strategy_file)
+    symbol = strategy.get("coin_symbol", "BTCUSDT")
+    timeframe = strategy.get("timeframe", "15m")
+    warmup = 42 * 24 * 3600 * 1000 // INTERVAL_MS[timeframe]
+    if len(candles) <= warmup:
+        raise ValueError(f"Need more than {warmup} candles to warm up a {timeframe} buffer, got {len(candles)}")
+
+    exchange = MockExchange(symbol, timeframe, candles=candles, cursor=warmup - 1,
+                            balances={"USDT": balance}, fee_rate=fee_rate, slippage_bps=slippage_bps)
+    trader = CryptoTrader("Replay", strategy_file=strategy_file, data_client=exchange, trading_client=exchange,
+                          clock=exchange.now, notifier=NotificationDispatcher([]), candle_bus=False,
+                          ledger=TradeLedger(":memory:"), telemetry=TimeSeriesStore(":memory:", clock=exchange.now))
+
+    replayed = 0
+    started = time.perf_counter()
+    while exchange.advance():
+        trader.refresh()
+        trader.post_trade.join()
+        replayed += 1
+        if progress_every and replayed % progress_every == 0:
+            rate = replayed / (time.perf_counter() - started)
+            log.info("⏩ %d/%d candles (%.0f/s)", replayed, replayed + exchange.remaining, rate)
+    elapsed = time.perf_counter() - started
+    trader.close()
+
+    enriched = trader.add_indicators(candles[["open", "high", "low", "close", "volume"]].astype(float).copy())
+    window = enriched.iloc[warmup:]
+    backtest = run_backtest(window, strategy["entry_rules"], strategy["exit_rules"],
+                            strategy.get("stop_loss", 0), strategy.get("take_profit", 0), strategy.get("allocation", 0))
+    live = live_trades(exchange)
+    rows = diff_trades(live, backtest["trades"])
+
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "candles": replayed,
+        "elapsed_s": elapsed,
+        "candles_per_s": replayed / elapsed if elapsed else 0.0,
+        "speedup": replayed * INTERVAL_MS[timeframe] / 1000 / elapsed if elapsed else 0.0,
+        "live": {
+            "trades": len([t for t in live if t["exit_time"] is not None]),
+            "total_return": (exchange.equity() / balance - 1) * 100,
+            "orders": len(exchange.orders),
+        },
+        "backtest": performance_metrics(backtest["equity"], backtest["trades"]),
+        "matched": sum(1 for row in rows if row["status"] == "match"),
+        "divergences": [row for row in rows if row["status"] != "match"],
+    }
+
+
+def format_report(report: dict, limit: int = 20) -> str:
+    lines = [
+        f"⏩ Replayed {report['candles']} {report['symbol']} {report['timeframe']} candles in {report['elapsed_s']:.1f}s "
+        f"({report['candles_per_s']:.0f} candles/s, {report['speedup']:,.0f}x real time)",
+        f"   Live:     {report['live']['trades']:>4} trades, return {report['live']['total_return']:+.2f}% "
+        f"(fees and lot rounding included)",
+        f"   Backtest: {report['backtest']['trade_count']:>4} trades, return {report['backtest']['total_return']:+.2f}%",
+        f"   Matching trades: {report['matched']}, divergent: {len(report['divergences'])}",
+    ]
+    if report["divergences"]:
+        lines.append("")
+        lines.append(f"   {'entry candle':<20} {'status':<14} {'live exit':<20} {'backtest exit':<20} reason")
+        for row in report["divergences"][:limit]:
+            lines.append(
+                f"   {str(row['entry_time']):<20} {row['status']:<14} {str(row['live_exit'] or '-'):<20} "
+                f"{str(row['backtest_exit'] or '-'):<20} {row['backtest_reason'] or ''}"
+            )
+        if len(report["divergences"]) > limit:
+            lines.append(f"   ... {len(report['divergences']) - limit} more")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay history through the live trading path and compare with the backtester")
+    parser.add_argument("--strategy-file", default=os.getenv("STRATEGY_FILE", "output/backtest_results.json"))
+    parser.add_argument("--data", help="Recorded OHLCV CSV (e.g. data/BTCUSDT_1h_enriched.csv); synthetic if omitted")
+    parser.add_argument("--candles", type=int, default=2000, help="Candles to replay after the warmup buffer")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--slippage-bps", type=float, default=0.0)
+    parser.add_argument("--json", help="Write the full report to this path")
+    parser.add_argument("--verbose", action="store_true", help="Keep the trader's own log output")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if not args.verbose:
+        for name in ("crypto.trader", "crypto.worker"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    strategy = load_strategy(args.strategy_file)
+    timeframe = strategy.get("timeframe", "15m")
+    warmup = 42 * 24 * 3600 * 1000 // INTERVAL_MS[timeframe]
+    if args.data:
+        candles = pd.read_csv(args.data, index_col=0, parse_dates=True)
+        candles = candles.iloc[-(warmup + args.candles):]
+    else:
+        candles = synthetic_ohlcv(warmup + args.candles, timeframe, seed=args.seed)
+
+    report = replay(args.strategy_file, candles, balance=args.balance, fee_rate=args.fee,
+                    slippage_bps=args.slippage_bps, progress_every=500)
+    print(format_report(report))
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import ast
+
+import numpy as np
+import pandas as pd
+
+RECOMMENDATION_RANK = {"Keep": 0, "Modify": 1, "Discard": 2}
+
+
+def evaluate_rules(df: pd.DataFrame, rules: str) -> np.ndarray:
+    """Evaluate a strategy rule expression over the whole frame as a boolean array"""
+    safe_ns = {"df": df, "np": np}
+    signal = pd.Series(eval(rules, {"__builtins__": {}}, safe_ns), index=df.index)
+    return signal.to_numpy().astype(bool)
+
+
+class SignalCache:
+    """Evaluates rule expressions split on their top-level &, | and ~ so conditions shared by strategies run once"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.safe_ns = {"df": df, "np": np}
+        self.leaves = {}
+        self.rules = {}
+        self.hits = 0
+
+    def evaluate(self, rules: str) -> np.ndarray:
+        if rules not in self.rules:
+            try:
+                self.rules[rules] = self._node(ast.parse(rules.strip(), mode="eval").body)
+            except TypeError:
+                self.rules[rules] = evaluate_rules(self.df, rules)
+        else:
+            self.hits += 1
+        return self.rules[rules]
+
+    def _node(self, node) -> np.ndarray:
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            left, right = self._node(node.left), self._node(node.right)
+            return left & right if isinstance(node.op, ast.BitAnd) else left | right
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+            return ~self._node(node.operand)
+
+        key = ast.unparse(node)
+        if key in self.leaves:
+            self.hits += 1
+            return self.leaves[key]
+        code = compile(ast.Expression(node), "<rules>", "eval")
+        value = pd.Series(eval(code, {"__builtins__": {}}, self.safe_ns), index=self.df.index)
+        if value.dtype != bool:
+            raise TypeError(f"{key} is not a boolean condition")
+        self.leaves[key] = value.to_numpy()
+        return self.leaves[key]
+
+
+def run_backtest(df: pd.DataFrame, entry_rules: str, exit_rules: str, stop_loss: float, take_profit: float,
+                 allocation: float, cash: float = 100_000) -> dict:
+    """Bar-by-bar simulation on closes; returns the equity curve and every round-trip trade"""
+    entry_signal = evaluate_rules(df, entry_rules)
+    exit_signal = evaluate_rules(df, exit_rules)
+    close = df["close"].to_numpy(dtype=float)
+    index = df.index
+
+    position = 0.0
+    entry_price = 0.0
+    entry_bar = None
+    equity = np.empty(len(close))
+    trades = []
+
+    def close_trade(i, price, reason):
+        trades.append({
+            "entry_time": index[entry_bar],
+            "entry_price": entry_price,
+            "exit_time": index[i],
+            "exit_price": price,
+            "pnl_pct": (price - entry_price) / entry_price * 100,
+            "reason": reason,
+        })
+
+    for i in range(len(close)):
+        price = close[i]
+
+        if entry_signal[i] and position == 0:
+            position = (cash * allocation / 100) / price
+            cash -= position * price
+            entry_price = price
+            entry_bar = i
+
+        elif exit_signal[i] and position > 0:
+            close_trade(i, price, "exit")
+            cash += position * price
+            position = 0
+            entry_price = 0
+
+        if position > 0:
+            drawdown = (price - entry_price) / entry_price * 100
+            if drawdown <= -stop_loss or drawdown >= take_profit:
+                close_trade(i, price, "stop_loss" if drawdown <= -stop_loss else "take_profit")
+                cash += position * price
+                position = 0
+                entry_price = 0
+
+        equity[i] = cash + position * price
+
+    return {"equity": pd.Series(equity, index=index), "trades": trades}
+
+
+def performance_metrics(equity: pd.Series, trades: list) -> dict:
+    """StrategyPerformance fields from an equity curve and its closed trades"""
+    profit_percent = (equity.iloc[-1] / equity.iloc[0] - 1) * 100
+    max_drawdown_percent = ((equity / equity.cummax() - 1).min()) * 100
+    daily_returns = equity.pct_change().dropna()
+    sharpe_ratio = (
+        (daily_returns.mean() / daily_returns.std()) * np.sqrt(252)
+        if daily_returns.std() != 0
+        else 0
+    )
+
+    pnls = [trade["pnl_pct"] for trade in trades]
+    wins = sum(1 for pnl in pnls if pnl > 0)
+    gross_profit = sum(pnl for pnl in pnls if pnl > 0)
+    gross_loss = sum(-pnl for pnl in pnls if pnl <= 0)
+
+    return {
+        "win_rate": (wins / len(pnls) * 100) if pnls else 0,
+        "profit_factor": (gross_profit / gross_loss) if gross_loss > 0 else float("inf"),
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": max_drawdown_percent,
+        "total_return": profit_percent,
+        "trade_count": len(pnls),
+    }
+
+
+def recommend(total_return: float, max_drawdown: float) -> str:
+    if total_return > 3 and max_drawdown > -10:
+        return "Keep"
+    elif total_return < 1:
+        return "Discard"
+    return "Modify"
+
+
+def backtest_csv(csv_path: str, candidates: list) -> list:
+    """Read one enriched CSV and score every candidate on it; safe to run in a worker process"""
+    df = pd.read_csv(csv_path, parse_dates=True, index_col="timestamp")
+    scored = []
+    for candidate in candidates:
+        result = run_backtest(df, candidate["entry_rules"], candidate["exit_rules"],
+                              candidate["stop_loss"], candidate["take_profit"], candidate["allocation"])
+        metrics = performance_metrics(result["equity"], result["trades"])
+        scored.append(dict(metrics, recommendation=recommend(metrics["total_return"], metrics["max_drawdown"])))
+    return scored
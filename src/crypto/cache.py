@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from crewai import LLM
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+CREATE INDEX IF NOT EXISTS responses_namespace ON responses (namespace);
+"""
+
+DEFAULT_TTLS = {"serper": 12 * 3600, "llm": 24 * 3600, "screener": 15 * 60}
+
+MISSING = object()
+
+
+class ResponseCache:
+    """Content-addressed SQLite store for tool and LLM responses with a TTL per namespace and an LRU size cap"""
+
+    def __init__(self, path: str = "output/cache/responses.db", max_bytes: int = 256 * 1024 * 1024,
+                 ttls: Optional[dict] = None, default_ttl: float = 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def key(namespace: str, **parts) -> str:
+        payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+        return f"{namespace}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def ttl(self, namespace: str) -> float:
+        override = os.getenv(f"CACHE_TTL_{namespace.upper()}")
+        return float(override) if override else self.ttls.get(namespace, self.default_ttl)
+
+    def get(self, namespace: str, key: str, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl(namespace):
+                self.misses += 1
+                return default
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any):
+        data = json.dumps(value, default=str)
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, namespace, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, data, len(data), now, now),
+            )
+            self._size += len(data) - (old[0] if old else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until the store is back under 90% of its cap"""
+        now = time.time()
+        for namespace, in self._conn.execute("SELECT DISTINCT namespace FROM responses").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE namespace = ? AND created < ?",
+                               (namespace, now - self.ttl(namespace)))
+        target = self.max_bytes * 0.9
+        size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if size > target:
+            freed = 0
+            cutoff = None
+            for last_used, entry_size in self._conn.execute("SELECT last_used, size FROM responses ORDER BY last_used"):
+                freed += entry_size
+                cutoff = last_used
+                if size - freed <= target:
+                    break
+            self._conn.execute("DELETE FROM responses WHERE last_used <= ?", (cutoff,))
+            size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._size = size
+
+    def cached(self, namespace: str, parts: dict, compute: Callable[[], Any]):
+        """Return the stored response for `parts`, or compute, store and return it"""
+        key = self.key(namespace, **parts)
+        value = self.get(namespace, key, MISSING)
+        if value is MISSING:
+            value = compute()
+            self.set(namespace, key, value)
+        return value
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock, self._conn:
+            if namespace is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+            self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT namespace, COUNT(*), SUM(size) FROM responses GROUP BY namespace").fetchall()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self._size,
+            "entries": {namespace: {"count": count, "bytes": size} for namespace, count, size in rows},
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.getenv("RESPONSE_CACHE", "1") != "0"
+
+
+def get_cache() -> ResponseCache:
+    """Process-wide cache configured from RESPONSE_CACHE_DB and RESPONSE_CACHE_MAX_MB"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(os.getenv("RESPONSE_CACHE_DB", "output/cache/responses.db"),
+                                   max_bytes=int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "256")) * 1024 * 1024))
+        return _cache
+
+
+class CachedLLM(LLM):
+    """LLM whose plain-text completions are replayed from the response cache for identical prompts"""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        from .profiling import active_profiler
+
+        profiler = active_profiler()
+        if profiler is not None:
+            callbacks = [*(callbacks or []), profiler.token_recorder]
+
+        def complete():
+            return super(CachedLLM, self).call(messages, tools=tools, callbacks=callbacks,
+                                               available_functions=available_functions,
+                                               from_task=from_task, from_agent=from_agent)
+
+        if not enabled() or available_functions:
+            return complete()
+
+        parts = {
+            "model": self.model,
+            "base_url": self.base_url or self.api_base,
+            "messages": messages,
+            "tools": tools,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "stop": self.stop,
+            "seed": self.seed,
+            "response_format": getattr(self.response_format, "__name__", self.response_format),
+        }
+        cache = get_cache()
+        key = cache.key("llm", **parts)
+        response = cache.get("llm", key, MISSING)
+        if response is not MISSING and profiler is not None:
+            profiler.llm_cache_hit(self.model)
+        if response is MISSING:
+            response = complete()
+            if isinstance(response, str) and response.strip():
+                cache.set("llm", key, response)
+        return response
@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+from crewai import Task
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+
+
+class CheckpointStore:
+    """Structured task outputs saved per run under output/checkpoints/<date>_<timeframe>/"""
+
+    def __init__(self, root: str = "output/checkpoints"):
+        self.root = Path(root)
+
+    def run_dir(self, inputs: dict) -> Path:
+        return self.root / f"{inputs.get('date', 'undated')}_{inputs.get('timeframe', 'any')}"
+
+    def save(self, inputs: dict, task: Task, output: TaskOutput) -> Optional[Path]:
+        """Write a finished task's output; skipped when a structured output was expected but not produced"""
+        if task.output_pydantic is not None and output.pydantic is None:
+            return None
+        path = self.run_dir(inputs) / f"{task.name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "task": task.name,
+            "agent": output.agent,
+            "saved_at": time.time(),
+            "raw": output.raw,
+            "pydantic": output.pydantic.model_dump() if output.pydantic is not None else None,
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str))
+        os.replace(tmp, path)
+        return path
+
+    def load(self, inputs: dict, task: Task) -> Optional[TaskOutput]:
+        path = self.run_dir(inputs) / f"{task.name}.json"
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+            model = task.output_pydantic(**data["pydantic"]) if task.output_pydantic is not None else None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable checkpoint {path}: {e}")
+            return None
+        return TaskOutput(
+            name=task.name,
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=data["raw"],
+            pydantic=model,
+            agent=data.get("agent") or "",
+            output_format=OutputFormat.PYDANTIC if model is not None else OutputFormat.RAW,
+        )
+
+    def mark_complete(self, inputs: dict):
+        path = self.run_dir(inputs) / "complete.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"completed_at": time.time(), "inputs": inputs}, default=str))
+
+    def is_complete(self, inputs: dict) -> bool:
+        return (self.run_dir(inputs) / "complete.json").exists()
+
+    def clear(self, inputs: dict):
+        shutil.rmtree(self.run_dir(inputs), ignore_errors=True)
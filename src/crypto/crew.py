@@ -1,12 +1,21 @@
 import os
+import threading
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, after_kickoff, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
-from crewai_tools import SerperDevTool
 from pydantic import BaseModel, Field
+from .cache import CachedLLM, get_cache
+from .checkpoint import CheckpointStore
 from .tools.fetch_tool import FetchOHLCVTool
-from .tools.backtest_tool import BacktestTool, StrategyBackTestOutput
+from .tools.serper_tool import CachedSerperDevTool
+from .tools.backtest_tool import BacktestTool, BatchBacktestTool, StrategyBackTestOutput
+from .tools.search_tool import StrategySearchTool
+from .tools.screener_tool import MarketScreenerTool
+from .tools.validation_tool import StrategyValidationTool
+from .leaderboard import format_leaderboard, run_leaderboard, save_leaderboard
+from .prefetch import prefetcher
+from .profiling import start_profiling, stop_profiling
 from crewai.memory import LongTermMemory, EntityMemory
 from crewai.memory.storage.rag_storage import RAGStorage
 from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
@@ -27,12 +36,21 @@ class Crypto():
     """Crypto crew"""
     agents: List[BaseAgent]
     tasks: List[Task]
+    inputs: dict = {}
+    leaderboard_thread = None
+    checkpoints = CheckpointStore()
+
+    def cached_llm(self, agent_name):
+        """Agent LLM from agents.yaml, wrapped so identical prompts are answered from the response cache"""
+        llm = self.agents_config[agent_name].get('llm')
+        return CachedLLM(model=llm) if isinstance(llm, str) else llm
 
     @agent
     def trending_coin_finder(self) -> Agent:
         return Agent(
             config=self.agents_config['trending_coin_finder'],
-            tools=[SerperDevTool(n_results=20)], 
+            llm=self.cached_llm('trending_coin_finder'),
+            tools=[CachedSerperDevTool(n_results=20), MarketScreenerTool()], 
             verbose=True
         )
     
@@ -40,6 +58,7 @@ class Crypto():
     def coin_picker(self) -> Agent:
         return Agent(
             config=self.agents_config['coin_picker'],
+            llm=self.cached_llm('coin_picker'),
             verbose=True
         )
     
@@ -47,8 +66,10 @@ class Crypto():
     def backtester(self) -> Agent: 
         return Agent( 
             config=self.agents_config['backtester'],
+            llm=self.cached_llm('backtester'),
             verbose=True, 
-            tools=[FetchOHLCVTool(), BacktestTool()],
+            tools=[FetchOHLCVTool(), BacktestTool(), BatchBacktestTool(), StrategySearchTool(),
+                   StrategyValidationTool()],
         )
 
     
@@ -56,14 +77,16 @@ class Crypto():
     def find_trending_coins(self) -> Task:
         return Task(
             config=self.tasks_config['find_trending_coins'], 
-            output_pydantic=CoinList
+            output_pydantic=CoinList,
+            callback=self.on_coin_list,
         )
     
     @task
     def pick_best_coin(self) -> Task:
         return Task(
             config=self.tasks_config['pick_best_coin'],
-            output_pydantic=Coin
+            output_pydantic=Coin,
+            callback=self.on_coin_picked,
         )
 
     
@@ -74,6 +97,78 @@ class Crypto():
             output_pydantic=StrategyBackTestOutput,
         )
 
+    @before_kickoff
+    def capture_inputs(self, inputs):
+        self.inputs = inputs or {}
+        start_profiling(self.inputs)
+        self.resume_from_checkpoints()
+        return inputs
+
+    def resume_from_checkpoints(self):
+        """Skip the leading tasks whose outputs were checkpointed by an unfinished run with the same inputs"""
+        if os.getenv("CREW_RESUME", "1") == "0" or self.checkpoints.is_complete(self.inputs):
+            self.checkpoints.clear(self.inputs)
+            return
+        crew = self.crew_instance
+        remaining = []
+        for task in crew.tasks:
+            output = None if remaining else self.checkpoints.load(self.inputs, task)
+            if output is None:
+                remaining.append(task)
+                continue
+            task.output = output
+            print(f"⏭️ Resuming: {task.name} restored from {self.checkpoints.run_dir(self.inputs)}")
+            if task.callback:
+                task.callback(output)
+        crew.tasks = remaining or crew.tasks[-1:]
+
+    def save_checkpoint(self, output):
+        task = next((t for t in self.crew_instance.tasks if t.name == output.name), None)
+        if task is not None and self.checkpoints.save(self.inputs, task, output):
+            print(f"💾 Checkpointed {task.name}")
+
+    def on_coin_list(self, output):
+        if not isinstance(output.pydantic, CoinList):
+            return
+        symbols = [coin.symbol for coin in output.pydantic.coins]
+        self.prefetch(symbols)
+        self.start_leaderboard(symbols)
+
+    def on_coin_picked(self, output):
+        if isinstance(output.pydantic, Coin):
+            self.prefetch([output.pydantic.symbol])
+
+    def prefetch(self, symbols):
+        """Start downloading candles now so FetchOHLCV finds them ready when the backtester asks"""
+        if os.getenv("OHLCV_PREFETCH", "1") == "0":
+            return
+        for symbol in symbols:
+            prefetcher.prefetch(symbol, self.inputs.get("timeframe", "1h"), end_date=self.inputs.get("date"))
+
+    def start_leaderboard(self, symbols):
+        """Backtest every screened coin in the background while the picker and backtester agents run"""
+        if os.getenv("COIN_LEADERBOARD", "1") == "0":
+            return
+        timeframe = self.inputs.get("timeframe", "1h")
+
+        def run():
+            leaderboard = run_leaderboard(symbols, timeframe, end_date=self.inputs.get("date"))
+            save_leaderboard(leaderboard)
+            print(format_leaderboard(leaderboard))
+
+        self.leaderboard_thread = threading.Thread(target=run, name="coin-leaderboard", daemon=True)
+        self.leaderboard_thread.start()
+
+    @after_kickoff
+    def finish_run(self, result):
+        self.checkpoints.mark_complete(self.inputs)
+        if self.leaderboard_thread is not None:
+            self.leaderboard_thread.join()
+        print(f"📥 OHLCV prefetch: {prefetcher.stats}")
+        print(f"🗄️ Response cache: {get_cache().stats()}")
+        stop_profiling("ok")
+        return result
+
     @crew
     def crew(self) -> Crew:
         """Creates the Crypto crew"""
@@ -98,11 +193,13 @@ class Crypto():
         # )
 
 
-        return Crew(
+        self.crew_instance = Crew(
             agents=self.agents, 
             tasks=self.tasks, 
             process=Process.sequential,
+            task_callback=self.save_checkpoint,
             verbose=True,
             # long_term_memory=long_term_memory,
             # entity_memory=entity_memory
         )
+        return self.crew_instance
@@ -0,0 +1,155 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from .backtest import RECOMMENDATION_RANK, backtest_csv
+from .tools.backtest_tool import Strategy, StrategyBackTestOutput, StrategyPerformance
+from .prefetch import prefetcher
+from .tools.fetch_tool import default_start_date, normalize_symbol
+
+log = logging.getLogger(__name__)
+
+CANDIDATES = [
+    {
+        "strategy_id": "ema_cross",
+        "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+        "exit_rules": "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))",
+        "stop_loss": 3, "take_profit": 6, "allocation": 50,
+    },
+    {
+        "strategy_id": "trend_pullback",
+        "entry_rules": "(df['ema_50'] > df['ema_200']) & (df['rsi_14'] < 40)",
+        "exit_rules": "(df['rsi_14'] > 65) | (df['close'] < df['ema_200'])",
+        "stop_loss": 4, "take_profit": 8, "allocation": 50,
+    },
+    {
+        "strategy_id": "rsi_reversion",
+        "entry_rules": "df['rsi_14'] < 30",
+        "exit_rules": "df['rsi_14'] > 70",
+        "stop_loss": 5, "take_profit": 10, "allocation": 40,
+    },
+    {
+        "strategy_id": "macd_momentum",
+        "entry_rules": "(df['macd'] > df['macd_signal']) & (df['macd_hist'] > 0) & (df['close'] > df['ema_50'])",
+        "exit_rules": "df['macd'] < df['macd_signal']",
+        "stop_loss": 3, "take_profit": 6, "allocation": 50,
+    },
+    {
+        "strategy_id": "bollinger_bounce",
+        "entry_rules": "(df['close'] < df['bb_lower']) & (df['rsi_7'] < 30)",
+        "exit_rules": "df['close'] > df['sma_20']",
+        "stop_loss": 4, "take_profit": 5, "allocation": 40,
+    },
+]
+
+class Leaderboard(BaseModel):
+    """Best candidate strategy per screened coin, ranked"""
+    timeframe: str = Field(description="Timeframe every coin was backtested on")
+    results: List[StrategyBackTestOutput] = Field(description="One entry per coin, best first")
+    errors: Dict[str, str] = Field(default_factory=dict, description="Coins that could not be fetched or tested")
+    elapsed_s: float = Field(default=0.0, description="Wall-clock time of the whole stage")
+
+
+def rank_key(output: StrategyBackTestOutput):
+    return (RECOMMENDATION_RANK.get(output.recommendation, len(RECOMMENDATION_RANK)),
+            -output.performance.sharpe_ratio, -output.performance.total_return)
+
+
+def best_output(symbol: str, timeframe: str, candidates: List[dict], scored: List[dict]) -> StrategyBackTestOutput:
+    outputs = []
+    for candidate, metrics in zip(candidates, scored):
+        metrics = dict(metrics)
+        recommendation = metrics.pop("recommendation")
+        outputs.append(StrategyBackTestOutput(
+            performance=StrategyPerformance(**metrics),
+            strategy=Strategy(coin_symbol=symbol, timeframe=timeframe, **candidate),
+            recommendation=recommendation,
+        ))
+    return min(outputs, key=rank_key)
+
+
+def run_leaderboard(symbols: List[str], timeframe: str, start_date: Optional[str] = None,
+                    end_date: Optional[str] = None, candidates: Optional[List[dict]] = None,
+                    processes: Optional[int] = None) -> Leaderboard:
+    """Fetch every coin through the shared prefetcher and hand each CSV to the process pool as soon as it lands"""
+    candidates = candidates or CANDIDATES
+    symbols = list(dict.fromkeys(normalize_symbol(symbol) for symbol in symbols))
+    start_date = start_date or default_start_date(timeframe, end_date)
+    started = time.perf_counter()
+
+    results, errors = [], {}
+    with ProcessPoolExecutor(max_workers=processes or max(1, min(len(symbols), os.cpu_count() or 1)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        fetches = {prefetcher.prefetch(symbol, timeframe, start_date, end_date): symbol for symbol in symbols}
+        backtests = {}
+        for future in as_completed(fetches):
+            symbol = fetches[future]
+            try:
+                csv_path = future.result()
+            except Exception as e:
+                log.error("❌ Fetch failed for %s: %s", symbol, e)
+                errors[symbol] = f"fetch: {e}"
+                continue
+            backtests[pool.submit(backtest_csv, csv_path, candidates)] = symbol
+
+        for future in as_completed(backtests):
+            symbol = backtests[future]
+            try:
+                results.append(best_output(symbol, timeframe, candidates, future.result()))
+            except Exception as e:
+                log.error("❌ Backtest failed for %s: %s", symbol, e)
+                errors[symbol] = f"backtest: {e}"
+
+    results.sort(key=rank_key)
+    elapsed = time.perf_counter() - started
+    log.info("🏁 Backtested %d/%d coins × %d strategies in %.1fs", len(results), len(symbols), len(candidates), elapsed)
+    return Leaderboard(timeframe=timeframe, results=results, errors=errors, elapsed_s=elapsed)
+
+
+def format_leaderboard(leaderboard: Leaderboard) -> str:
+    lines = [f"{'#':>2} {'symbol':<12} {'strategy':<18} {'return %':>9} {'sharpe':>7} {'max dd %':>9} "
+             f"{'trades':>6} recommendation"]
+    for i, output in enumerate(leaderboard.results, 1):
+        p = output.performance
+        lines.append(f"{i:>2} {output.strategy.coin_symbol:<12} {output.strategy.strategy_id:<18} "
+                     f"{p.total_return:>9.2f} {p.sharpe_ratio:>7.2f} {p.max_drawdown:>9.2f} "
+                     f"{p.trade_count:>6} {output.recommendation}")
+    for symbol, error in leaderboard.errors.items():
+        lines.append(f"   {symbol:<12} ⚠️ {error}")
+    return "\n".join(lines)
+
+
+def save_leaderboard(leaderboard: Leaderboard, path: str = "output/leaderboard.json"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(leaderboard.model_dump(), f, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest candidate strategies on many coins in parallel")
+    parser.add_argument("symbols", nargs="+", help="Coins or pairs, e.g. BTC ETH SOLUSDT")
+    parser.add_argument("--timeframe", default="1h")
+    parser.add_argument("--start-date")
+    parser.add_argument("--end-date")
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--output", default="output/leaderboard.json")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    leaderboard = run_leaderboard(args.symbols, args.timeframe, args.start_date, args.end_date,
+                                  processes=args.processes)
+    print(format_leaderboard(leaderboard))
+    save_leaderboard(leaderboard, args.output)
+    print(f"📄 Leaderboard written to {args.output}")
+    return 0 if leaderboard.results else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from .tools.fetch_tool import default_start_date, fetch_ohlcv, normalize_symbol
+
+log = logging.getLogger(__name__)
+
+
+class OHLCVPrefetcher:
+    """Downloads enriched candles in the background; later fetches of the same pair join the download in flight"""
+
+    def __init__(self, max_workers: int = 4):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ohlcv-prefetch")
+        self.lock = threading.Lock()
+        self.inflight: Dict[tuple, Future] = {}
+        self.stats = {"prefetched": 0, "warm": 0, "joined": 0, "cold": 0, "failed": 0}
+
+    def _download(self, symbol, timeframe, start_date, end_date) -> str:
+        started = time.perf_counter()
+        try:
+            path = fetch_ohlcv(symbol, timeframe, start_date, end_date)
+        except Exception:
+            with self.lock:
+                self.stats["failed"] += 1
+                self.inflight.pop((symbol, timeframe), None)
+            raise
+        log.info("📥 %s %s ready in %.1fs", symbol, timeframe, time.perf_counter() - started)
+        return path
+
+    def prefetch(self, symbol: str, timeframe: str, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None) -> Future:
+        """Start downloading a pair unless it is cached or already on its way"""
+        symbol = normalize_symbol(symbol)
+        key = (symbol, timeframe)
+        with self.lock:
+            future = self.inflight.get(key)
+            if future is not None:
+                return future
+            path = f"data/{symbol}_{timeframe}_enriched.csv"
+            if os.path.exists(path):
+                future = Future()
+                future.set_result(path)
+                return future
+            start_date = start_date or default_start_date(timeframe, end_date)
+            future = self.pool.submit(self._download, symbol, timeframe, start_date, end_date)
+            self.inflight[key] = future
+            self.stats["prefetched"] += 1
+            return future
+
+    def fetch(self, symbol: str, timeframe: str, start_date: str, end_date: Optional[str] = None) -> str:
+        """Path to the pair's CSV, waiting on a prefetch when one is running instead of downloading twice"""
+        symbol = normalize_symbol(symbol)
+        with self.lock:
+            future = self.inflight.get((symbol, timeframe))
+        if future is not None:
+            self.stats["warm" if future.done() else "joined"] += 1
+            try:
+                return future.result()
+            except Exception as e:
+                log.warning("⚠️ Prefetch of %s %s failed (%s), fetching again", symbol, timeframe, e)
+        elif os.path.exists(f"data/{symbol}_{timeframe}_enriched.csv"):
+            self.stats["warm"] += 1
+        else:
+            self.stats["cold"] += 1
+        return fetch_ohlcv(symbol, timeframe, start_date, end_date)
+
+
+prefetcher = OHLCVPrefetcher(max_workers=int(os.getenv("OHLCV_PREFETCH_WORKERS", "4")))
@@ -0,0 +1,334 @@
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from crewai.events import (
+    CrewKickoffFailedEvent,
+    LLMCallCompletedEvent,
+    LLMCallFailedEvent,
+    LLMCallStartedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    ToolUsageStartedEvent,
+    crewai_event_bus,
+)
+from litellm.integrations.custom_logger import CustomLogger
+
+PROFILE_DIR = os.getenv("CREW_PROFILE_DIR", "output/profiles")
+
+_active = None
+_installed = False
+_install_lock = threading.Lock()
+
+
+class TokenRecorder(CustomLogger):
+    """litellm logger that attaches token usage to the LLM call open on the calling thread
+
+    crewai reports usage from the calling thread as soon as a completion returns, as a ModelResponse or a
+    {"usage": ...} dict. litellm's own success logging runs on a worker thread with no open call, so a
+    completion is never counted twice.
+    """
+
+    def __init__(self, profiler: "RunProfiler"):
+        super().__init__()
+        self.profiler = profiler
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        if isinstance(response_obj, dict):
+            usage = response_obj.get("usage")
+        else:
+            usage = getattr(response_obj, "usage", None)
+        if usage is None:
+            return
+        if isinstance(usage, dict):
+            tokens_in, tokens_out = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        else:
+            tokens_in, tokens_out = getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0)
+        self.profiler.record_usage(tokens_in or 0, tokens_out or 0)
+
+
+class RunProfiler:
+    """Timeline of one crew run: every task, LLM call and tool call with wall time, retries and tokens"""
+
+    def __init__(self, inputs: Optional[dict] = None, directory: str = PROFILE_DIR):
+        self.inputs = dict(inputs or {})
+        self.directory = directory
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.status = "running"
+        self.path = None
+        self.token_recorder = TokenRecorder(self)
+        self._lock = threading.Lock()
+        self._open = {}
+        self._task = None
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def _begin(self, kind: str, name: str, key, **fields) -> dict:
+        span = {"kind": kind, "name": name, "task": self._task, "start": self._now(), "end": None,
+                "duration_s": None, "status": "running", **fields}
+        with self._lock:
+            self.spans.append(span)
+            self._open[key] = span
+        return span
+
+    def _end(self, key, status: str = "ok", **fields) -> Optional[dict]:
+        with self._lock:
+            span = self._open.pop(key, None)
+        if span is not None:
+            span["end"] = self._now()
+            span["duration_s"] = span["end"] - span["start"]
+            span["status"] = status
+            span.update(fields)
+        return span
+
+    def task_started(self, name: str):
+        self._task = name
+        self._begin("task", name, ("task", name))
+
+    def task_finished(self, name: str, status: str = "ok", error: str = None):
+        self._end(("task", name), status, **({"error": error} if error else {}))
+        self._task = None
+
+    def llm_started(self, model: str):
+        self._begin("llm", model, ("llm", threading.get_ident()), tokens_in=0, tokens_out=0, cached=False)
+
+    def llm_finished(self, status: str = "ok", error: str = None):
+        self._end(("llm", threading.get_ident()), status, **({"error": error} if error else {}))
+
+    def llm_cache_hit(self, model: str):
+        span = self._begin("llm", model, ("llm-cache", threading.get_ident()), tokens_in=0, tokens_out=0, cached=True)
+        self._end(("llm-cache", threading.get_ident()))
+        return span
+
+    def record_usage(self, tokens_in: int, tokens_out: int):
+        with self._lock:
+            span = self._open.get(("llm", threading.get_ident()))
+            if span is not None:
+                span["tokens_in"] += tokens_in
+                span["tokens_out"] += tokens_out
+
+    def tool_started(self, name: str, attempt: int, args):
+        self._begin("tool", name, ("tool", threading.get_ident(), name), attempt=attempt,
+                    args=args if isinstance(args, (dict, str)) else str(args))
+
+    def tool_finished(self, name: str, status: str = "ok", from_cache: bool = False, error: str = None):
+        fields = {"from_cache": from_cache}
+        if error:
+            fields["error"] = error
+        self._end(("tool", threading.get_ident(), name), status, **fields)
+
+    def finish(self, status: str = "ok") -> str:
+        """Close anything still open, write the JSON timeline and return its path"""
+        with self._lock:
+            for span in self._open.values():
+                span["end"] = self._now()
+                span["duration_s"] = span["end"] - span["start"]
+                span["status"] = "interrupted"
+            self._open.clear()
+        self.status = status
+        report = self.report()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        path = Path(self.directory) / f"crew-{stamp}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2, default=str))
+        self.path = str(path)
+        return self.path
+
+    def report(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "inputs": self.inputs,
+            "status": self.status,
+            "wall_s": self._now(),
+            "summary": summarize(self.spans),
+            "spans": self.spans,
+        }
+
+
+def summarize(spans: list) -> dict:
+    """Totals per task, per tool and per model"""
+    tasks, tools, models = {}, {}, {}
+    for span in spans:
+        if span["kind"] == "task":
+            entry = tasks.setdefault(span["name"], {"wall_s": 0.0, "status": span["status"], "llm_calls": 0,
+                                                    "llm_s": 0.0, "tool_calls": 0, "tool_s": 0.0, "retries": 0,
+                                                    "tokens_in": 0, "tokens_out": 0, "runs": 0})
+            entry["wall_s"] += span["duration_s"] or 0.0
+            entry["status"] = span["status"]
+            entry["runs"] += 1
+            continue
+
+        task = tasks.setdefault(span["task"] or "-", {"wall_s": 0.0, "status": "-", "llm_calls": 0, "llm_s": 0.0,
+                                                      "tool_calls": 0, "tool_s": 0.0, "retries": 0,
+                                                      "tokens_in": 0, "tokens_out": 0, "runs": 0})
+        duration = span["duration_s"] or 0.0
+        if span["kind"] == "llm":
+            task["llm_calls"] += 1
+            task["llm_s"] += duration
+            task["tokens_in"] += span["tokens_in"]
+            task["tokens_out"] += span["tokens_out"]
+            task["retries"] += span["status"] == "error"
+            model = models.setdefault(span["name"], {"calls": 0, "cached": 0, "errors": 0, "total_s": 0.0,
+                                                     "tokens_in": 0, "tokens_out": 0})
+            model["calls"] += 1
+            model["cached"] += span["cached"]
+            model["errors"] += span["status"] == "error"
+            model["total_s"] += duration
+            model["tokens_in"] += span["tokens_in"]
+            model["tokens_out"] += span["tokens_out"]
+        else:
+            retry = span.get("attempt", 1) > 1
+            task["tool_calls"] += 1
+            task["tool_s"] += duration
+            task["retries"] += retry
+            tool = tools.setdefault(span["name"], {"calls": 0, "errors": 0, "retries": 0, "cached": 0,
+                                                   "total_s": 0.0, "durations": []})
+            tool["calls"] += 1
+            tool["errors"] += span["status"] == "error"
+            tool["retries"] += retry
+            tool["cached"] += bool(span.get("from_cache"))
+            tool["total_s"] += duration
+            tool["durations"].append(duration)
+
+    for tool in tools.values():
+        durations = tool.pop("durations")
+        tool["p50_s"] = statistics.median(durations) if durations else 0.0
+        tool["max_s"] = max(durations, default=0.0)
+    return {"tasks": tasks, "tools": tools, "models": models}
+
+
+def format_summary(report: dict) -> str:
+    summary = report["summary"]
+    lines = [f"⏱️ Crew run {report['status']} in {report['wall_s']:.1f}s",
+             f"   {'task':<24} {'wall s':>8} {'llm':>5} {'llm s':>8} {'tools':>6} {'tool s':>8} {'retry':>6} "
+             f"{'tok in':>9} {'tok out':>8}"]
+    for name, t in summary["tasks"].items():
+        lines.append(f"   {name:<24} {t['wall_s']:>8.1f} {t['llm_calls']:>5} {t['llm_s']:>8.1f} {t['tool_calls']:>6} "
+                     f"{t['tool_s']:>8.1f} {t['retries']:>6} {t['tokens_in']:>9} {t['tokens_out']:>8}")
+    if summary["tools"]:
+        lines.append(f"   {'tool':<24} {'calls':>8} {'errors':>6} {'retries':>8} {'cached':>6} {'total s':>8} "
+                     f"{'p50 s':>8} {'max s':>8}")
+        for name, t in summary["tools"].items():
+            lines.append(f"   {name[:24]:<24} {t['calls']:>8} {t['errors']:>6} {t['retries']:>8} {t['cached']:>6} "
+                         f"{t['total_s']:>8.2f} {t['p50_s']:>8.2f} {t['max_s']:>8.2f}")
+    if summary["models"]:
+        lines.append(f"   {'model':<24} {'calls':>8} {'cached':>6} {'errors':>6} {'total s':>8} {'tok in':>9} {'tok out':>8}")
+        for name, m in summary["models"].items():
+            lines.append(f"   {name[-24:]:<24} {m['calls']:>8} {m['cached']:>6} {m['errors']:>6} {m['total_s']:>8.1f} "
+                         f"{m['tokens_in']:>9} {m['tokens_out']:>8}")
+    return "\n".join(lines)
+
+
+def active_profiler() -> Optional[RunProfiler]:
+    return _active
+
+
+def start_profiling(inputs: Optional[dict] = None) -> Optional[RunProfiler]:
+    """Begin a run timeline unless CREW_PROFILE=0; stop_profiling() or a failed kickoff writes it out"""
+    global _active
+    if os.getenv("CREW_PROFILE", "1") == "0":
+        return None
+    _install()
+    _active = RunProfiler(inputs)
+    return _active
+
+
+def stop_profiling(status: str = "ok") -> Optional[str]:
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    path = profiler.finish(status)
+    print(format_summary(profiler.report()))
+    print(f"📄 Run profile written to {path}")
+    return path
+
+
+def _install():
+    """Register one set of event bus handlers per process; they forward to whichever profiler is active"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        _installed = True
+
+    def on(event_type):
+        def register(handler):
+            def forward(source, event):
+                if _active is not None:
+                    handler(_active, event)
+            forward.__name__ = handler.__name__
+            crewai_event_bus.register_handler(event_type, forward)
+            return handler
+        return register
+
+    @on(TaskStartedEvent)
+    def task_started(profiler, event):
+        profiler.task_started(getattr(event.task, "name", None) or "task")
+
+    @on(TaskCompletedEvent)
+    def task_completed(profiler, event):
+        profiler.task_finished(getattr(event.task, "name", None) or "task")
+
+    @on(TaskFailedEvent)
+    def task_failed(profiler, event):
+        profiler.task_finished(getattr(event.task, "name", None) or "task", "error", str(event.error))
+
+    @on(LLMCallStartedEvent)
+    def llm_started(profiler, event):
+        profiler.llm_started(event.model or "llm")
+
+    @on(LLMCallCompletedEvent)
+    def llm_completed(profiler, event):
+        profiler.llm_finished()
+
+    @on(LLMCallFailedEvent)
+    def llm_failed(profiler, event):
+        profiler.llm_finished("error", str(event.error))
+
+    @on(ToolUsageStartedEvent)
+    def tool_started(profiler, event):
+        profiler.tool_started(event.tool_name, event.run_attempts or 1, event.tool_args)
+
+    @on(ToolUsageFinishedEvent)
+    def tool_finished(profiler, event):
+        profiler.tool_finished(event.tool_name, from_cache=bool(event.from_cache))
+
+    @on(ToolUsageErrorEvent)
+    def tool_failed(profiler, event):
+        profiler.tool_finished(event.tool_name, "error", error=str(event.error))
+
+    @on(CrewKickoffFailedEvent)
+    def kickoff_failed(profiler, event):
+        stop_profiling("error")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the summary table of a recorded crew run profile")
+    parser.add_argument("path", nargs="?", help=f"Profile JSON (default: latest in {PROFILE_DIR})")
+    args = parser.parse_args(argv)
+
+    path = args.path
+    if path is None:
+        profiles = sorted(Path(PROFILE_DIR).glob("crew-*.json"))
+        if not profiles:
+            print(f"❌ No profiles in {PROFILE_DIR}")
+            return 1
+        path = profiles[-1]
+    print(format_summary(json.loads(Path(path).read_text())))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
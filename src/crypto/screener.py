@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from .tools.fetch_tool import interval_minutes, normalize_symbol
+
+STABLECOINS = {"USDC", "FDUSD", "TUSD", "BUSD", "DAI", "USDP", "USDE", "USD1", "PYUSD", "EUR", "AEUR", "EURI",
+               "XUSD", "USTC", "UST", "PAXG", "WBTC", "WBETH", "BFUSD"}
+LEVERAGED_SUFFIXES = ("UP", "DOWN", "BULL", "BEAR")
+
+DEFAULT_WEIGHTS = {"momentum": 0.5, "liquidity": 0.3, "volatility": -0.2}
+
+WEIGHT_PER_MINUTE = int(os.getenv("SCREENER_WEIGHT_PER_MIN", "4800"))
+
+
+class ScreenedCoin(BaseModel):
+    symbol: str = Field(description="USDT trading pair, e.g., SOLUSDT")
+    score: float = Field(description="Weighted cross-sectional rank, higher is better")
+    momentum_short: float = Field(description="Return over the short lookback (%)")
+    momentum_long: float = Field(description="Return over the long lookback (%)")
+    volatility: float = Field(description="Annualized volatility of log returns (%)")
+    quote_volume_24h: float = Field(description="Average traded value per day over the liquidity window (USDT)")
+    rsi_14: float = Field(description="14-period RSI on the last bar")
+    trend: float = Field(description="Distance of the last close above its 50-period EMA (%)")
+
+
+class ScreenerReport(BaseModel):
+    """Quantitative ranking of the Binance USDT universe"""
+    timeframe: str
+    bars: int
+    universe: int = Field(description="Pairs considered")
+    scanned: int = Field(description="Pairs with enough history and liquidity to be ranked")
+    results: List[ScreenedCoin] = Field(description="Best ranked pairs first")
+    errors: Dict[str, str] = Field(default_factory=dict)
+    fetch_s: float = 0.0
+    elapsed_s: float = 0.0
+
+
+class WeightLimiter:
+    """Token bucket over Binance request weight, shared by every fetch thread"""
+
+    def __init__(self, per_minute: int = WEIGHT_PER_MINUTE):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, weight: int):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def kline_weight(limit: int) -> int:
+    return 1 if limit < 100 else 2 if limit < 500 else 5 if limit < 1000 else 10
+
+
+def bar_minutes(timeframe: str) -> float:
+    return float(interval_minutes(timeframe))
+
+
+def call_with_retry(fn, limiter: WeightLimiter, weight: int, retries: int = 3, backoff: float = 0.5, **params):
+    """One weighted request, waiting out 429/418 responses (Retry-After) and retrying transient failures"""
+    for attempt in range(1, retries + 1):
+        limiter.acquire(weight)
+        try:
+            return fn(**params)
+        except Exception as e:
+            status = getattr(e, "status_code", None)
+            if status is not None and status < 500 and status not in (418, 429):
+                raise
+            if attempt == retries:
+                raise
+            headers = getattr(getattr(e, "response", None), "headers", None) or {}
+            delay = float(headers.get("Retry-After", backoff * (2 ** (attempt - 1))))
+            time.sleep(delay)
+
+
+def usdt_universe(client, limiter: WeightLimiter, max_symbols: int = 400) -> List[str]:
+    """Spot USDT pairs currently trading, without stablecoins and leveraged tokens, most traded first"""
+    info = call_with_retry(client.get_exchange_info, limiter, 20)
+    symbols = []
+    for s in info["symbols"]:
+        base = s.get("baseAsset", s["symbol"][:-4])
+        if (s.get("quoteAsset") != "USDT" or s.get("status") != "TRADING" or not s.get("isSpotTradingAllowed", True)
+                or base in STABLECOINS or base.endswith(LEVERAGED_SUFFIXES)):
+            continue
+        symbols.append(s["symbol"])
+    try:
+        tickers = call_with_retry(client.get_ticker, limiter, 80)
+        volume = {t["symbol"]: float(t.get("quoteVolume", 0) or 0) for t in tickers}
+        symbols.sort(key=lambda symbol: volume.get(symbol, 0.0), reverse=True)
+    except Exception as e:
+        print(f"⚠️ 24h tickers unavailable ({e}), screening pairs in exchange order")
+    return symbols[:max_symbols]
+
+
+def fetch_klines(client, symbols: List[str], timeframe: str, bars: int, limiter: WeightLimiter,
+                 workers: int = 16) -> Tuple[Dict[str, list], Dict[str, str]]:
+    """Latest `bars` klines for every symbol, fetched concurrently within the request weight budget"""
+    weight = kline_weight(bars)
+    klines, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screener") as pool:
+        futures = {pool.submit(call_with_retry, client.get_klines, limiter, weight,
+                               symbol=symbol, interval=timeframe, limit=bars): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                klines[symbol] = future.result()
+            except Exception as e:
+                errors[symbol] = str(e)
+    return klines, errors
+
+
+def build_panel(klines: Dict[str, list], bars: int):
+    """symbols × time arrays of close and quote volume, right-aligned on the latest bar and NaN-padded on the left"""
+    symbols = [symbol for symbol, rows in klines.items() if rows]
+    close = np.full((len(symbols), bars), np.nan)
+    quote_volume = np.full((len(symbols), bars), np.nan)
+    for i, symbol in enumerate(symbols):
+        rows = klines[symbol][-bars:]
+        n = len(rows)
+        close[i, bars - n:] = [float(row[4]) for row in rows]
+        quote_volume[i, bars - n:] = [float(row[7]) for row in rows]
+    return symbols, close, quote_volume
+
+
+def ewm(panel: np.ndarray, alpha: float) -> np.ndarray:
+    """Recursive EMA along time for every row at once; each row starts at its first non-NaN value"""
+    out = np.empty_like(panel)
+    prev = np.full(panel.shape[0], np.nan)
+    for t in range(panel.shape[1]):
+        x = panel[:, t]
+        prev = np.where(np.isnan(prev), x, np.where(np.isnan(x), prev, prev + alpha * (x - prev)))
+        out[:, t] = prev
+    return out
+
+
+def panel_indicators(close: np.ndarray, quote_volume: np.ndarray, timeframe: str, short: int = 7, long: int = 30,
+                     window: int = 30) -> Dict[str, np.ndarray]:
+    """Per-symbol momentum, volatility, liquidity, RSI and trend computed column-wise on the whole panel"""
+    bars_per_day = max(1.0, 1440 / bar_minutes(timeframe))
+    bars_per_year = 365 * 1440 / bar_minutes(timeframe)
+    last = close[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(close), axis=1)
+        delta = np.diff(close, axis=1)
+        gain = ewm(np.clip(delta, 0, None), 1 / 14)[:, -1]
+        loss = ewm(np.clip(-delta, 0, None), 1 / 14)[:, -1]
+        rsi = np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+        return {
+            "momentum_short": (last / close[:, -1 - short] - 1) * 100,
+            "momentum_long": (last / close[:, -1 - long] - 1) * 100,
+            "volatility": np.nanstd(log_returns[:, -window:], axis=1) * np.sqrt(bars_per_year) * 100,
+            "quote_volume_24h": np.nanmean(quote_volume[:, -window:], axis=1) * bars_per_day,
+            "rsi_14": rsi,
+            "trend": (last / ewm(close, 2 / 51)[:, -1] - 1) * 100,
+        }
+
+
+def pct_rank(values: np.ndarray) -> np.ndarray:
+    """Cross-sectional percentile rank in [0, 1]"""
+    if len(values) < 2:
+        return np.ones_like(values)
+    return np.argsort(np.argsort(values)) / (len(values) - 1)
+
+
+def rank_panel(symbols: List[str], close: np.ndarray, quote_volume: np.ndarray, timeframe: str, short: int = 7,
+               long: int = 30, window: int = 30, min_quote_volume: float = 1_000_000,
+               weights: Optional[Dict[str, float]] = None) -> List[ScreenedCoin]:
+    """Score every symbol with enough history and liquidity by its momentum, volatility and liquidity ranks"""
+    weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    indicators = panel_indicators(close, quote_volume, timeframe, short, long, window)
+    keep = ~np.isnan(close[:, -1 - max(long, window)])
+    keep &= indicators["quote_volume_24h"] >= min_quote_volume
+    for values in indicators.values():
+        keep &= np.isfinite(values)
+    index = np.flatnonzero(keep)
+    if len(index) == 0:
+        return []
+
+    picked = {name: values[index] for name, values in indicators.items()}
+    momentum = (pct_rank(picked["momentum_short"]) + pct_rank(picked["momentum_long"])) / 2
+    score = (weights["momentum"] * momentum
+             + weights["liquidity"] * pct_rank(np.log(picked["quote_volume_24h"]))
+             + weights["volatility"] * pct_rank(picked["volatility"]))
+
+    order = np.argsort(-score, kind="stable")
+    return [ScreenedCoin(symbol=symbols[index[i]], score=round(float(score[i]), 4),
+                         **{name: round(float(values[i]), 2) for name, values in picked.items()})
+            for i in order]
+
+
+def screen_market(timeframe: str = "1d", bars: int = 120, top_k: int = 20, max_symbols: int = 400,
+                  min_quote_volume: float = 1_000_000, short: int = 7, long: int = 30, window: int = 30,
+                  weights: Optional[Dict[str, float]] = None, symbols: Optional[List[str]] = None, client=None,
+                  workers: int = 16) -> ScreenerReport:
+    """Fetch recent klines for the USDT universe (or the given pairs) and rank them"""
+    if bars <= max(long, window) + 1:
+        raise ValueError(f"bars must exceed the longest lookback ({max(long, window)}) by at least 2")
+    interval_minutes(timeframe)
+    started = time.perf_counter()
+    if client is None:
+        from binance.client import Client
+        from requests.adapters import HTTPAdapter
+
+        client = Client(os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_API_SECRET"))
+        client.session.mount("https://", HTTPAdapter(pool_connections=workers, pool_maxsize=workers))
+
+    limiter = WeightLimiter()
+    if symbols is None:
+        symbols = usdt_universe(client, limiter, max_symbols)
+    else:
+        symbols = list(dict.fromkeys(normalize_symbol(symbol) for symbol in symbols))
+    klines, errors = fetch_klines(client, symbols, timeframe, bars, limiter, workers)
+    fetch_s = time.perf_counter() - started
+
+    names, close, quote_volume = build_panel(klines, bars)
+    results = rank_panel(names, close, quote_volume, timeframe, short, long, window, min_quote_volume, weights)
+    elapsed = time.perf_counter() - started
+    print(f"🔭 Screened {len(results)}/{len(symbols)} USDT pairs on {timeframe} in {elapsed:.1f}s "
+          f"(fetch {fetch_s:.1f}s)")
+    return ScreenerReport(timeframe=timeframe, bars=bars, universe=len(symbols), scanned=len(results),
+                          results=results[:top_k], errors=errors, fetch_s=fetch_s, elapsed_s=elapsed)
+
+
+def format_screener(report: ScreenerReport) -> str:
+    lines = [f"{'#':>2} {'symbol':<14} {'score':>6} {'mom s %':>8} {'mom l %':>8} {'vol %':>7} "
+             f"{'24h vol $M':>11} {'rsi':>5} {'trend %':>8}"]
+    for i, coin in enumerate(report.results, 1):
+        lines.append(f"{i:>2} {coin.symbol:<14} {coin.score:>6.3f} {coin.momentum_short:>8.2f} "
+                     f"{coin.momentum_long:>8.2f} {coin.volatility:>7.1f} {coin.quote_volume_24h / 1e6:>11.1f} "
+                     f"{coin.rsi_14:>5.1f} {coin.trend:>8.2f}")
+    if report.errors:
+        lines.append(f"   ⚠️ {len(report.errors)} pairs failed to fetch: {', '.join(sorted(report.errors)[:10])}")
+    return "\n".join(lines)
+
+
+def save_screener(report: ScreenerReport, path: str = "output/screener.json"):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report.model_dump(), f, indent=2, default=str)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank Binance USDT pairs by momentum, volatility and liquidity")
+    parser.add_argument("symbols", nargs="*", help="Only screen these coins or pairs (default: whole USDT universe)")
+    parser.add_argument("--timeframe", default="1d")
+    parser.add_argument("--bars", type=int, default=120)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--max-symbols", type=int, default=400)
+    parser.add_argument("--min-volume", type=float, default=1_000_000, help="Minimum 24h traded value in USDT")
+    parser.add_argument("--short", type=int, default=7, help="Short momentum lookback in bars")
+    parser.add_argument("--long", type=int, default=30, help="Long momentum lookback in bars")
+    parser.add_argument("--window", type=int, default=30, help="Volatility and liquidity window in bars")
+    parser.add_argument("--workers", type=int, default=16)
+    for name, weight in DEFAULT_WEIGHTS.items():
+        parser.add_argument(f"--w-{name}", type=float, default=weight, help=f"Weight of the {name} rank")
+    parser.add_argument("--output", default="output/screener.json")
+    args = parser.parse_args(argv)
+
+    report = screen_market(args.timeframe, args.bars, args.top, args.max_symbols, args.min_volume, args.short,
+                           args.long, args.window, {name: getattr(args, f"w_{name}") for name in DEFAULT_WEIGHTS},
+                           symbols=args.symbols or None, workers=args.workers)
+    print(format_screener(report))
+    save_screener(report, args.output)
+    print(f"📄 Screener written to {args.output}")
+    return 0 if report.results else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
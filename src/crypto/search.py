@@ -0,0 +1,308 @@
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtest import evaluate_rules, performance_metrics, recommend, run_backtest
+
+MA_PAIRS = [(fast, slow) for fast, slow in [(10, 20), (10, 50), (20, 50), (20, 100), (50, 100), (50, 200), (100, 200)]]
+
+
+def _cross_up(a: str, b: str) -> str:
+    return f"(df['{a}'] > df['{b}']) & (df['{a}'].shift(1) <= df['{b}'].shift(1))"
+
+
+def _cross_down(a: str, b: str) -> str:
+    return f"(df['{a}'] < df['{b}']) & (df['{a}'].shift(1) >= df['{b}'].shift(1))"
+
+
+def _templates():
+    """(name, expression) pairs for entries, exits and optional trend filters over the FetchOHLCV columns"""
+    entries, exits = [], []
+    for kind in ("ema", "sma"):
+        for fast, slow in MA_PAIRS:
+            a, b = f"{kind}_{fast}", f"{kind}_{slow}"
+            entries.append((f"{a}_x_{b}", _cross_up(a, b)))
+            exits.append((f"{a}_x_below_{b}", _cross_down(a, b)))
+    for period in (20, 50, 100):
+        entries.append((f"close_x_ema_{period}", _cross_up("close", f"ema_{period}")))
+        exits.append((f"close_x_below_ema_{period}", _cross_down("close", f"ema_{period}")))
+    entries.append(("macd_x_signal", _cross_up("macd", "macd_signal")))
+    exits.append(("macd_x_below_signal", _cross_down("macd", "macd_signal")))
+    entries.append(("close_x_vwap", _cross_up("close", "vwap")))
+    exits.append(("close_x_below_vwap", _cross_down("close", "vwap")))
+
+    for period in (7, 14):
+        for threshold in (20, 25, 30, 35, 40):
+            entries.append((f"rsi_{period}_lt_{threshold}", f"(df['rsi_{period}'] < {threshold})"))
+        for threshold in (55, 60):
+            entries.append((f"rsi_{period}_gt_{threshold}", f"(df['rsi_{period}'] > {threshold})"))
+        for threshold in (60, 65, 70, 75, 80):
+            exits.append((f"rsi_{period}_gt_{threshold}", f"(df['rsi_{period}'] > {threshold})"))
+        exits.append((f"rsi_{period}_lt_40", f"(df['rsi_{period}'] < 40)"))
+    entries.append(("macd_hist_gt_0", "(df['macd_hist'] > 0)"))
+    exits.append(("macd_hist_lt_0", "(df['macd_hist'] < 0)"))
+
+    entries.append(("touch_bb_lower", "(df['close'] < df['bb_lower'])"))
+    entries.append(("break_bb_upper", "(df['close'] > df['bb_upper'])"))
+    exits.append(("touch_bb_upper", "(df['close'] > df['bb_upper'])"))
+    exits.append(("touch_bb_lower", "(df['close'] < df['bb_lower'])"))
+    exits.append(("back_to_sma_20", "(df['close'] > df['sma_20'])"))
+
+    filters = [
+        ("any", None),
+        ("above_ema_200", "(df['close'] > df['ema_200'])"),
+        ("above_sma_50", "(df['close'] > df['sma_50'])"),
+        ("ema_50_gt_ema_200", "(df['ema_50'] > df['ema_200'])"),
+        ("above_vwap", "(df['close'] > df['vwap'])"),
+    ]
+    return entries, exits, filters
+
+
+ENTRIES, EXITS, FILTERS = _templates()
+STOP_LOSSES = (1.0, 2.0, 3.0, 4.0, 5.0, 7.0, 10.0)
+TAKE_PROFITS = (2.0, 3.0, 4.0, 6.0, 8.0, 10.0, 15.0)
+ALLOCATIONS = (25.0, 50.0, 75.0, 100.0)
+GENES = (len(ENTRIES), len(FILTERS), len(EXITS), len(STOP_LOSSES), len(TAKE_PROFITS), len(ALLOCATIONS))
+METHODS = ("random", "genetic", "halving")
+OBJECTIVES = ("sharpe", "return", "calmar")
+
+
+class SignalBank:
+    """Every template condition evaluated once over the frame and stacked into boolean matrices"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.close = df["close"].to_numpy(dtype=float)
+        self.entries = self._stack(df, [expr for _, expr in ENTRIES])
+        self.exits = self._stack(df, [expr for _, expr in EXITS])
+        self.filters = self._stack(df, [expr for _, expr in FILTERS])
+
+    @staticmethod
+    def _stack(df, exprs):
+        columns = [np.ones(len(df), dtype=bool) if expr is None else evaluate_rules(df, expr) for expr in exprs]
+        return np.column_stack(columns)
+
+    def signals(self, genomes: np.ndarray, bars: Optional[int] = None):
+        bars = bars or len(self.close)
+        entry = self.entries[:bars, genomes[:, 0]] & self.filters[:bars, genomes[:, 1]]
+        return entry, self.exits[:bars, genomes[:, 2]]
+
+
+def simulate(close: np.ndarray, entry: np.ndarray, exit: np.ndarray, stop_loss: np.ndarray,
+             take_profit: np.ndarray, allocation: np.ndarray, cash: float = 100_000,
+             curves: bool = False) -> Dict[str, np.ndarray]:
+    """run_backtest for many strategies at once: bars × strategies signal matrices in, one metric array per field out
+
+    `close` may also be a bars × strategies matrix when the strategies trade different price series. With
+    curves=True the equity matrix and the raw win and gross profit/loss tallies are returned as well.
+    """
+    bars, count = entry.shape
+    shared = np.ndim(close) == 1
+    cash = np.full(count, float(cash))
+    position = np.zeros(count)
+    entry_price = np.zeros(count)
+    trades = np.zeros(count, dtype=np.int64)
+    wins = np.zeros(count, dtype=np.int64)
+    gross_profit = np.zeros(count)
+    gross_loss = np.zeros(count)
+    equity = np.empty((bars, count))
+    fraction = allocation / 100
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for i in range(bars):
+            price = close[i]
+            opened = entry[i] & (position == 0)
+            if opened.any():
+                size = cash * fraction / price * opened
+                position += size
+                cash -= size * price
+                entry_price[opened] = price if shared else price[opened]
+
+            holding = position > 0
+            if holding.any():
+                change = (price - entry_price) / entry_price * 100
+                closed = exit[i] & ~opened
+                closed |= change <= -stop_loss
+                closed |= change >= take_profit
+                closed &= holding
+                if closed.any():
+                    won = closed & (change > 0)
+                    trades += closed
+                    wins += won
+                    gross_profit[won] += change[won]
+                    lost = closed & ~won
+                    gross_loss[lost] -= change[lost]
+                    cash[closed] += position[closed] * (price if shared else price[closed])
+                    position[closed] = 0.0
+                    entry_price[closed] = 0.0
+
+            equity[i] = cash + position * price
+
+    returns = equity[1:] / equity[:-1] - 1
+    std = returns.std(axis=0, ddof=1) if bars > 2 else np.zeros(count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / np.where(std > 0, std, 1) * np.sqrt(252), 0.0)
+        profit_factor = np.where(gross_loss > 0, gross_profit / np.where(gross_loss > 0, gross_loss, 1), np.inf)
+    metrics = {
+        "win_rate": np.where(trades > 0, wins / np.maximum(trades, 1) * 100, 0.0),
+        "profit_factor": profit_factor,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": (equity / np.maximum.accumulate(equity, axis=0) - 1).min(axis=0) * 100,
+        "total_return": (equity[-1] / equity[0] - 1) * 100,
+        "trade_count": trades,
+    }
+    if curves:
+        metrics.update(equity=equity, wins=wins, gross_profit=gross_profit, gross_loss=gross_loss)
+    return metrics
+
+
+def score(metrics: Dict[str, np.ndarray], objective: str = "sharpe", min_trades: int = 5) -> np.ndarray:
+    if objective == "return":
+        value = metrics["total_return"]
+    elif objective == "calmar":
+        value = metrics["total_return"] / np.maximum(-metrics["max_drawdown"], 1.0)
+    else:
+        value = metrics["sharpe_ratio"]
+    return np.where(metrics["trade_count"] >= min_trades, value, -np.inf)
+
+
+def describe(genome) -> dict:
+    """Turn a genome into the Strategy fields BacktestTool and the live trader expect"""
+    entry_name, entry_expr = ENTRIES[genome[0]]
+    filter_name, filter_expr = FILTERS[genome[1]]
+    exit_name, exit_expr = EXITS[genome[2]]
+    if filter_expr is None:
+        entry_rules = entry_expr
+    else:
+        entry_rules = f"({entry_expr}) & {filter_expr}" if " & " in entry_expr else f"{entry_expr} & {filter_expr}"
+    strategy_id = entry_name if filter_expr is None else f"{entry_name}_if_{filter_name}"
+    return {
+        "strategy_id": f"{strategy_id}__{exit_name}__sl{STOP_LOSSES[genome[3]]:g}_tp{TAKE_PROFITS[genome[4]]:g}",
+        "entry_rules": entry_rules,
+        "exit_rules": exit_expr,
+        "stop_loss": STOP_LOSSES[genome[3]],
+        "take_profit": TAKE_PROFITS[genome[4]],
+        "allocation": ALLOCATIONS[genome[5]],
+    }
+
+
+class StrategySearch:
+    """Deterministic search over template strategies, scored in batches with simulate()"""
+
+    def __init__(self, df: pd.DataFrame, objective: str = "sharpe", min_trades: int = 5, seed: int = 0,
+                 batch_size: int = 1024):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}")
+        self.df = df
+        self.bank = SignalBank(df)
+        self.objective = objective
+        self.min_trades = min_trades
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.evaluated = 0
+        self.bars_simulated = 0
+        self.scores: Dict[tuple, float] = {}
+
+    def sample(self, count: int) -> np.ndarray:
+        return np.column_stack([self.rng.integers(0, size, count) for size in GENES])
+
+    def evaluate(self, genomes: np.ndarray, bars: Optional[int] = None) -> np.ndarray:
+        """Score each genome on the first `bars` candles (all of them by default)"""
+        bars = bars or len(self.bank.close)
+        scores = np.empty(len(genomes))
+        for start in range(0, len(genomes), self.batch_size):
+            batch = genomes[start:start + self.batch_size]
+            entry, exit = self.bank.signals(batch, bars)
+            metrics = simulate(self.bank.close[:bars], entry, exit,
+                               np.take(STOP_LOSSES, batch[:, 3]), np.take(TAKE_PROFITS, batch[:, 4]),
+                               np.take(ALLOCATIONS, batch[:, 5]))
+            scores[start:start + len(batch)] = score(metrics, self.objective, self.min_trades)
+        self.evaluated += len(genomes)
+        self.bars_simulated += len(genomes) * bars
+        if bars == len(self.bank.close):
+            self.scores.update(zip(map(tuple, genomes.tolist()), scores.tolist()))
+        return scores
+
+    def random(self, budget: int) -> None:
+        self.evaluate(np.unique(self.sample(budget), axis=0))
+
+    def halving(self, budget: int, eta: int = 3, min_bars: int = 300) -> None:
+        """Successive halving: score everyone on a short prefix, keep the best 1/eta, grow the prefix"""
+        total = len(self.bank.close)
+        genomes = np.unique(self.sample(budget), axis=0)
+        rungs = max(1, int(np.log(max(total / min_bars, 1)) / np.log(eta)) + 1)
+        for rung in range(rungs):
+            bars = total if rung == rungs - 1 else max(min_bars, total // eta ** (rungs - 1 - rung))
+            scores = self.evaluate(genomes, bars)
+            if bars == total:
+                break
+            keep = max(1, len(genomes) // eta)
+            genomes = genomes[np.argsort(-scores, kind="stable")[:keep]]
+
+    def genetic(self, budget: int, population: int = 512, elite: float = 0.1, mutation: float = 0.2) -> None:
+        """Tournament selection, uniform crossover and per-gene mutation until `budget` strategies are scored"""
+        population = max(4, min(population, budget))
+        genomes = self.sample(population)
+        scores = self.evaluate(genomes)
+        while self.evaluated + population <= budget:
+            order = np.argsort(-scores, kind="stable")
+            elites = genomes[order[:max(1, int(population * elite))]]
+
+            count = population - len(elites)
+            a, b = self.rng.integers(0, population, (2, count)), self.rng.integers(0, population, (2, count))
+            first = np.where(scores[a[0]] >= scores[a[1]], a[0], a[1])
+            second = np.where(scores[b[0]] >= scores[b[1]], b[0], b[1])
+            children = np.where(self.rng.random((count, len(GENES))) < 0.5, genomes[first], genomes[second])
+            mutate = self.rng.random(children.shape) < mutation
+            children = np.where(mutate, self.sample(count), children)
+
+            genomes = np.vstack([elites, children])
+            scores = self.evaluate(genomes)
+
+    def top(self, k: int) -> List[tuple]:
+        """Best fully scored genomes, one per distinct entry/filter/exit combination"""
+        ranked = sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
+        best, seen = [], set()
+        for genome, value in ranked:
+            if len(best) == k or not np.isfinite(value):
+                break
+            if genome[:3] not in seen:
+                seen.add(genome[:3])
+                best.append(genome)
+        return best
+
+
+def search_strategies(df: pd.DataFrame, method: str = "halving", budget: int = 3000, top_k: int = 5,
+                      objective: str = "sharpe", min_trades: int = 5, seed: int = 0) -> dict:
+    """Run one search and re-score the top strategies with run_backtest so they match BacktestTool exactly"""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    started = time.perf_counter()
+    engine = StrategySearch(df, objective=objective, min_trades=min_trades, seed=seed)
+    getattr(engine, method)(budget)
+    elapsed = time.perf_counter() - started
+
+    results = []
+    for genome in engine.top(top_k):
+        strategy = describe(genome)
+        run = run_backtest(df, strategy["entry_rules"], strategy["exit_rules"],
+                           strategy["stop_loss"], strategy["take_profit"], strategy["allocation"])
+        metrics = performance_metrics(run["equity"], run["trades"])
+        results.append({
+            "strategy": strategy,
+            "performance": metrics,
+            "recommendation": recommend(metrics["total_return"], metrics["max_drawdown"]),
+            "score": engine.scores[genome],
+        })
+
+    return {
+        "method": method,
+        "objective": objective,
+        "seed": seed,
+        "evaluated": engine.evaluated,
+        "elapsed_s": elapsed,
+        "strategies_per_s": engine.evaluated / elapsed if elapsed else 0.0,
+        "bars_per_s": engine.bars_simulated / elapsed if elapsed else 0.0,
+        "results": results,
+    }
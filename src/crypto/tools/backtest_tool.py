@@ -1,9 +1,13 @@
 import pandas as pd
 import numpy as np
-from typing import Type, Dict
+from typing import Type, Dict, List, Any, Optional
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 import os
+import time
+
+from ..backtest import RECOMMENDATION_RANK, SignalCache, performance_metrics, recommend, run_backtest
+from ..search import simulate
 
 class StrategyBackTestInput(BaseModel):
     strategy_id: str = Field(description="Unique identifier of the strategy")
@@ -41,6 +45,7 @@ class StrategyBackTestOutput(BaseModel):
     performance: StrategyPerformance = Field(description="Performance of the strategy")
     strategy: Strategy = Field(description="Strategy used for the backtest")
     recommendation: str = Field(description="Recommendation for the strategy")
+    robustness: Optional[float] = Field(default=None, description="Walk-forward robustness score (0-100), if validated")
 
 
 class BacktestTool(BaseTool):
@@ -57,95 +62,11 @@ class BacktestTool(BaseTool):
         df = pd.read_csv(ohlcv_csv_path, parse_dates=True, index_col="timestamp")
         df["position"] = 0
 
-        safe_ns = {"df": df, "np": np}
-
-        entry_signal = pd.Series(eval(entry_rules, {"__builtins__": {}}, safe_ns), index=df.index)
-        exit_signal = pd.Series(eval(exit_rules, {"__builtins__": {}}, safe_ns), index=df.index)
-
-        position = 0
-        entry_price = 0
-        cash = 100_000
-        equity_curve = []
-
-        trades = 0
-        wins = 0
-        losses = 0
-        gross_profit = 0
-        gross_loss = 0
-
-        for i in range(len(df)):
-            price = df["close"].iloc[i]
-
-            # Entry
-            if entry_signal.iloc[i] and position == 0:
-                position = (cash * allocation / 100) / price
-                cash -= position * price
-                entry_price = price
-
-            # Exit
-            elif exit_signal.iloc[i] and position > 0:
-                pnl = (price - entry_price) / entry_price * 100
-                if pnl > 0:
-                    wins += 1
-                    gross_profit += pnl
-                else:
-                    losses += 1
-                    gross_loss += abs(pnl)
-
-                trades += 1
-                cash += position * price
-                position = 0
-                entry_price = 0
-
-            # Stop-loss / Take-profit
-            if position > 0:
-                drawdown = (price - entry_price) / entry_price * 100
-                if drawdown <= -stop_loss or drawdown >= take_profit:
-                    pnl = (price - entry_price) / entry_price * 100
-                    if pnl > 0:
-                        wins += 1
-                        gross_profit += pnl
-                    else:
-                        losses += 1
-                        gross_loss += abs(pnl)
-
-                    trades += 1
-                    cash += position * price
-                    position = 0
-                    entry_price = 0
-
-            equity_curve.append(cash + position * price)
-
-        equity_series = pd.Series(equity_curve, index=df.index)
-        profit_percent = (equity_series.iloc[-1] / equity_series.iloc[0] - 1) * 100
-        max_drawdown_percent = ((equity_series / equity_series.cummax() - 1).min()) * 100
-        daily_returns = equity_series.pct_change().dropna()
-        sharpe_ratio = (
-            (daily_returns.mean() / daily_returns.std()) * np.sqrt(252)
-            if daily_returns.std() != 0
-            else 0
-        )
+        result = run_backtest(df, entry_rules, exit_rules, stop_loss, take_profit, allocation)
+        metrics = performance_metrics(result["equity"], result["trades"])
+        recommendation = recommend(metrics["total_return"], metrics["max_drawdown"])
 
-        win_rate = (wins / trades * 100) if trades > 0 else 0
-        profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else float("inf")
-        total_return = profit_percent
-        trade_count = trades
-
-        if profit_percent > 3 and max_drawdown_percent > -10:
-            recommendation = "Keep"
-        elif profit_percent < 1:
-            recommendation = "Discard"
-        else:
-            recommendation = "Modify"
-
-        performance = StrategyPerformance(
-            win_rate=win_rate,
-            profit_factor=profit_factor,
-            sharpe_ratio=sharpe_ratio,
-            max_drawdown=max_drawdown_percent,
-            total_return=total_return,
-            trade_count=trade_count
-        )
+        performance = StrategyPerformance(**metrics)
 
         strategy = Strategy(
             strategy_id=strategy_id,
@@ -164,3 +85,86 @@ class BacktestTool(BaseTool):
             "recommendation": recommendation
         }
 
+
+class BatchStrategy(BaseModel):
+    strategy_id: str = Field(description="Unique identifier of the strategy")
+    entry_rules: str = Field(description="Python expression for entry signal (returns boolean Series)")
+    exit_rules: str = Field(description="Python expression for exit signal (returns boolean Series)")
+    stop_loss: float = Field(ge=0, le=100, description="Stop-loss percentage (0-100)")
+    take_profit: float = Field(ge=0, le=100, description="Take-profit percentage (0-100)")
+    allocation: float = Field(ge=0, le=100, description="Percentage of portfolio allocated to this strategy")
+
+class BatchBacktestInput(BaseModel):
+    coin_symbol: str = Field(description="Ticker symbol of the coin")
+    timeframe: str = Field(description="Timeframe of the strategies")
+    ohlcv_csv_path: str = Field(description="Path to saved CSV of historical OHLCV data")
+    strategies: List[BatchStrategy] = Field(description="Strategies to backtest on the same data")
+
+
+_datasets: Dict[str, tuple] = {}
+
+
+def load_dataset(ohlcv_csv_path: str):
+    """Frame and signal cache for a CSV, reused across calls until the file changes"""
+    if not os.path.exists(ohlcv_csv_path):
+        raise FileNotFoundError(f"CSV not found at {ohlcv_csv_path}")
+    mtime = os.path.getmtime(ohlcv_csv_path)
+    cached = _datasets.get(ohlcv_csv_path)
+    if cached is None or cached[0] != mtime:
+        df = pd.read_csv(ohlcv_csv_path, parse_dates=True, index_col="timestamp")
+        if len(_datasets) >= 4:
+            _datasets.pop(next(iter(_datasets)))
+        cached = _datasets[ohlcv_csv_path] = (mtime, df, SignalCache(df))
+    return cached[1], cached[2]
+
+
+class BatchBacktestTool(BaseTool):
+    name: str = "Batch Backtest Tool"
+    description: str = (
+        "Backtests a list of strategies for one coin on the same historical OHLCV data in a single call "
+        "and returns compact metrics ranked best first. Use it to compare variants instead of calling "
+        "the Dynamic Backtest Tool once per strategy."
+    )
+    args_schema: Type[BaseModel] = BatchBacktestInput
+
+    def _run(self, coin_symbol: str, timeframe: str, ohlcv_csv_path: str, strategies: List[Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        df, signals = load_dataset(ohlcv_csv_path)
+
+        valid, entries, exits, errors = [], [], [], {}
+        for strategy in strategies:
+            strategy = strategy if isinstance(strategy, BatchStrategy) else BatchStrategy(**strategy)
+            try:
+                entries.append(signals.evaluate(strategy.entry_rules))
+                exits.append(signals.evaluate(strategy.exit_rules))
+            except Exception as e:
+                errors[strategy.strategy_id] = f"{type(e).__name__}: {e}"
+                del entries[len(valid):]
+                continue
+            valid.append(strategy)
+
+        results = []
+        if valid:
+            metrics = simulate(
+                df["close"].to_numpy(dtype=float), np.column_stack(entries), np.column_stack(exits),
+                np.array([s.stop_loss for s in valid]), np.array([s.take_profit for s in valid]),
+                np.array([s.allocation for s in valid]),
+            )
+            for i, strategy in enumerate(valid):
+                row = {"strategy_id": strategy.strategy_id}
+                row.update({key: round(float(values[i]), 3) for key, values in metrics.items()})
+                row["trade_count"] = int(metrics["trade_count"][i])
+                row["recommendation"] = recommend(metrics["total_return"][i], metrics["max_drawdown"][i])
+                results.append(row)
+            results.sort(key=lambda row: (RECOMMENDATION_RANK[row["recommendation"]], -row["sharpe_ratio"],
+                                          -row["total_return"]))
+
+        return {
+            "coin_symbol": coin_symbol,
+            "timeframe": timeframe,
+            "bars": len(df),
+            "evaluated": len(valid),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "results": results,
+            "errors": errors,
+        }
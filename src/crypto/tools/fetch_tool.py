@@ -14,6 +14,100 @@ class FetchOHLCVInput(BaseModel):
     end_date: str = Field(description="End date for fetching data, e.g., '2023-01-10'")
 
 
+INTERVAL_MINUTES = {
+    "1m": 1, "3m": 3, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "2h": 120, "4h": 240, "6h": 360, "8h": 480,
+    "12h": 720, "1d": 1440, "3d": 4320, "1w": 10080, "1M": 43200,
+}
+
+
+def interval_minutes(timeframe: str) -> int:
+    """Length of a Binance kline interval in minutes; 1M counts as 30 days"""
+    if timeframe not in INTERVAL_MINUTES:
+        raise ValueError(f"Unknown timeframe {timeframe!r}, expected one of {', '.join(INTERVAL_MINUTES)}")
+    return INTERVAL_MINUTES[timeframe]
+
+
+def normalize_symbol(symbol: str) -> str:
+    """BTC, btc/usdt and BTCUSDT all become BTCUSDT"""
+    symbol = symbol.upper().replace("/", "").replace("-", "")
+    return symbol if symbol.endswith("USDT") else f"{symbol}USDT"
+
+
+def default_start_date(timeframe: str, end_date: Optional[str] = None) -> str:
+    """History window the backtester uses when no start date is given"""
+    end = pd.Timestamp.utcnow().tz_localize(None) if end_date is None else pd.to_datetime(end_date)
+    minutes = interval_minutes(timeframe)
+    days = 180 if minutes <= 60 else 365 if minutes <= 240 else 730
+    return (end - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def fetch_ohlcv(symbol: str, timeframe: str, start_date: str, end_date: Optional[str] = None, client=None) -> str:
+    """Download candles, add indicators and save them as a CSV; returns the cached path when it already exists"""
+    path = f"data/{symbol}_{timeframe}_enriched.csv"
+
+    if os.path.exists(path):
+        return path
+
+    if client is None:
+        client = Client(os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_API_SECRET"))
+
+    if end_date is None:
+        end_date = pd.Timestamp.utcnow()
+    else:
+        end_date = pd.to_datetime(end_date)
+
+    parse_sdate = pd.to_datetime(start_date)
+    start_timestamp = parse_sdate.strftime('%Y-%m-%d %H:%M:%S')
+    end_timestamp = end_date.strftime('%Y-%m-%d %H:%M:%S')
+
+    all_data = []
+    current_start_time = start_timestamp
+    batch_number = 1
+
+    while current_start_time < end_timestamp:
+        try:
+            ohlcv_data = client.get_historical_klines(
+                symbol, timeframe, current_start_time, end_timestamp, limit=1000
+            )
+
+            if not ohlcv_data:
+                break
+
+            df = pd.DataFrame(
+                ohlcv_data,
+                columns=[
+                    'timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+                    'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
+                    'taker_buy_quote_asset_volume', 'ignore'
+                ]
+            )
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
+            df = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+
+            all_data.append(df)
+            current_start_time = (df.index[-1] + pd.Timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S')
+            batch_number += 1
+
+        except Exception as e:
+            print(f"Error fetching batch {batch_number}: {e}")
+            break
+
+    if not all_data:
+        raise RuntimeError(f"Failed to fetch OHLCV data for {symbol}")
+
+    final_df = pd.concat(all_data)
+    final_df = add_indicators(final_df)
+    final_df = final_df.bfill().ffill()
+
+    os.makedirs("data", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    final_df.to_csv(tmp_path)
+    os.replace(tmp_path, path)
+
+    return path
+
+
 class FetchOHLCVTool(BaseTool):
     name: str = "FetchOHLCV"
     description: str = (
@@ -23,97 +117,41 @@ class FetchOHLCVTool(BaseTool):
     args_schema: Type[BaseModel] = FetchOHLCVInput
 
     def _run(self, symbol: str, timeframe: str, start_date: str, end_date: Optional[str] = None) -> Dict[str, str]:
-        os.makedirs("data", exist_ok=True)
-        path = f"data/{symbol}_{timeframe}_enriched.csv"
-
-        if os.path.exists(path):
-            return {"ohlcv_csv_path": path}
-        
-        api_key = os.getenv("BINANCE_API_KEY")
-        api_secret = os.getenv("BINANCE_API_SECRET")
-        client = Client(api_key, api_secret)
-
-        if end_date is None:
-            end_date = pd.Timestamp.utcnow()
-        else:
-            end_date = pd.to_datetime(end_date)
-
-        parse_sdate = pd.to_datetime(start_date)
-        start_timestamp = parse_sdate.strftime('%Y-%m-%d %H:%M:%S')
-        end_timestamp = end_date.strftime('%Y-%m-%d %H:%M:%S')
-
-        all_data = []
-        current_start_time = start_timestamp
-        batch_number = 1
-
-        while current_start_time < end_timestamp:
-            try:
-                ohlcv_data = client.get_historical_klines(
-                    symbol, timeframe, current_start_time, end_timestamp, limit=1000
-                )
-
-                if not ohlcv_data:
-                    break
-
-                df = pd.DataFrame(
-                    ohlcv_data,
-                    columns=[
-                        'timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time',
-                        'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
-                        'taker_buy_quote_asset_volume', 'ignore'
-                    ]
-                )
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                df = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
-
-                all_data.append(df)
-                current_start_time = (df.index[-1] + pd.Timedelta(seconds=1)).strftime('%Y-%m-%d %H:%M:%S')
-                batch_number += 1
-
-            except Exception as e:
-                print(f"Error fetching batch {batch_number}: {e}")
-                break
+        from ..prefetch import prefetcher
+
+        return {"ohlcv_csv_path": prefetcher.fetch(symbol, timeframe, start_date, end_date)}
 
-        if not all_data:
-            raise RuntimeError(f"Failed to fetch OHLCV data for {symbol}")
+    def _add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        return add_indicators(df)
 
-        final_df = pd.concat(all_data)
-        final_df = self._add_indicators(final_df)
-        final_df = final_df.fillna(method="bfill").fillna(method="ffill")
 
-        os.makedirs("data", exist_ok=True)
-        final_df.to_csv(path)
+def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    # Moving Averages
+    for period in [10, 20, 50, 100, 200]:
+        df[f"ema_{period}"] = df["close"].ewm(span=period).mean()
+        df[f"sma_{period}"] = df["close"].rolling(window=period).mean()
 
-        return {"ohlcv_csv_path": path}
+    # RSI
+    for period in [7, 14]:
+        df[f"rsi_{period}"] = ta.momentum.RSIIndicator(df["close"], window=period).rsi()
 
-    def _add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        # Moving Averages
-        for period in [10, 20, 50, 100, 200]:
-            df[f"ema_{period}"] = df["close"].ewm(span=period).mean()
-            df[f"sma_{period}"] = df["close"].rolling(window=period).mean()
-
-        # RSI
-        for period in [7, 14]:
-            df[f"rsi_{period}"] = ta.momentum.RSIIndicator(df["close"], window=period).rsi()
-
-        # MACD
-        macd = ta.trend.MACD(df["close"])
-        df["macd"] = macd.macd()
-        df["macd_signal"] = macd.macd_signal()
-        df["macd_hist"] = macd.macd_diff()
-
-        # Bollinger Bands
-        bb = ta.volatility.BollingerBands(df["close"], window=20)
-        df["bb_upper"] = bb.bollinger_hband()
-        df["bb_lower"] = bb.bollinger_lband()
-
-        # ATR
-        df["atr_14"] = ta.volatility.AverageTrueRange(
-            df["high"], df["low"], df["close"], window=14
-        ).average_true_range()
-
-        # VWAP
-        df["vwap"] = (df["volume"] * (df["high"] + df["low"] + df["close"]) / 3).cumsum() / df["volume"].cumsum()
-
-        return df
+    # MACD
+    macd = ta.trend.MACD(df["close"])
+    df["macd"] = macd.macd()
+    df["macd_signal"] = macd.macd_signal()
+    df["macd_hist"] = macd.macd_diff()
+
+    # Bollinger Bands
+    bb = ta.volatility.BollingerBands(df["close"], window=20)
+    df["bb_upper"] = bb.bollinger_hband()
+    df["bb_lower"] = bb.bollinger_lband()
+
+    # ATR
+    df["atr_14"] = ta.volatility.AverageTrueRange(
+        df["high"], df["low"], df["close"], window=14
+    ).average_true_range()
+
+    # VWAP
+    df["vwap"] = (df["volume"] * (df["high"] + df["low"] + df["close"]) / 3).cumsum() / df["volume"].cumsum()
+
+    return df
@@ -0,0 +1,43 @@
+from typing import Type, Dict, Any
+
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+from ..cache import enabled, get_cache
+from ..screener import screen_market
+
+
+class MarketScreenerInput(BaseModel):
+    timeframe: str = Field(default="1d", description="Candle timeframe to rank on, e.g., 4h, 1d")
+    top_k: int = Field(default=20, ge=1, le=50, description="How many of the best ranked pairs to return")
+    max_symbols: int = Field(default=400, ge=10, le=600, description="Most traded USDT pairs to consider")
+    min_quote_volume: float = Field(default=1_000_000, ge=0, description="Minimum 24h traded value in USDT")
+
+
+class MarketScreenerTool(BaseTool):
+    name: str = "Market Screener Tool"
+    description: str = (
+        "Ranks the whole Binance spot USDT universe by price momentum, volatility and liquidity using recent "
+        "candles. Stablecoins and leveraged tokens are excluded, as are pairs with too little history or volume. "
+        "Use it to check whether coins trending in the news are also strong and liquid in the market."
+    )
+    args_schema: Type[BaseModel] = MarketScreenerInput
+
+    def _run(self, timeframe: str = "1d", top_k: int = 20, max_symbols: int = 400,
+             min_quote_volume: float = 1_000_000) -> Dict[str, Any]:
+        def screen():
+            report = screen_market(timeframe, top_k=top_k, max_symbols=max_symbols,
+                                   min_quote_volume=min_quote_volume)
+            return {
+                "timeframe": report.timeframe,
+                "universe": report.universe,
+                "scanned": report.scanned,
+                "results": [coin.model_dump() for coin in report.results],
+                "failed_pairs": len(report.errors),
+            }
+
+        if not enabled():
+            return screen()
+        parts = {"timeframe": timeframe, "top_k": top_k, "max_symbols": max_symbols,
+                 "min_quote_volume": min_quote_volume}
+        return get_cache().cached("screener", parts, screen)
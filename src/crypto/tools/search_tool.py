@@ -0,0 +1,54 @@
+import os
+from typing import Type, Dict, Any
+
+import pandas as pd
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+from ..search import METHODS, OBJECTIVES, search_strategies
+from .backtest_tool import Strategy, StrategyPerformance
+
+
+class StrategySearchInput(BaseModel):
+    coin_symbol: str = Field(description="Ticker symbol of the coin, e.g., BTCUSDT")
+    timeframe: str = Field(description="Timeframe of the strategy")
+    ohlcv_csv_path: str = Field(description="Path to saved CSV of historical OHLCV data")
+    method: str = Field(default="halving", description=f"Search method, one of {', '.join(METHODS)}")
+    budget: int = Field(default=3000, ge=10, le=200_000, description="Number of candidate strategies to score")
+    top_k: int = Field(default=5, ge=1, le=20, description="How many of the best strategies to return")
+    objective: str = Field(default="sharpe", description=f"Ranking metric, one of {', '.join(OBJECTIVES)}")
+    seed: int = Field(default=0, description="Random seed; the same seed and data always give the same results")
+
+
+class StrategySearchTool(BaseTool):
+    name: str = "Strategy Search Tool"
+    description: str = (
+        "Searches thousands of template strategies (moving average and MACD crossovers, RSI thresholds, "
+        "Bollinger band touches, optional trend filters, stop-loss/take-profit grids) on historical OHLCV data "
+        "and returns the best ones with their backtest performance, ready to pass to the Dynamic Backtest Tool."
+    )
+    args_schema: Type[BaseModel] = StrategySearchInput
+
+    def _run(self, coin_symbol: str, timeframe: str, ohlcv_csv_path: str, method: str = "halving",
+             budget: int = 3000, top_k: int = 5, objective: str = "sharpe", seed: int = 0) -> Dict[str, Any]:
+        if not os.path.exists(ohlcv_csv_path):
+            raise FileNotFoundError(f"CSV not found at {ohlcv_csv_path}")
+
+        df = pd.read_csv(ohlcv_csv_path, parse_dates=True, index_col="timestamp")
+        report = search_strategies(df, method=method, budget=budget, top_k=top_k, objective=objective, seed=seed)
+
+        results = []
+        for result in report["results"]:
+            strategy = Strategy(coin_symbol=coin_symbol, timeframe=timeframe, **result["strategy"])
+            results.append({
+                "performance": StrategyPerformance(**result["performance"]).dict(),
+                "strategy": strategy.dict(),
+                "recommendation": result["recommendation"],
+            })
+
+        return {
+            "method": report["method"],
+            "evaluated": report["evaluated"],
+            "strategies_per_s": round(report["strategies_per_s"]),
+            "results": results,
+        }
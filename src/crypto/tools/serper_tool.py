@@ -0,0 +1,22 @@
+from typing import Any
+
+from crewai_tools import SerperDevTool
+
+from ..cache import enabled, get_cache
+
+
+class CachedSerperDevTool(SerperDevTool):
+    """SerperDevTool whose results are reused from the response cache until the serper TTL expires"""
+
+    def _run(self, **kwargs: Any) -> Any:
+        if not enabled():
+            return super()._run(**kwargs)
+        parts = {
+            "args": kwargs,
+            "search_type": self.search_type,
+            "n_results": self.n_results,
+            "country": self.country,
+            "location": self.location,
+            "locale": self.locale,
+        }
+        return get_cache().cached("serper", parts, lambda: super(CachedSerperDevTool, self)._run(**kwargs))
@@ -0,0 +1,45 @@
+from typing import Type, Dict, Any
+
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+from ..validation import METHODS, validate
+from .backtest_tool import Strategy, StrategyBackTestInput, StrategyPerformance, load_dataset
+
+
+class StrategyValidationInput(StrategyBackTestInput):
+    method: str = Field(default="walk_forward", description=f"Validation scheme, one of {', '.join(METHODS)}")
+    folds: int = Field(default=5, ge=2, le=20, description="Number of test windows")
+    train_frac: float = Field(default=0.5, gt=0, lt=1, description="Share of history used to train the first walk-forward window")
+    anchored: bool = Field(default=False, description="Walk forward with an expanding instead of a rolling training window")
+
+
+class StrategyValidationTool(BaseTool):
+    name: str = "Walk-Forward Validation Tool"
+    description: str = (
+        "Checks whether a strategy holds up out of sample. Scores it on walk-forward or k-fold train/test "
+        "windows of the historical OHLCV data and returns the full-history performance, the stitched "
+        "out-of-sample performance, a 0-100 robustness score and a recommendation that is held back to "
+        "Modify when the strategy is not robust."
+    )
+    args_schema: Type[BaseModel] = StrategyValidationInput
+
+    def _run(self, strategy_id: str, coin_symbol: str, entry_rules: str, exit_rules: str, stop_loss: float,
+             take_profit: float, allocation: float, timeframe: str, ohlcv_csv_path: str, method: str = "walk_forward",
+             folds: int = 5, train_frac: float = 0.5, anchored: bool = False) -> Dict[str, Any]:
+        df, signals = load_dataset(ohlcv_csv_path)
+        strategy = Strategy(strategy_id=strategy_id, coin_symbol=coin_symbol, entry_rules=entry_rules,
+                            exit_rules=exit_rules, stop_loss=stop_loss, take_profit=take_profit,
+                            allocation=allocation, timeframe=timeframe)
+        report = validate(df, [strategy.dict()], method=method, folds=folds, train_frac=train_frac,
+                          anchored=anchored, signals=signals)
+        result = report["results"][0]
+
+        return {
+            "performance": StrategyPerformance(**result["performance"]).dict(),
+            "out_of_sample": StrategyPerformance(**result["out_of_sample"]).dict(),
+            "robustness": result["robustness"],
+            "strategy": strategy.dict(),
+            "recommendation": result["recommendation"],
+            "windows": result["windows"],
+        }
@@ -0,0 +1,275 @@
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .backtest import SignalCache, recommend
+from .search import OBJECTIVES, score, simulate
+
+METHODS = ("walk_forward", "kfold")
+ROBUST_THRESHOLD = 50.0
+MIN_TEST_BARS = 20
+
+
+def make_windows(bars: int, method: str = "walk_forward", folds: int = 5, train_frac: float = 0.5,
+                 anchored: bool = False, embargo: int = 0) -> List[dict]:
+    """Train/test windows as [start, end) bar ranges
+
+    walk_forward trains on the bars before each test block (a rolling window, or everything so far when
+    anchored); kfold tests on each of `folds` contiguous blocks and trains on the blocks either side of it.
+    `embargo` bars between train and test are left out of training.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    if folds < 2:
+        raise ValueError("folds must be at least 2")
+
+    windows = []
+    if method == "walk_forward":
+        train = int(bars * train_frac)
+        test = (bars - train) // folds
+        if train - embargo < 2 or test < MIN_TEST_BARS:
+            raise ValueError(f"{bars} bars are too few for {folds} walk-forward folds with train_frac={train_frac}")
+        for k in range(folds):
+            start = train + k * test
+            end = bars if k == folds - 1 else start + test
+            windows.append({"train": [(0 if anchored else k * test, start - embargo)], "test": (start, end)})
+    else:
+        block = bars // folds
+        if block < MIN_TEST_BARS:
+            raise ValueError(f"{bars} bars are too few for {folds} folds")
+        for k in range(folds):
+            start, end = k * block, bars if k == folds - 1 else (k + 1) * block
+            train = [(a, b) for a, b in ((0, start - embargo), (end + embargo, bars)) if b - a >= 2]
+            windows.append({"train": train, "test": (start, end)})
+    return windows
+
+
+def run_segments(close: np.ndarray, entry: np.ndarray, exit: np.ndarray, stop_loss: np.ndarray,
+                 take_profit: np.ndarray, allocation: np.ndarray, segments: List[tuple]) -> dict:
+    """Simulate every strategy on every segment in one pass, each (segment, strategy) pair being one column
+
+    Segments shorter than the longest are padded with their last close and no signals, which leaves
+    trades and equity unchanged; metrics are then taken over each column's own length.
+    """
+    count = entry.shape[1]
+    rows = max(end - start for start, end in segments)
+    prices = np.empty((rows, len(segments) * count))
+    entries = np.zeros((rows, len(segments) * count), dtype=bool)
+    exits = np.zeros_like(entries)
+    for j, (start, end) in enumerate(segments):
+        columns = slice(j * count, (j + 1) * count)
+        length = end - start
+        prices[:length, columns] = close[start:end, None]
+        prices[length:, columns] = close[end - 1]
+        entries[:length, columns] = entry[start:end]
+        exits[:length, columns] = exit[start:end]
+
+    runs = simulate(prices, entries, exits, np.tile(stop_loss, len(segments)), np.tile(take_profit, len(segments)),
+                    np.tile(allocation, len(segments)), curves=True)
+    runs["segments"] = segments
+    runs["count"] = count
+    return runs
+
+
+def stitch(runs: dict, picks: List[tuple]) -> Dict[str, np.ndarray]:
+    """StrategyPerformance fields for segments chained end to end
+
+    `picks` holds (segment index, strategy indices) pairs; each segment's equity curve is rescaled to
+    continue where the previous one ended, so a single full-history segment matches run_backtest.
+    """
+    count = runs["count"]
+    curves, returns, trades, wins, gross_profit, gross_loss = [], [], 0, 0, 0.0, 0.0
+    for segment, strategies in picks:
+        start, end = runs["segments"][segment]
+        columns = segment * count + np.asarray(strategies)
+        equity = runs["equity"][:end - start, columns]
+        curves.append(equity if not curves else equity * (curves[-1][-1] / equity[0]))
+        returns.append(equity[1:] / equity[:-1] - 1)
+        trades = trades + runs["trade_count"][columns]
+        wins = wins + runs["wins"][columns]
+        gross_profit = gross_profit + runs["gross_profit"][columns]
+        gross_loss = gross_loss + runs["gross_loss"][columns]
+
+    returns = np.concatenate(returns)
+    curve = np.concatenate(curves)
+    std = returns.std(axis=0, ddof=1) if len(returns) > 1 else np.zeros(returns.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / np.where(std > 0, std, 1) * np.sqrt(252), 0.0)
+        profit_factor = np.where(gross_loss > 0, gross_profit / np.where(gross_loss > 0, gross_loss, 1), np.inf)
+    return {
+        "win_rate": np.where(trades > 0, wins / np.maximum(trades, 1) * 100, 0.0),
+        "profit_factor": profit_factor,
+        "sharpe_ratio": sharpe,
+        "max_drawdown": (curve / np.maximum.accumulate(curve, axis=0) - 1).min(axis=0) * 100,
+        "total_return": (curve[-1] / curve[0] - 1) * 100,
+        "trade_count": trades,
+    }
+
+
+def robustness(train_returns: np.ndarray, test_returns: np.ndarray, test_trades: np.ndarray,
+               train_bars: np.ndarray, test_bars: np.ndarray) -> np.ndarray:
+    """0-100 per strategy from windows × strategies arrays
+
+    Half of the score is the share of profitable test windows, 30% is walk-forward efficiency (growth
+    per bar out of sample relative to in sample, capped at 1) and 20% is the share of test windows
+    that traded at all.
+    """
+    consistency = (test_returns > 0).mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        test_growth = np.log1p(test_returns / 100).sum(axis=0) / test_bars.sum()
+        train_growth = np.log1p(train_returns / 100).sum(axis=0) / train_bars.sum()
+        efficiency = np.where(train_growth > 0, np.clip(test_growth / train_growth, 0, 1), 0.0)
+    activity = (test_trades > 0).mean(axis=0)
+    return 100 * (0.5 * consistency + 0.3 * np.nan_to_num(efficiency) + 0.2 * activity)
+
+
+def robust_recommendation(performance: dict, out_of_sample: dict, robustness_score: float) -> str:
+    """recommend() on the full history, held back to Modify when the strategy does not survive validation"""
+    recommendation = recommend(performance["total_return"], performance["max_drawdown"])
+    if recommendation == "Keep" and (robustness_score < ROBUST_THRESHOLD or out_of_sample["total_return"] <= 0):
+        return "Modify"
+    return recommendation
+
+
+def _row(metrics: Dict[str, np.ndarray], i: int) -> dict:
+    row = {key: float(values[i]) for key, values in metrics.items()}
+    row["trade_count"] = int(metrics["trade_count"][i])
+    return row
+
+
+def validate(df: pd.DataFrame, strategies: List[dict], method: str = "walk_forward", folds: int = 5,
+             train_frac: float = 0.5, anchored: bool = False, embargo: int = 0, objective: str = "sharpe",
+             min_trades: int = 3, signals: Optional[SignalCache] = None) -> dict:
+    """Score strategies on train/test windows cut from signals computed once over the whole history
+
+    Every strategy gets its full-history performance, stitched out-of-sample performance and a robustness
+    score. With several strategies, each window also picks the best one on its training data and the
+    picks are scored out of sample, which is walk-forward optimisation over the given variants.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    started = time.perf_counter()
+    signals = signals or SignalCache(df)
+    entry = np.column_stack([signals.evaluate(s["entry_rules"]) for s in strategies])
+    exit = np.column_stack([signals.evaluate(s["exit_rules"]) for s in strategies])
+    windows = make_windows(len(df), method, folds, train_frac, anchored, embargo)
+
+    segments = [(0, len(df))]
+    for window in windows:
+        for segment in window["train"] + [window["test"]]:
+            if segment not in segments:
+                segments.append(segment)
+    runs = run_segments(df["close"].to_numpy(dtype=float), entry, exit,
+                        np.array([s["stop_loss"] for s in strategies], dtype=float),
+                        np.array([s["take_profit"] for s in strategies], dtype=float),
+                        np.array([s["allocation"] for s in strategies], dtype=float), segments)
+
+    everyone = np.arange(len(strategies))
+    full = stitch(runs, [(0, everyone)])
+    trains = [stitch(runs, [(segments.index(s), everyone) for s in w["train"]]) for w in windows]
+    tests = [stitch(runs, [(segments.index(w["test"]), everyone)]) for w in windows]
+    out_of_sample = stitch(runs, [(segments.index(w["test"]), everyone) for w in windows])
+    scores = robustness(
+        np.array([m["total_return"] for m in trains]), np.array([m["total_return"] for m in tests]),
+        np.array([m["trade_count"] for m in tests]),
+        np.array([sum(b - a for a, b in w["train"]) for w in windows]),
+        np.array([w["test"][1] - w["test"][0] for w in windows]),
+    )
+
+    def span(start, end):
+        return [str(df.index[start]), str(df.index[end - 1])]
+
+    results = []
+    for i, strategy in enumerate(strategies):
+        performance, oos = _row(full, i), _row(out_of_sample, i)
+        results.append({
+            "strategy": strategy,
+            "performance": performance,
+            "out_of_sample": oos,
+            "robustness": round(float(scores[i]), 1),
+            "recommendation": robust_recommendation(performance, oos, scores[i]),
+            "windows": [{
+                "train": [span(a, b) for a, b in w["train"]],
+                "test": span(*w["test"]),
+                "train_return": round(float(trains[k]["total_return"][i]), 3),
+                "test_return": round(float(tests[k]["total_return"][i]), 3),
+                "test_sharpe": round(float(tests[k]["sharpe_ratio"][i]), 3),
+                "test_trades": int(tests[k]["trade_count"][i]),
+            } for k, w in enumerate(windows)],
+        })
+
+    report = {
+        "method": method,
+        "folds": folds,
+        "anchored": anchored,
+        "bars": len(df),
+        "columns_simulated": len(segments) * len(strategies),
+        "results": sorted(results, key=lambda r: -r["robustness"]),
+    }
+    if len(strategies) > 1:
+        picks = [int(np.argmax(score(m, objective, min_trades))) for m in trains]
+        chosen = stitch(runs, [(segments.index(w["test"]), [p]) for w, p in zip(windows, picks)])
+        report["selection"] = {
+            "objective": objective,
+            "picked": [strategies[p].get("strategy_id", str(p)) for p in picks],
+            "out_of_sample": _row(chosen, 0),
+        }
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def format_validation(report: dict) -> str:
+    lines = [f"🧪 {report['method']} validation, {report['folds']} folds over {report['bars']} bars "
+             f"({report['columns_simulated']} columns in {report['elapsed_ms']:.0f} ms)",
+             f"   {'strategy':<28} {'robust':>7} {'return %':>9} {'oos %':>8} {'oos sharpe':>10} "
+             f"{'oos dd %':>9} {'oos trades':>10} recommendation"]
+    for result in report["results"]:
+        p, o = result["performance"], result["out_of_sample"]
+        lines.append(f"   {result['strategy'].get('strategy_id', '-')[:28]:<28} {result['robustness']:>7.1f} "
+                     f"{p['total_return']:>9.2f} {o['total_return']:>8.2f} {o['sharpe_ratio']:>10.2f} "
+                     f"{o['max_drawdown']:>9.2f} {o['trade_count']:>10} {result['recommendation']}")
+    selection = report.get("selection")
+    if selection:
+        o = selection["out_of_sample"]
+        lines.append(f"   walk-forward picks by {selection['objective']}: {', '.join(selection['picked'])}")
+        lines.append(f"   picks out of sample: return {o['total_return']:.2f}%, sharpe {o['sharpe_ratio']:.2f}, "
+                     f"max dd {o['max_drawdown']:.2f}%, {o['trade_count']} trades")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward or k-fold validation of saved strategies")
+    parser.add_argument("csv", help="Enriched OHLCV CSV, e.g. data/BTCUSDT_1h_enriched.csv")
+    parser.add_argument("--strategy-file", action="append",
+                        help="Strategy JSON like output/backtest_results.json; repeat to compare several")
+    parser.add_argument("--method", choices=METHODS, default="walk_forward")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--train-frac", type=float, default=0.5)
+    parser.add_argument("--anchored", action="store_true", help="Walk forward with an expanding training window")
+    parser.add_argument("--embargo", type=int, default=0, help="Bars dropped between train and test")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="sharpe")
+    parser.add_argument("--json", help="Also write the full report here")
+    args = parser.parse_args(argv)
+
+    strategies = []
+    for path in args.strategy_file or ["output/backtest_results.json"]:
+        with open(path) as f:
+            data = json.load(f)
+        strategies.append(data.get("strategy", data))
+    df = pd.read_csv(args.csv, parse_dates=True, index_col="timestamp")
+    report = validate(df, strategies, args.method, args.folds, args.train_frac, args.anchored, args.embargo,
+                      args.objective)
+    print(format_validation(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"📄 Validation report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+from metrics import metrics
+from logger import get_logger
+
+log = get_logger("startup")
+
+_LOADED = time.perf_counter()
+
+STARTUP_LOG = os.getenv("STARTUP_LOG", "output/startup.jsonl")
+
+
+def process_uptime() -> float:
+    """Seconds since the interpreter process was created (falls back to time since this module loaded)"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _LOADED
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def heavy_modules() -> list:
+    return sorted(name for name in ("gradio", "plotly", "crewai") if name in sys.modules)
+
+
+def record_startup(mode: str, path: str = None) -> dict:
+    """Log cold start time and RSS for this mode and append them to the startup history"""
+    entry = {
+        "ts": time.time(),
+        "mode": mode,
+        "startup_s": round(process_uptime(), 3),
+        "rss_mb": round(rss_mb(), 1),
+        "modules": len(sys.modules),
+        "heavy": heavy_modules(),
+    }
+    metrics.set_gauge(f"startup_{mode}_s", entry["startup_s"])
+    metrics.set_gauge(f"startup_{mode}_rss_mb", entry["rss_mb"])
+    log.info("⏱️ %s ready in %.2fs, RSS %.0f MB", mode, entry['startup_s'], entry['rss_mb'], extra={"fields": entry})
+
+    path = Path(path or STARTUP_LOG)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        log.warning("⚠️ Could not write startup history: %s", e)
+    return entry
+
+
+def summary(path: str = None, last: int = 10) -> str:
+    """Recent cold starts per mode with the change against the previous run"""
+    path = Path(path or STARTUP_LOG)
+    if not path.exists():
+        return "No startups recorded yet"
+    runs = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            runs.setdefault(entry["mode"], []).append(entry)
+
+    lines = [f"{'mode':<8} {'when':<19} {'startup':>9} {'Δ':>8} {'RSS MB':>8} {'Δ':>8}"]
+    for mode, entries in sorted(runs.items()):
+        entries = entries[-(last + 1):]
+        for previous, entry in zip([None] + entries[:-1], entries):
+            if previous is None and len(entries) > last:
+                continue
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["ts"]))
+            d_time = f"{entry['startup_s'] - previous['startup_s']:+.2f}" if previous else ""
+            d_rss = f"{entry['rss_mb'] - previous['rss_mb']:+.1f}" if previous else ""
+            lines.append(f"{mode:<8} {when:<19} {entry['startup_s']:>8.2f}s {d_time:>8} {entry['rss_mb']:>8.1f} {d_rss:>8}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(summary(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from crypto.tools import backtest_tool
+from crypto.tools.backtest_tool import BacktestTool, BatchBacktestTool, load_dataset
+from crypto.tools.fetch_tool import add_indicators
+from mock_exchange import synthetic_ohlcv
+
+STRATEGIES = [
+    {"strategy_id": "rsi_dip_trend", "stop_loss": 4, "take_profit": 8, "allocation": 100,
+     "entry_rules": "(df['rsi_14'] < 35) & (df['close'] > df['ema_200'])", "exit_rules": "df['rsi_14'] > 65"},
+    {"strategy_id": "rsi_dip_sma", "stop_loss": 3, "take_profit": 6, "allocation": 50,
+     "entry_rules": "(df['rsi_14'] < 35) & (df['close'] > df['sma_50'])", "exit_rules": "df['rsi_14'] > 65"},
+    {"strategy_id": "ema_cross", "stop_loss": 5, "take_profit": 10, "allocation": 75,
+     "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+     "exit_rules": "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))"},
+]
+
+
+def write_csv(path, seed=0, bars=1500):
+    df = add_indicators(synthetic_ohlcv(bars, "1h", seed=seed, volatility=0.01, kind="choppy")).bfill().ffill()
+    df.index.name = "timestamp"
+    df.to_csv(path)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def datasets(monkeypatch):
+    cache = {}
+    monkeypatch.setattr(backtest_tool, "_datasets", cache)
+    return cache
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return write_csv(tmp_path / "BTCUSDT_1h_enriched.csv")
+
+
+def test_batch_matches_the_single_strategy_tool(csv_path):
+    batch = BatchBacktestTool()._run("BTCUSDT", "1h", csv_path, STRATEGIES)
+    assert batch["evaluated"] == 3 and batch["errors"] == {}
+    rows = {row["strategy_id"]: row for row in batch["results"]}
+
+    for strategy in STRATEGIES:
+        single = BacktestTool()._run(coin_symbol="BTCUSDT", timeframe="1h", ohlcv_csv_path=csv_path, **strategy)
+        row = rows[strategy["strategy_id"]]
+        assert row["trade_count"] == single["performance"]["trade_count"]
+        assert row["recommendation"] == single["recommendation"]
+        for field in ("win_rate", "sharpe_ratio", "max_drawdown", "total_return"):
+            assert row[field] == pytest.approx(single["performance"][field], abs=1e-3)
+    assert sum(row["trade_count"] for row in batch["results"]) > 0
+
+
+def test_shared_conditions_are_evaluated_once(csv_path):
+    BatchBacktestTool()._run("BTCUSDT", "1h", csv_path, STRATEGIES[:2])
+    _, signals = load_dataset(csv_path)
+    assert "df['rsi_14'] < 35" in signals.leaves
+    assert len(signals.leaves) == 4
+    assert signals.hits == 2
+
+
+def test_invalid_rules_are_reported_without_failing_the_batch(csv_path):
+    broken = dict(STRATEGIES[0], strategy_id="broken", entry_rules="df['no_such_column'] > 1")
+    batch = BatchBacktestTool()._run("BTCUSDT", "1h", csv_path, [broken, STRATEGIES[2]])
+    assert list(batch["errors"]) == ["broken"] and "KeyError" in batch["errors"]["broken"]
+    assert [row["strategy_id"] for row in batch["results"]] == ["ema_cross"]
+
+
+def test_datasets_are_cached_first_in_first_out(tmp_path, datasets):
+    paths = [write_csv(tmp_path / f"COIN{i}USDT_1h_enriched.csv", seed=i, bars=300) for i in range(5)]
+    frames = [load_dataset(path)[0] for path in paths[:4]]
+    assert load_dataset(paths[1])[0] is frames[1]
+
+    load_dataset(paths[4])
+    assert list(datasets) == paths[1:]
+    assert load_dataset(paths[0])[0] is not frames[0]
+    assert paths[1] not in datasets
+
+    stat = os.stat(paths[2])
+    os.utime(paths[2], (stat.st_atime, stat.st_mtime + 10))
+    assert load_dataset(paths[2])[0] is not frames[2]
@@ -0,0 +1,86 @@
+import pytest
+
+import crypto.cache as cache_module
+from crypto.cache import CachedLLM, ResponseCache
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(":memory:")
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_argument_order_but_not_content():
+    key = ResponseCache.key("llm", model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+    assert key == ResponseCache.key("llm", messages=[{"role": "user", "content": "hi"}], model="gpt-4o-mini")
+    assert key.startswith("llm:")
+    assert key != ResponseCache.key("llm", model="gpt-4o-mini", messages=[{"role": "user", "content": "hi!"}])
+    assert key != ResponseCache.key("llm", model="gpt-4o", messages=[{"role": "user", "content": "hi"}])
+    assert key.split(":")[1] == ResponseCache.key("serper", model="gpt-4o-mini",
+                                                  messages=[{"role": "user", "content": "hi"}]).split(":")[1]
+
+
+def test_cached_computes_once(cache):
+    calls = []
+    compute = lambda: calls.append(1) or {"organic": [{"title": "BTC"}]}
+    for _ in range(3):
+        assert cache.cached("serper", {"args": {"search_query": "crypto news"}}, compute) == {"organic": [{"title": "BTC"}]}
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_entries_expire_per_namespace(cache, clock, monkeypatch):
+    cache.set("screener", "screener:a", [1, 2])
+    cache.set("llm", "llm:a", "answer")
+    clock.now += 20 * 60
+    assert cache.get("screener", "screener:a") is None
+    assert cache.get("llm", "llm:a") == "answer"
+
+    monkeypatch.setenv("CACHE_TTL_LLM", "60")
+    assert cache.get("llm", "llm:a") is None
+
+
+def test_size_cap_evicts_least_recently_used(clock):
+    cache = ResponseCache(":memory:", max_bytes=1000)
+    for i in range(4):
+        clock.now += 1
+        cache.set("llm", f"llm:{i}", "x" * 200)
+    clock.now += 1
+    assert cache.get("llm", "llm:0") is not None
+
+    clock.now += 1
+    cache.set("llm", "llm:4", "x" * 200)
+    assert cache.get("llm", "llm:1") is None
+    assert cache.get("llm", "llm:0") is not None
+    assert cache.stats()["bytes"] <= 900
+    cache.close()
+
+
+def test_cached_llm_replays_identical_prompts(cache, monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    llm = CachedLLM(model="gpt-4o-mini", mock_response="hello")
+
+    assert llm.call("hi") == "hello"
+    assert llm.call("hi") == "hello"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    CachedLLM(model="gpt-4o-mini", temperature=0.2, mock_response="hello").call("hi")
+    assert cache.misses == 2
+    assert cache.stats()["entries"]["llm"]["count"] == 2
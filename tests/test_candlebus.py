@@ -0,0 +1,116 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from candlebus import CandleReader, CandleRingWriter, open_reader
+
+COLUMNS = ["open", "close", "rsi_14"]
+
+
+def candles(n: int, start: str = "2024-01-01") -> pd.DataFrame:
+    index = pd.date_range(start, periods=n, freq="1min", name="timestamp").as_unit("ms")
+    values = np.arange(n, dtype=float)
+    return pd.DataFrame({"open": values, "close": values + 0.5, "rsi_14": values % 100}, index=index)
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = CandleRingWriter("BTCUSDT", "1m", COLUMNS, capacity=8, directory=str(tmp_path))
+    yield writer
+    writer.close()
+
+
+def test_window_wraps_around_as_one_contiguous_view(writer, tmp_path):
+    data = candles(21)
+    writer.publish_frame(data.iloc[:3])
+    for timestamp, row in data.iloc[3:].iterrows():
+        writer.append(timestamp, row)
+
+    reader = CandleReader("BTCUSDT", "1m", str(tmp_path))
+    window = reader.window()
+    assert len(window) == 8 and window.count == 21
+    assert np.shares_memory(window["close"], reader.values)
+    assert list(window["open"]) == list(range(13, 21))
+    pd.testing.assert_frame_equal(reader.frame(), data.iloc[-8:], check_freq=False)
+    assert list(reader.window(3)["open"]) == [18, 19, 20]
+    reader.close()
+
+
+def test_same_open_time_replaces_the_last_row(writer, tmp_path):
+    data = candles(5)
+    writer.publish_frame(data)
+    writer.append(data.index[-1], {"open": 4, "close": 99.0, "rsi_14": 50})
+
+    reader = CandleReader("BTCUSDT", "1m", str(tmp_path))
+    assert reader.count == 5
+    assert reader.latest()["close"] == 99.0
+    assert reader.latest()["timestamp"] == data.index[-1]
+    reader.close()
+
+
+def test_history_longer_than_the_ring_keeps_the_newest_rows(writer, tmp_path):
+    data = candles(30)
+    writer.publish_frame(data)
+    reader = CandleReader("BTCUSDT", "1m", str(tmp_path))
+    assert reader.count == 30
+    pd.testing.assert_frame_equal(reader.frame(columns=["close"]), data.iloc[-8:][["close"]], check_freq=False)
+    reader.close()
+
+
+def test_only_one_writer_per_ring(writer, tmp_path):
+    with pytest.raises(RuntimeError):
+        CandleRingWriter("BTCUSDT", "1m", COLUMNS, capacity=8, directory=str(tmp_path))
+
+
+def test_open_reader_needs_a_live_feed(tmp_path):
+    assert open_reader("BTCUSDT", "1m", str(tmp_path)) is None
+    writer = CandleRingWriter("BTCUSDT", "1m", COLUMNS, capacity=8, directory=str(tmp_path))
+    assert open_reader("BTCUSDT", "1m", str(tmp_path)) is None
+    writer.publish_frame(candles(4))
+
+    reader = open_reader("BTCUSDT", "1m", str(tmp_path))
+    assert reader is not None and reader.writer_alive()
+    writer.close()
+    assert not reader.writer_alive()
+    reader.close()
+    assert open_reader("BTCUSDT", "1m", str(tmp_path)) is None
+
+
+def test_incompatible_writer_replaces_the_ring(tmp_path):
+    writer = CandleRingWriter("BTCUSDT", "1m", COLUMNS, capacity=8, directory=str(tmp_path))
+    writer.publish_frame(candles(4))
+    reader = CandleReader("BTCUSDT", "1m", str(tmp_path))
+    writer.close()
+    assert not reader.replaced()
+
+    replacement = CandleRingWriter("BTCUSDT", "1m", COLUMNS + ["ema_10"], capacity=16, directory=str(tmp_path))
+    assert reader.replaced()
+    reader.close()
+    replacement.close()
+
+
+def test_readers_never_see_torn_windows(writer, tmp_path):
+    data = candles(3000)
+    writer.publish_frame(data.iloc[:8])
+    reader = CandleReader("BTCUSDT", "1m", str(tmp_path))
+    done = threading.Event()
+    torn = []
+
+    def read():
+        while not done.is_set():
+            window = reader.window(4, copy=True)
+            opens = window["open"]
+            expected = np.arange(window.count - len(opens), window.count, dtype=float)
+            if not (np.array_equal(opens, expected) and np.array_equal(window["close"], opens + 0.5)):
+                torn.append(window.count)
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    for timestamp, row in data.iloc[8:].iterrows():
+        writer.append(timestamp, row)
+    done.set()
+    thread.join()
+    reader.close()
+    assert torn == []
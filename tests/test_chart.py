@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart import PriceChart, downsample, lttb, minmax
+from mock_exchange import synthetic_ohlcv
+
+NO_SIGNALS = lambda: {"entry": False, "exit": False}
+
+
+def buffer(n: int) -> pd.DataFrame:
+    df = synthetic_ohlcv(n, "1h")
+    df["ema_10"] = df["close"].ewm(span=10).mean()
+    df["ema_20"] = df["close"].ewm(span=20).mean()
+    return df
+
+
+def test_new_candles_are_appended_once():
+    data = buffer(320)
+    chart = PriceChart("BTCUSDT", window=200)
+    chart.figure(data.iloc[:300], NO_SIGNALS)
+    version = chart.version
+
+    fig = chart.figure(data.iloc[:302], NO_SIGNALS)
+    assert chart.version == version + 1
+    assert list(fig.data[0].x) == list(data.index[102:302])
+    assert chart.figure(data.iloc[:302], NO_SIGNALS) is fig
+    assert chart.version == version + 1
+
+
+def test_concurrent_sessions_do_not_duplicate_rows():
+    data = buffer(400)
+    chart = PriceChart("BTCUSDT", window=200)
+    chart.figure(data.iloc[:300], NO_SIGNALS)
+
+    for end in range(301, 340):
+        barrier = threading.Barrier(8)
+
+        def session():
+            barrier.wait()
+            chart.figure(data.iloc[:end], NO_SIGNALS)
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for trace in chart.fig.data[:3]:
+            assert list(trace.x) == list(data.index[end - 200:end])
+
+
+@pytest.mark.parametrize("n", [1001, 1002, 5000, 100_000])
+@pytest.mark.parametrize("n_out", [4, 5, 999, 1000])
+def test_downsamplers_respect_the_point_budget(n, n_out):
+    y = np.random.default_rng(n).normal(size=n).cumsum()
+    x = np.arange(n, dtype=float)
+    for indices in (lttb(x, y, n_out), minmax(y, n_out)):
+        assert len(indices) <= n_out
+        assert indices[0] == 0 and indices[-1] == n - 1
+        assert np.all(np.diff(indices) > 0)
+    assert len(lttb(x, y, n_out)) == n_out
+
+
+def test_minmax_keeps_every_spike():
+    y = np.zeros(10_000)
+    y[[17, 4321, 9998]] = [5.0, -7.0, 9.0]
+    kept = y[minmax(y, 100)]
+    assert {5.0, -7.0, 9.0} <= set(kept)
+
+
+def test_short_series_are_not_downsampled():
+    data = buffer(500)
+    assert len(downsample(data, 1000)) == 500
+    assert len(downsample(data, 1000, "minmax")) == 500
+    assert len(downsample(data, 100, "minmax")) <= 100
@@ -0,0 +1,91 @@
+import pytest
+from crewai.tasks.task_output import TaskOutput
+
+from crypto.checkpoint import CheckpointStore
+from crypto.crew import Coin, CoinList, Crypto
+
+INPUTS = {"date": "2024-06-01", "timeframe": "1h"}
+
+
+@pytest.fixture
+def crypto(tmp_path, monkeypatch):
+    monkeypatch.setenv("OHLCV_PREFETCH", "0")
+    monkeypatch.setenv("COIN_LEADERBOARD", "0")
+    monkeypatch.delenv("CREW_RESUME", raising=False)
+    crypto = Crypto()
+    crypto.checkpoints = CheckpointStore(str(tmp_path / "checkpoints"))
+    crypto.inputs = dict(INPUTS)
+    crypto.crew()
+    return crypto
+
+
+def finished(task, model):
+    return TaskOutput(name=task.name, description=task.description, expected_output=task.expected_output,
+                      raw=model.model_dump_json(), pydantic=model, agent="screener")
+
+
+def coin_list():
+    return CoinList(coins=[Coin(name="Bitcoin", symbol="BTC", reason="ETF flows", investment_potential="high")])
+
+
+def test_outputs_round_trip_through_the_store(crypto):
+    task = crypto.crew_instance.tasks[0]
+    path = crypto.checkpoints.save(INPUTS, task, finished(task, coin_list()))
+    assert path == crypto.checkpoints.run_dir(INPUTS) / "find_trending_coins.json"
+
+    restored = crypto.checkpoints.load(INPUTS, task)
+    assert restored.pydantic == coin_list()
+    assert restored.raw == coin_list().model_dump_json()
+    assert crypto.checkpoints.load({"date": "2024-06-02", "timeframe": "1h"}, task) is None
+
+
+def test_unstructured_output_is_not_checkpointed(crypto):
+    task = crypto.crew_instance.tasks[0]
+    output = TaskOutput(description=task.description, raw="not json", agent="screener")
+    assert crypto.checkpoints.save(INPUTS, task, output) is None
+    assert crypto.checkpoints.load(INPUTS, task) is None
+
+
+def test_resume_skips_the_checkpointed_prefix(crypto):
+    tasks = list(crypto.crew_instance.tasks)
+    picked = Coin(name="Bitcoin", symbol="BTC", reason="ETF flows", investment_potential="high")
+    crypto.checkpoints.save(INPUTS, tasks[0], finished(tasks[0], coin_list()))
+    crypto.checkpoints.save(INPUTS, tasks[1], finished(tasks[1], picked))
+
+    crypto.resume_from_checkpoints()
+    assert [task.name for task in crypto.crew_instance.tasks] == ["backtest_strategy"]
+    assert tasks[0].output.pydantic == coin_list()
+    assert tasks[1].output.pydantic == picked
+
+
+def test_resume_stops_at_the_first_missing_task(crypto):
+    tasks = list(crypto.crew_instance.tasks)
+    picked = Coin(name="Bitcoin", symbol="BTC", reason="ETF flows", investment_potential="high")
+    crypto.checkpoints.save(INPUTS, tasks[1], finished(tasks[1], picked))
+
+    crypto.resume_from_checkpoints()
+    assert [task.name for task in crypto.crew_instance.tasks] == [task.name for task in tasks]
+
+
+def test_unreadable_checkpoint_reruns_the_task(crypto):
+    tasks = list(crypto.crew_instance.tasks)
+    path = crypto.checkpoints.save(INPUTS, tasks[0], finished(tasks[0], coin_list()))
+    path.write_text('{"raw": "x", "pydantic": {"coins": "broken"}}')
+
+    crypto.resume_from_checkpoints()
+    assert len(crypto.crew_instance.tasks) == 3
+
+
+def test_completed_or_disabled_runs_start_over(crypto, monkeypatch):
+    task = crypto.crew_instance.tasks[0]
+    crypto.checkpoints.save(INPUTS, task, finished(task, coin_list()))
+    crypto.checkpoints.mark_complete(INPUTS)
+    crypto.resume_from_checkpoints()
+    assert len(crypto.crew_instance.tasks) == 3
+    assert not crypto.checkpoints.run_dir(INPUTS).exists()
+
+    crypto.checkpoints.save(INPUTS, task, finished(task, coin_list()))
+    monkeypatch.setenv("CREW_RESUME", "0")
+    crypto.resume_from_checkpoints()
+    assert len(crypto.crew_instance.tasks) == 3
+    assert crypto.checkpoints.load(INPUTS, task) is None
@@ -0,0 +1,55 @@
+import json
+import logging
+import signal
+
+import pytest
+
+import daemon
+import startup
+from mock_exchange import synthetic_ohlcv
+
+STRATEGY = {
+    "strategy_id": "ema_cross",
+    "coin_symbol": "BTCUSDT",
+    "timeframe": "4h",
+    "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+    "exit_rules": "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))",
+    "stop_loss": 3,
+    "take_profit": 6,
+    "allocation": 50,
+}
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(daemon, "setup_logging", lambda: None)
+    monkeypatch.setattr(startup, "STARTUP_LOG", str(tmp_path / "startup.jsonl"))
+    monkeypatch.delenv("PROFILE_ON_START", raising=False)
+    handlers = {signum: signal.getsignal(signum) for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGUSR1)}
+    yield tmp_path
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
+
+
+def test_mock_run_shuts_down_cleanly_and_records_startup(workdir, caplog):
+    (workdir / "strategy.json").write_text(json.dumps({"strategy": STRATEGY, "performance": {}}))
+    synthetic_ohlcv(252 + 5, "4h", seed=0).to_csv(workdir / "candles.csv")
+
+    with caplog.at_level(logging.INFO, logger="crypto"):
+        code = daemon.main(["--mock", "--mock-data", "candles.csv", "--strategy-file", "strategy.json",
+                            "--mock-ledger", ":memory:", "--mock-telemetry", ":memory:",
+                            "--interval", "0", "--no-metrics"])
+
+    assert code == 0
+    assert "5 candles to replay" in caplog.text
+    assert "Mock run finished" in caplog.text
+    entry, = [json.loads(line) for line in (workdir / "startup.jsonl").read_text().splitlines()]
+    assert entry["mode"] == "daemon" and entry["startup_s"] > 0
+    assert "daemon" in startup.summary()
+    assert not (workdir / "output" / "trades.db").exists()
+
+
+def test_missing_strategy_exits_before_starting(workdir):
+    assert daemon.main(["--mock", "--strategy-file", "missing.json", "--no-metrics"]) == 2
+    assert not (workdir / "startup.jsonl").exists()
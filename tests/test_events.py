@@ -0,0 +1,46 @@
+import threading
+import time
+
+from events import EventBus
+
+
+def test_repeated_events_coalesce_until_read():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    for _ in range(100):
+        bus.publish("tick")
+    bus.publish("fill")
+    assert subscription.wait(timeout=1) == {"tick", "fill"}
+    assert subscription.wait(timeout=0.01) == set()
+
+
+def test_topic_filter_and_unsubscribe():
+    bus = EventBus()
+    logs = bus.subscribe({"log"})
+    everything = bus.subscribe()
+    bus.publish("candle")
+    bus.publish("log")
+    assert logs.wait(timeout=1) == {"log"}
+    assert everything.wait(timeout=1) == {"candle", "log"}
+
+    bus.unsubscribe(everything)
+    bus.publish("candle")
+    assert everything.wait(timeout=0.01) == set()
+
+
+def test_wait_wakes_on_publish_and_settles_bursts():
+    bus = EventBus()
+    subscription = bus.subscribe()
+    result = {}
+
+    def dashboard():
+        result["topics"] = subscription.wait(timeout=5, settle=0.1)
+
+    thread = threading.Thread(target=dashboard)
+    thread.start()
+    time.sleep(0.05)
+    bus.publish("candle")
+    time.sleep(0.02)
+    bus.publish("fill")
+    thread.join(5)
+    assert result["topics"] == {"candle", "fill"}
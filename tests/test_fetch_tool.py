@@ -0,0 +1,25 @@
+import warnings
+
+import pytest
+
+from crypto.tools.fetch_tool import default_start_date, interval_minutes, normalize_symbol
+
+
+def test_symbols_are_normalized_to_usdt_pairs():
+    assert [normalize_symbol(s) for s in ("btc", "BTC/USDT", "eth-usdt", "SOLUSDT")] == [
+        "BTCUSDT", "BTCUSDT", "ETHUSDT", "SOLUSDT"]
+
+
+@pytest.mark.parametrize("timeframe, start", [
+    ("15m", "2024-01-05"), ("1h", "2024-01-05"), ("4h", "2023-07-04"), ("1d", "2022-07-04"), ("1M", "2022-07-04"),
+])
+def test_history_window_grows_with_the_timeframe(timeframe, start):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert default_start_date(timeframe, "2024-07-03") == start
+
+
+def test_unknown_timeframes_are_rejected():
+    assert interval_minutes("1w") == 7 * 24 * 60
+    with pytest.raises(ValueError, match="Unknown timeframe '2d'"):
+        default_start_date("2d", "2024-07-03")
@@ -0,0 +1,45 @@
+import logging
+
+import pytest
+
+from crypto import leaderboard, prefetch
+from crypto.leaderboard import format_leaderboard, rank_key, run_leaderboard
+from crypto.tools.fetch_tool import add_indicators
+from mock_exchange import synthetic_ohlcv
+
+
+@pytest.fixture
+def csvs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    coins = {"UPUSDT": ("trending", 0.004), "CHOPUSDT": ("choppy", 0.01), "WALKUSDT": ("random_walk", 0.01)}
+    for i, (symbol, (kind, volatility)) in enumerate(coins.items()):
+        df = add_indicators(synthetic_ohlcv(1500, "1h", seed=i, kind=kind, volatility=volatility)).bfill().ffill()
+        df.index.name = "timestamp"
+        df.to_csv(tmp_path / "data" / f"{symbol}_1h_enriched.csv")
+
+    def offline(symbol, timeframe, start_date, end_date=None):
+        raise ConnectionError(f"no recorded candles for {symbol}")
+
+    monkeypatch.setattr(prefetch, "fetch_ohlcv", offline)
+    return list(coins)
+
+
+def test_every_coin_is_ranked_by_its_best_candidate(csvs, caplog):
+    with caplog.at_level(logging.INFO, logger="crypto.leaderboard"):
+        board = run_leaderboard(["up", "chop", "walk", "missing"], "1h", start_date="2024-01-01", processes=2)
+
+    assert sorted(output.strategy.coin_symbol for output in board.results) == sorted(csvs)
+    assert [rank_key(output) for output in board.results] == sorted(rank_key(output) for output in board.results)
+    assert list(board.errors) == ["MISSINGUSDT"] and board.errors["MISSINGUSDT"].startswith("fetch:")
+
+    for output in board.results:
+        scored = leaderboard.backtest_csv(f"data/{output.strategy.coin_symbol}_1h_enriched.csv", leaderboard.CANDIDATES)
+        best = min(range(len(scored)), key=lambda i: (leaderboard.RECOMMENDATION_RANK[scored[i]["recommendation"]],
+                                                      -scored[i]["sharpe_ratio"], -scored[i]["total_return"]))
+        assert output.strategy.strategy_id == leaderboard.CANDIDATES[best]["strategy_id"]
+        assert output.performance.trade_count == scored[best]["trade_count"]
+
+    assert any("Fetch failed for MISSINGUSDT" in message for message in caplog.messages)
+    assert any("Backtested 3/4 coins" in message for message in caplog.messages)
+    assert "MISSINGUSDT" in format_leaderboard(board)
@@ -0,0 +1,67 @@
+import pytest
+
+from ledger import TradeLedger
+
+
+@pytest.fixture
+def ledger():
+    ledger = TradeLedger(":memory:")
+    yield ledger
+    ledger.close()
+
+
+def fill(ledger, count: int, symbol: str = "BTCUSDT", strategy_id: str = "ema", start: float = 1_700_000_000):
+    for i in range(count):
+        side = "BUY" if i % 2 == 0 else "SELL"
+        pnl = None if side == "BUY" else (5.0 if i % 4 == 1 else -2.0)
+        ledger.record(side, symbol, strategy_id, 0.01, 50000 + i, order_id=i, pnl_pct=pnl, pnl_value=pnl,
+                      ts=start + i * 60)
+
+
+def test_pages_are_newest_first_and_cover_every_trade(ledger):
+    fill(ledger, 45)
+    pages = [ledger.page(offset=offset, limit=20) for offset in (0, 20, 40)]
+    assert [len(page) for page in pages] == [20, 20, 5]
+    ids = [trade["id"] for page in pages for trade in page]
+    assert ids == list(range(45, 0, -1))
+    assert ledger.page(offset=45, limit=20) == []
+    assert pages[0][0]["order_id"] == "44"
+
+
+def test_equal_timestamps_page_in_insert_order(ledger):
+    for i in range(5):
+        ledger.record("BUY", "BTCUSDT", "ema", 1, 100, ts=1000.0)
+    assert [trade["id"] for trade in ledger.page(limit=3)] == [5, 4, 3]
+    assert [trade["id"] for trade in ledger.page(offset=3, limit=3)] == [2, 1]
+
+
+def test_filters_by_symbol_strategy_and_time(ledger):
+    fill(ledger, 10, symbol="BTCUSDT", strategy_id="ema")
+    fill(ledger, 6, symbol="ETHUSDT", strategy_id="rsi")
+    assert ledger.count() == 16
+    assert ledger.count(symbol="ETHUSDT") == 6
+    assert ledger.count(strategy_id="ema") == 10
+    assert ledger.count(start=1_700_000_000 + 120, end=1_700_000_000 + 300) == 6
+    assert {trade["symbol"] for trade in ledger.page(limit=100, symbol="ETHUSDT")} == {"ETHUSDT"}
+
+
+def test_realized_pnl_is_maintained_on_insert(ledger):
+    fill(ledger, 8)
+    summary = ledger.realized_pnl(symbol="BTCUSDT")
+    assert (summary["trades"], summary["closed"], summary["wins"], summary["losses"]) == (8, 4, 2, 2)
+    assert summary["realized_pnl"] == pytest.approx(6.0)
+    assert summary["win_rate"] == 50.0
+    assert summary["profit_factor"] == pytest.approx(10.0 / 4.0)
+    assert ledger.realized_pnl(symbol="ETHUSDT")["closed"] == 0
+
+
+def test_ledger_persists_across_reopen(tmp_path):
+    path = str(tmp_path / "trades.db")
+    ledger = TradeLedger(path)
+    fill(ledger, 4)
+    ledger.close()
+
+    reopened = TradeLedger(path)
+    assert reopened.count() == 4
+    assert reopened.realized_pnl()["closed"] == 2
+    reopened.close()
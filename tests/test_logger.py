@@ -0,0 +1,73 @@
+import json
+import logging
+import queue
+import time
+
+import logger
+from events import bus
+from logger import JsonFormatter, LogTypeFilter, NonBlockingQueueHandler, RingBufferHandler, get_logger, setup_logging
+
+
+def make_record(message="🟢 BUY ORDER EXECUTED", level=logging.INFO, **extra):
+    record = logging.LogRecord("crypto.trader", level, __file__, 1, message, None, None)
+    record.__dict__.update(extra)
+    LogTypeFilter().filter(record)
+    return record
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    began = time.monotonic()
+    for i in range(5):
+        handler.handle(make_record(f"tick {i}"))
+    assert time.monotonic() - began < 0.1
+    assert handler.dropped == 3
+    assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["tick 0", "tick 1"]
+
+
+def test_log_type_defaults_from_the_level():
+    assert make_record(level=logging.ERROR).log_type == "error"
+    assert make_record(level=logging.WARNING).log_type == "warning"
+    assert make_record(level=logging.DEBUG).log_type == "debug"
+    assert make_record(log_type="trade").log_type == "trade"
+
+
+def test_jsonl_lines_carry_the_log_type_and_fields():
+    record = make_record(log_type="trade", fields={"side": "BUY", "order_id": 7, "price": 50000.5})
+    event = json.loads(JsonFormatter().format(record))
+    assert event["type"] == "trade" and event["level"] == "info"
+    assert event["logger"] == "crypto.trader" and event["message"] == "🟢 BUY ORDER EXECUTED"
+    assert (event["side"], event["order_id"], event["price"]) == ("BUY", 7, 50000.5)
+
+
+def test_ring_buffer_keeps_recent_entries_and_publishes_log():
+    ring = RingBufferHandler(capacity=3)
+    subscription = bus.subscribe({"log"})
+    try:
+        for i in range(5):
+            ring.handle(make_record(f"message {i}", log_type="info"))
+        assert subscription.wait(timeout=1) == {"log"}
+    finally:
+        bus.unsubscribe(subscription)
+    assert [message for _, _, message in ring.recent(10)] == ["message 2", "message 3", "message 4"]
+    assert ring.recent(1)[0][1] == "info"
+
+
+def test_setup_logging_writes_rotating_jsonl(tmp_path, monkeypatch):
+    root = logging.getLogger("crypto")
+    saved = root.handlers[:], root.level, root.propagate
+    monkeypatch.setattr(logger, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger, "_listener", None)
+    monkeypatch.setattr(logger.atexit, "register", lambda fn: None)
+    try:
+        setup_logging()
+        listener = logger._listener
+        setup_logging()
+        assert logger._listener is listener
+        get_logger("test").warning("⚠️ Fetch failed for %s", "BTCUSDT", extra={"fields": {"symbol": "BTCUSDT"}})
+        listener.stop()
+    finally:
+        root.handlers[:], root.level, root.propagate = saved
+
+    event, = [json.loads(line) for line in (tmp_path / "trader.jsonl").read_text().splitlines()]
+    assert (event["type"], event["message"], event["symbol"]) == ("warning", "⚠️ Fetch failed for BTCUSDT", "BTCUSDT")
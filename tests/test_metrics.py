@@ -0,0 +1,67 @@
+import json
+import random
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics import LatencyHistogram, MetricsRegistry, MetricsServer
+
+
+def test_percentiles_use_the_nearest_rank():
+    hist = LatencyHistogram()
+    samples = list(range(1, 101))
+    random.Random(0).shuffle(samples)
+    for ms in samples:
+        hist.record(ms)
+    snapshot = hist.snapshot()
+    assert (snapshot["p50"], snapshot["p95"], snapshot["p99"], snapshot["max"]) == (50, 95, 99, 100)
+    assert snapshot["count"] == 100 and snapshot["last"] == samples[-1]
+
+
+def test_percentiles_cover_the_rolling_window_only():
+    hist = LatencyHistogram(window=10)
+    for ms in [1000.0] * 5 + [float(ms) for ms in range(1, 11)]:
+        hist.record(ms)
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 15
+    assert (snapshot["p50"], snapshot["p99"], snapshot["max"]) == (5.0, 10.0, 10.0)
+
+
+def test_single_and_empty_windows():
+    hist = LatencyHistogram()
+    assert hist.snapshot() == {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "last": 0.0}
+    hist.record(7.5)
+    assert {hist.snapshot()[key] for key in ("p50", "p95", "p99", "max", "last")} == {7.5}
+
+
+def test_spans_track_the_innermost_phase():
+    registry = MetricsRegistry()
+    ident = threading.get_ident()
+    with registry.span("refresh"):
+        with registry.span("signals"):
+            assert registry.current_phase(ident) == "signals"
+        assert registry.current_phase(ident) == "refresh"
+    assert registry.current_phase(ident) == "idle"
+    assert registry.snapshot()["refresh"]["count"] == registry.snapshot()["signals"]["count"] == 1
+
+
+def test_server_serves_the_snapshot_as_json():
+    registry = MetricsRegistry()
+    for ms in (1.0, 2.0, 3.0):
+        registry.observe("order_submit", ms)
+    registry.set_gauge("queue_depth", 4)
+    server = MetricsServer(registry, port=0).start()
+    try:
+        with urllib.request.urlopen(server.url, timeout=5) as response:
+            assert response.headers["Content-Type"] == "application/json"
+            body = json.loads(response.read())
+        assert body["order_submit"] == {"count": 3, "p50": 2.0, "p95": 3.0, "p99": 3.0, "max": 3.0, "last": 3.0}
+        assert body["gauges"] == {"queue_depth": 4}
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(server.url.replace("/metrics", "/other"), timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.stop()
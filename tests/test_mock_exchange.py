@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from mock_exchange import MockAPIError, MockExchange, synthetic_ohlcv
+
+
+@pytest.fixture
+def exchange():
+    return MockExchange("BTCUSDT", "1h", candles=synthetic_ohlcv(100, "1h"), cursor=49, balances={"USDT": 10000.0})
+
+
+def test_only_candles_up_to_the_cursor_are_visible(exchange):
+    klines = exchange.get_klines(symbol="BTCUSDT", interval="1h", limit=10)
+    assert len(klines) == 10
+    assert klines[-1][0] == exchange.open_times[49]
+    assert exchange.get_server_time()["serverTime"] == klines[-1][6]
+
+    assert exchange.advance()
+    assert exchange.get_klines(symbol="BTCUSDT", interval="1h", limit=1)[0][0] == exchange.open_times[50]
+    assert exchange.now() == (exchange.open_times[50] + 3_600_000) / 1000
+    assert not exchange.advance(100)
+    assert exchange.remaining == 0
+
+
+def test_klines_page_forward_from_a_start_time(exchange):
+    start = int(exchange.open_times[10])
+    klines = exchange.get_klines(symbol="BTCUSDT", interval="1h", startTime=start, limit=5)
+    assert [k[0] for k in klines] == list(exchange.open_times[10:15])
+    with pytest.raises(MockAPIError):
+        exchange.get_klines(symbol="BTCUSDT", interval="15m")
+
+
+def test_buy_fee_is_taken_in_the_base_asset(exchange):
+    price = exchange.price
+    order = exchange.order_market_buy(symbol="BTCUSDT", quantity=0.1)
+    fill, = order["fills"]
+    assert (order["status"], float(order["executedQty"])) == ("FILLED", 0.1)
+    assert fill["commissionAsset"] == "BTC" and float(fill["commission"]) == pytest.approx(0.0001)
+    assert exchange.balances["BTC"] == pytest.approx(0.0999)
+    assert exchange.balances["USDT"] == pytest.approx(10000.0 - 0.1 * price)
+
+
+def test_sell_fee_is_taken_in_the_quote_asset(exchange):
+    exchange.balances["BTC"] = 0.1
+    price = exchange.price
+    order = exchange.order_market_sell(symbol="BTCUSDT", quantity=0.1)
+    assert order["fills"][0]["commissionAsset"] == "USDT"
+    assert exchange.balances["BTC"] == pytest.approx(0.0)
+    assert exchange.balances["USDT"] == pytest.approx(10000.0 + 0.1 * price * 0.999)
+
+
+@pytest.mark.parametrize("side, quantity, message", [
+    ("buy", 0.000015, "LOT_SIZE"),
+    ("buy", 0.0, "LOT_SIZE"),
+    ("buy", 0.00002, "NOTIONAL"),
+    ("buy", 10.0, "insufficient balance"),
+    ("sell", 0.1, "insufficient balance"),
+])
+def test_orders_breaking_a_filter_are_rejected(exchange, side, quantity, message):
+    with pytest.raises(MockAPIError, match=message):
+        getattr(exchange, f"order_market_{side}")(symbol="BTCUSDT", quantity=quantity)
+    assert exchange.orders == []
+    assert exchange.balances == {"USDT": 10000.0}
+
+
+def test_symbol_info_carries_the_filters(exchange):
+    info = exchange.get_symbol_info("BTCUSDT")
+    filters = {f["filterType"]: f for f in info["filters"]}
+    assert float(filters["LOT_SIZE"]["stepSize"]) == exchange.step_size
+    assert float(filters["NOTIONAL"]["minNotional"]) == exchange.min_notional
+    assert exchange.get_symbol_info("ETHUSDT") is None
+
+
+def test_fail_next_raises_the_scripted_errors_then_recovers(exchange):
+    exchange.fail_next("get_account", count=2)
+    exchange.fail_next("order_market_buy", error=MockAPIError(-1021, "Timestamp outside recvWindow"))
+    for _ in range(2):
+        with pytest.raises(MockAPIError) as error:
+            exchange.get_account()
+        assert error.value.status_code == 503
+    assert exchange.get_account()["balances"][0]["asset"] == "USDT"
+    with pytest.raises(MockAPIError, match="recvWindow"):
+        exchange.order_market_buy(symbol="BTCUSDT", quantity=0.1)
+    assert exchange.balances == {"USDT": 10000.0}
+    assert exchange.calls["get_account"] == 3
+
+
+def test_random_errors_are_seeded():
+    def failures(seed):
+        exchange = MockExchange("BTCUSDT", "1h", candles=synthetic_ohlcv(10, "1h"), errors={"get_account": 0.5}, seed=seed)
+        outcomes = []
+        for _ in range(40):
+            try:
+                exchange.get_account()
+                outcomes.append(False)
+            except MockAPIError:
+                outcomes.append(True)
+        return outcomes
+
+    assert failures(1) == failures(1)
+    assert 5 < sum(failures(1)) < 35
+    assert failures(1) != failures(2)
+
+
+def test_from_csv_replays_recorded_candles(tmp_path):
+    candles = synthetic_ohlcv(20, "15m")
+    path = tmp_path / "BTCUSDT_15m_enriched.csv"
+    candles.to_csv(path)
+    exchange = MockExchange.from_csv(str(path), "BTCUSDT", "15m")
+    assert exchange.price == pytest.approx(candles["close"].iloc[-1])
+    assert pd.to_datetime(exchange.get_klines(limit=1)[0][0], unit="ms") == candles.index[-1]
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from notifier import LocalNtfyServer, NotificationDispatcher, NtfySink
+
+
+class RecordingSink:
+    def __init__(self, failures: int = 0, delay: float = 0.0):
+        self.failures = failures
+        self.delay = delay
+        self.sent = []
+        self.attempts = 0
+
+    def send(self, message: str):
+        self.attempts += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.attempts <= self.failures:
+            raise RuntimeError("503 - unavailable")
+        self.sent.append((time.monotonic(), message))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def dispatchers():
+    created = []
+
+    def make(*sinks, **kwargs):
+        dispatcher = NotificationDispatcher(sinks, **kwargs)
+        created.append(dispatcher)
+        return dispatcher
+
+    yield make
+    for dispatcher in created:
+        dispatcher.close(1)
+
+
+def test_messages_within_the_window_are_coalesced(dispatchers):
+    sink = RecordingSink()
+    dispatcher = dispatchers(sink, coalesce_window=0.2, min_interval=0)
+    for i in range(5):
+        dispatcher.notify(f"fill {i}")
+    assert dispatcher.flush(5)
+    assert [message for _, message in sink.sent] == ["\n\n".join(f"fill {i}" for i in range(5))]
+    assert dispatcher.sent == 1
+
+
+def test_batches_are_rate_limited(dispatchers):
+    sink = RecordingSink()
+    dispatcher = dispatchers(sink, coalesce_window=0.01, min_interval=0.3)
+    dispatcher.notify("first")
+    time.sleep(0.05)
+    dispatcher.notify("second")
+    assert dispatcher.flush(5)
+    assert [message for _, message in sink.sent] == ["first", "second"]
+    assert sink.sent[1][0] - sink.sent[0][0] >= 0.29
+
+
+def test_failed_sends_are_retried_then_given_up(dispatchers):
+    flaky, dead = RecordingSink(failures=2), RecordingSink(failures=10)
+    dispatcher = dispatchers(flaky, dead, coalesce_window=0, min_interval=0, retries=3, backoff=0.01)
+    dispatcher.notify("order filled")
+    assert dispatcher.flush(5)
+    assert [message for _, message in flaky.sent] == ["order filled"]
+    assert dead.attempts == 3
+    assert (dispatcher.sent, dispatcher.failed) == (1, 1)
+
+
+def test_notify_never_blocks_the_caller(dispatchers):
+    sink = RecordingSink(delay=0.2)
+    dispatcher = dispatchers(sink, coalesce_window=0, min_interval=0, max_queue=2)
+    began = time.monotonic()
+    for i in range(10):
+        dispatcher.notify(f"message {i}")
+    assert time.monotonic() - began < 0.05
+    assert dispatcher.flush(10)
+    delivered = sum(message.count("message") for _, message in sink.sent)
+    assert delivered + dispatcher.dropped == 10
+    assert dispatcher.dropped > 0
+
+
+def test_ntfy_sink_posts_to_the_topic_with_retry(dispatchers):
+    server = LocalNtfyServer(fail_first=1).start()
+    try:
+        dispatcher = dispatchers(NtfySink(server.url, "alerts"), coalesce_window=0, min_interval=0, backoff=0.01)
+        dispatcher.notify("🚀 BUY executed")
+        assert dispatcher.flush(5)
+        assert server.messages == [("alerts", "🚀 BUY executed")]
+    finally:
+        server.stop()
+
+
+def test_notify_is_safe_from_many_threads(dispatchers):
+    sink = RecordingSink()
+    dispatcher = dispatchers(sink, coalesce_window=0.05, min_interval=0, max_queue=1000)
+    threads = [threading.Thread(target=lambda i=i: [dispatcher.notify(f"{i}:{j}") for j in range(50)]) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert dispatcher.flush(5)
+    messages = [part for _, message in sink.sent for part in message.split("\n\n")]
+    assert sorted(messages) == sorted(f"{i}:{j}" for i in range(8) for j in range(50))
+
+
+def test_notify_after_close_is_dropped(dispatchers, caplog):
+    sink = RecordingSink()
+    dispatcher = dispatchers(sink, coalesce_window=0.01, min_interval=0)
+    dispatcher.notify("before")
+    dispatcher.close(5)
+    with caplog.at_level("DEBUG", logger="crypto.notifier"):
+        dispatcher.notify("after")
+    dispatcher.close(1)
+    assert [message for _, message in sink.sent] == ["before"]
+    assert dispatcher.flush(0)
+    assert "Notifier closed, dropped: after" in caplog.text
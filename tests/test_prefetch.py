@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from crypto import prefetch
+from crypto.prefetch import OHLCVPrefetcher
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls, release = [], threading.Event()
+
+    def fake_fetch(symbol, timeframe, start_date, end_date=None):
+        calls.append((symbol, timeframe, start_date))
+        release.wait(5)
+        if calls[-1][2] == "fail":
+            raise ConnectionError("binance unreachable")
+        return f"data/{symbol}_{timeframe}_enriched.csv"
+
+    monkeypatch.setattr(prefetch, "fetch_ohlcv", fake_fetch)
+    return calls, release
+
+
+def test_concurrent_requests_share_one_download(downloads):
+    calls, release = downloads
+    prefetcher = OHLCVPrefetcher(max_workers=2)
+    first = prefetcher.prefetch("btc", "1h", start_date="2024-01-01")
+    assert prefetcher.prefetch("BTC/USDT", "1h") is first
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(prefetcher.fetch("BTCUSDT", "1h", "2024-01-01")))
+    waiter.start()
+    release.set()
+    waiter.join(5)
+
+    assert results == ["data/BTCUSDT_1h_enriched.csv"]
+    assert calls == [("BTCUSDT", "1h", "2024-01-01")]
+    assert prefetcher.stats["prefetched"] == 1
+    assert prefetcher.stats["joined"] + prefetcher.stats["warm"] == 1
+
+
+def test_cached_csv_is_not_downloaded(downloads, tmp_path):
+    calls, _ = downloads
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "ETHUSDT_4h_enriched.csv").write_text("timestamp,close\n")
+    prefetcher = OHLCVPrefetcher(max_workers=1)
+    assert prefetcher.prefetch("ETH", "4h").result() == "data/ETHUSDT_4h_enriched.csv"
+    assert calls == [] and prefetcher.stats["prefetched"] == 0
+
+
+def test_failed_prefetch_is_logged_and_fetched_again(downloads, caplog):
+    calls, release = downloads
+    release.set()
+    prefetcher = OHLCVPrefetcher(max_workers=1)
+    with pytest.raises(ConnectionError):
+        prefetcher.prefetch("SOL", "1h", start_date="fail").result(5)
+    assert prefetcher.stats["failed"] == 1 and prefetcher.inflight == {}
+
+    release.clear()
+    prefetcher.prefetch("SOL", "1h", start_date="fail")
+    errors = []
+
+    def fetch():
+        try:
+            prefetcher.fetch("SOL", "1h", "fail")
+        except ConnectionError as e:
+            errors.append(e)
+
+    with caplog.at_level(logging.WARNING, logger="crypto.prefetch"):
+        waiter = threading.Thread(target=fetch)
+        waiter.start()
+        while prefetcher.stats["joined"] == 0:
+            time.sleep(0.001)
+        release.set()
+        waiter.join(5)
+    assert len(errors) == 1
+    assert any("Prefetch of SOLUSDT 1h failed" in message for message in caplog.messages)
+    assert len(calls) == 3
@@ -0,0 +1,57 @@
+import os
+import signal
+import threading
+
+import pytest
+
+import profiler
+from profiler import SamplingProfiler, install_profiler_controls
+
+
+def spin_until(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=spin_until, args=(stop,), name="busy-worker", daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def folded_lines(directory):
+    path, = directory.glob("profile_*.folded")
+    return path.read_text().splitlines()
+
+
+def test_folded_output_contains_the_busy_thread(tmp_path, busy_thread):
+    sampler = SamplingProfiler(duration=0.2, interval=0.005, thread_names=["busy"], output_dir=str(tmp_path)).start()
+    sampler._thread.join(5)
+
+    lines = folded_lines(tmp_path)
+    assert sampler.samples > 0 and lines
+    assert all(line.startswith("busy-worker;phase:") for line in lines)
+    assert any("spin_until (test_profiler.py:" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sum(sampler.stacks.values())
+
+
+def test_sigusr1_starts_a_capture(tmp_path, busy_thread, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PROFILE_SECONDS", "0.1")
+    monkeypatch.setenv("PROFILE_THREADS", "busy")
+    monkeypatch.delenv("PROFILE_ON_START", raising=False)
+    monkeypatch.setattr(profiler, "_active", None)
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        install_profiler_controls()
+        assert profiler._active is None
+        os.kill(os.getpid(), signal.SIGUSR1)
+        profiler._active._thread.join(5)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert any("spin_until" in line for line in folded_lines(tmp_path / "output" / "profiles"))
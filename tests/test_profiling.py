@@ -0,0 +1,98 @@
+import json
+import threading
+
+import pytest
+from litellm import ModelResponse
+from litellm.integrations.custom_logger import CustomLogger
+from litellm.types.utils import Usage
+
+from crypto import profiling
+from crypto.cache import CachedLLM
+from crypto.profiling import RunProfiler, format_summary
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    profiler = RunProfiler({"timeframe": "1h"}, directory=str(tmp_path))
+    monkeypatch.setattr(profiling, "_active", profiler)
+    return profiler
+
+
+def llm_spans(profiler):
+    return [span for span in profiler.spans if span["kind"] == "llm"]
+
+
+def test_token_recorder_is_a_litellm_logger(profiler):
+    assert isinstance(profiler.token_recorder, CustomLogger)
+
+
+def test_model_response_usage_is_recorded(profiler):
+    response = ModelResponse(usage=Usage(prompt_tokens=120, completion_tokens=30, total_tokens=150))
+    profiler.llm_started("gpt-4o-mini")
+    profiler.token_recorder.log_success_event({}, response, 0, 0)
+    profiler.llm_finished()
+
+    span, = llm_spans(profiler)
+    assert (span["tokens_in"], span["tokens_out"]) == (120, 30)
+    assert span["status"] == "ok"
+
+
+@pytest.mark.parametrize("usage", [
+    Usage(prompt_tokens=7, completion_tokens=3, total_tokens=10),
+    {"prompt_tokens": 7, "completion_tokens": 3},
+])
+def test_crewai_usage_dict_is_recorded(profiler, usage):
+    profiler.llm_started("gpt-4o-mini")
+    profiler.token_recorder.log_success_event({}, {"usage": usage}, 0, 0)
+    profiler.llm_finished()
+
+    span, = llm_spans(profiler)
+    assert (span["tokens_in"], span["tokens_out"]) == (7, 3)
+
+
+def test_usage_reported_from_another_thread_is_ignored(profiler):
+    response = ModelResponse(usage=Usage(prompt_tokens=5, completion_tokens=5, total_tokens=10))
+    profiler.llm_started("gpt-4o-mini")
+    worker = threading.Thread(target=profiler.token_recorder.log_success_event, args=({}, response, 0, 0))
+    worker.start()
+    worker.join()
+    profiler.llm_finished()
+
+    span, = llm_spans(profiler)
+    assert (span["tokens_in"], span["tokens_out"]) == (0, 0)
+
+
+def test_cached_llm_call_records_tokens_once(profiler, monkeypatch):
+    monkeypatch.setenv("RESPONSE_CACHE", "0")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    profiling._install()
+    llm = CachedLLM(model="gpt-4o-mini", mock_response="hello")
+
+    assert llm.call("hi") == "hello"
+    span, = llm_spans(profiler)
+    assert span["tokens_in"] > 0 and span["tokens_out"] > 0
+    first = (span["tokens_in"], span["tokens_out"])
+
+    llm.call("hi again")
+    second = llm_spans(profiler)[1]
+    assert (second["tokens_in"], second["tokens_out"]) == first
+
+
+def test_finish_writes_timeline_with_totals(profiler):
+    profiler.task_started("find_trending_coins")
+    profiler.llm_started("gpt-4o-mini")
+    profiler.record_usage(100, 20)
+    profiler.llm_finished()
+    profiler.tool_started("Market Screener", 1, {"top": 10})
+    profiler.tool_finished("Market Screener", "error", error="timeout")
+    profiler.tool_started("Market Screener", 2, {"top": 10})
+    profiler.tool_finished("Market Screener", from_cache=True)
+    profiler.task_finished("find_trending_coins")
+
+    report = json.loads(open(profiler.finish("ok")).read())
+    task = report["summary"]["tasks"]["find_trending_coins"]
+    tool = report["summary"]["tools"]["Market Screener"]
+    assert (task["llm_calls"], task["tool_calls"], task["retries"]) == (1, 2, 1)
+    assert (task["tokens_in"], task["tokens_out"]) == (100, 20)
+    assert (tool["calls"], tool["errors"], tool["retries"], tool["cached"]) == (2, 1, 1, 1)
+    assert "find_trending_coins" in format_summary(report)
@@ -0,0 +1,56 @@
+import json
+
+import pandas as pd
+import pytest
+
+from mock_exchange import MockExchange, synthetic_ohlcv
+from replay import diff_trades, live_trades, replay
+
+STRATEGY = {
+    "strategy_id": "ema_cross",
+    "coin_symbol": "BTCUSDT",
+    "timeframe": "4h",
+    "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+    "exit_rules": "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))",
+    "stop_loss": 3,
+    "take_profit": 6,
+    "allocation": 50,
+}
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("replay")
+    strategy_file = directory / "strategy.json"
+    strategy_file.write_text(json.dumps({"strategy": STRATEGY, "performance": {}}))
+    candles = synthetic_ohlcv(252 + 200, "4h", seed=0, volatility=0.01)
+    return replay(str(strategy_file), candles)
+
+
+def test_live_path_matches_the_backtest(report):
+    assert report["candles"] == 200
+    assert report["divergences"] == []
+    assert report["matched"] == report["backtest"]["trade_count"] == report["live"]["trades"] >= 3
+    assert report["live"]["orders"] == 2 * report["matched"]
+
+
+def test_diff_flags_a_perturbed_trade():
+    exchange = MockExchange("BTCUSDT", "4h", candles=synthetic_ohlcv(20, "4h"), cursor=2)
+    times = pd.DatetimeIndex(pd.to_datetime(exchange.open_times, unit="ms"))
+    for side, cursor in (("buy", 2), ("sell", 5), ("buy", 8), ("sell", 12), ("buy", 15)):
+        exchange.cursor = cursor
+        quantity = 0.01 if side == "buy" else round(exchange.balances["BTC"] - exchange.balances["BTC"] % 0.00001, 5)
+        getattr(exchange, f"order_market_{side}")(symbol="BTCUSDT", quantity=quantity)
+
+    live = live_trades(exchange)
+    assert [(t["entry_time"], t["exit_time"]) for t in live] == [(times[2], times[5]), (times[8], times[12]),
+                                                                   (times[15], None)]
+    backtest = [dict(trade, reason="exit") for trade in live[:2]]
+    assert [row["status"] for row in diff_trades(live[:2], backtest)] == ["match", "match"]
+
+    backtest[1]["exit_time"] = times[11]
+    backtest.append({"entry_time": times[17], "exit_time": times[19], "pnl_pct": 1.0, "reason": "take_profit"})
+    rows = diff_trades(live, backtest)
+    assert [(row["entry_time"], row["status"]) for row in rows] == [
+        (times[2], "match"), (times[8], "exit differs"), (times[15], "live only"), (times[17], "backtest only")]
+    assert rows[1]["live_exit"] == times[12] and rows[1]["backtest_exit"] == times[11]
@@ -0,0 +1,114 @@
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crypto.screener import (WeightLimiter, bar_minutes, build_panel, call_with_retry, ewm, kline_weight,
+                             rank_panel, screen_market, usdt_universe)
+
+
+class ApiError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"APIError(code={status_code})")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": {"Retry-After": retry_after} if retry_after else {}})()
+
+
+class FakeClient:
+    def get_exchange_info(self):
+        return {"symbols": [
+            {"symbol": "BTCUSDT", "baseAsset": "BTC", "quoteAsset": "USDT", "status": "TRADING"},
+            {"symbol": "ETHUSDT", "baseAsset": "ETH", "quoteAsset": "USDT", "status": "TRADING"},
+            {"symbol": "USDCUSDT", "baseAsset": "USDC", "quoteAsset": "USDT", "status": "TRADING"},
+            {"symbol": "BTCUPUSDT", "baseAsset": "BTCUP", "quoteAsset": "USDT", "status": "TRADING"},
+            {"symbol": "LUNAUSDT", "baseAsset": "LUNA", "quoteAsset": "USDT", "status": "BREAK"},
+            {"symbol": "ETHBTC", "baseAsset": "ETH", "quoteAsset": "BTC", "status": "TRADING"},
+        ]}
+
+    def get_ticker(self):
+        return [{"symbol": "BTCUSDT", "quoteVolume": "100"}, {"symbol": "ETHUSDT", "quoteVolume": "900"}]
+
+
+def test_kline_weight_follows_binance_limits():
+    assert [kline_weight(limit) for limit in (99, 100, 499, 500, 999, 1000)] == [1, 2, 2, 5, 5, 10]
+
+
+def test_weight_limiter_waits_for_the_bucket_to_refill():
+    limiter = WeightLimiter(per_minute=600)
+    began = time.monotonic()
+    limiter.acquire(600)
+    assert time.monotonic() - began < 0.05
+    limiter.acquire(3)
+    assert time.monotonic() - began >= 0.25
+
+
+def test_rate_limited_calls_are_retried_and_client_errors_are_not():
+    limiter = WeightLimiter(per_minute=6000)
+    failures = [ApiError(429, retry_after="0.01"), ApiError(503)]
+
+    def flaky():
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    assert call_with_retry(flaky, limiter, 1, backoff=0.01) == "ok"
+
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise ApiError(400)
+
+    with pytest.raises(ApiError):
+        call_with_retry(bad_request, limiter, 1, backoff=0.01)
+    assert len(calls) == 1
+
+
+def test_universe_skips_stablecoins_leveraged_and_halted_pairs():
+    assert usdt_universe(FakeClient(), WeightLimiter(6000)) == ["ETHUSDT", "BTCUSDT"]
+    assert usdt_universe(FakeClient(), WeightLimiter(6000), max_symbols=1) == ["ETHUSDT"]
+
+
+def test_panel_is_right_aligned_and_nan_padded():
+    kline = lambda close, volume: [0, 0, 0, 0, str(close), 0, 0, str(volume)]
+    symbols, close, volume = build_panel({"A": [kline(i, 10) for i in range(5)], "B": [kline(7, 1)], "C": []}, 4)
+    assert symbols == ["A", "B"]
+    assert list(close[0]) == [1, 2, 3, 4]
+    assert np.isnan(close[1, :3]).all() and close[1, 3] == 7
+
+
+def test_ewm_matches_pandas():
+    values = np.random.default_rng(0).normal(100, 5, (3, 50))
+    values[1, :10] = np.nan
+    expected = pd.DataFrame(values.T).ewm(alpha=0.1, adjust=False, ignore_na=True).mean().to_numpy().T
+    np.testing.assert_allclose(ewm(values, 0.1), expected)
+
+
+def test_rank_panel_prefers_liquid_momentum_and_drops_thin_history():
+    bars = 60
+    steps = np.arange(bars)
+    close = np.vstack([100 * 1.01 ** steps, 100 * 0.995 ** steps, 100 + np.sin(steps), 100 * 1.02 ** steps])
+    close[3, :40] = np.nan
+    volume = np.full_like(close, 1e6)
+    volume[0] *= 10
+
+    coins = rank_panel(["UP", "DOWN", "FLAT", "NEW"], close, volume, "1d")
+    assert [coin.symbol for coin in coins] == ["UP", "FLAT", "DOWN"]
+    assert coins[0].momentum_short == pytest.approx((1.01 ** 7 - 1) * 100, abs=0.01)
+    assert rank_panel(["UP"], close[:1], volume[:1] / 1e6, "1d") == []
+
+
+def test_every_binance_interval_has_a_bar_length():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert [bar_minutes(tf) for tf in ("15m", "4h", "1d", "1w", "1M")] == [15, 240, 1440, 10080, 43200]
+    close = np.vstack([100 * 1.01 ** np.arange(40)])
+    coin, = rank_panel(["UP"], close, np.full_like(close, 1e7), "1M")
+    assert coin.momentum_short == pytest.approx((1.01 ** 7 - 1) * 100, abs=0.01)
+
+
+def test_unknown_interval_is_rejected_before_any_request():
+    with pytest.raises(ValueError, match="Unknown timeframe '2d'"):
+        screen_market("2d", client=object())
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from crypto.backtest import SignalCache, evaluate_rules, performance_metrics, run_backtest
+from crypto.search import GENES, SignalBank, StrategySearch, describe, simulate
+from crypto.tools.fetch_tool import add_indicators
+from mock_exchange import synthetic_ohlcv
+
+FIELDS = ("win_rate", "profit_factor", "sharpe_ratio", "max_drawdown", "total_return")
+
+
+@pytest.fixture(scope="module")
+def df():
+    frame = add_indicators(synthetic_ohlcv(3000, volatility=0.01, seed=7, kind="choppy"))
+    return frame.bfill().ffill()
+
+
+@pytest.fixture(scope="module")
+def genomes():
+    rng = np.random.default_rng(3)
+    return np.column_stack([rng.integers(0, n, 40) for n in GENES])
+
+
+def test_simulate_matches_run_backtest(df, genomes):
+    entry, exit = SignalBank(df).signals(genomes)
+    strategies = [describe(genome) for genome in genomes]
+    metrics = simulate(
+        df["close"].to_numpy(dtype=float), entry, exit,
+        np.array([s["stop_loss"] for s in strategies]),
+        np.array([s["take_profit"] for s in strategies]),
+        np.array([s["allocation"] for s in strategies]),
+        curves=True,
+    )
+
+    assert metrics["trade_count"].sum() > 0
+    for column, strategy in enumerate(strategies):
+        result = run_backtest(df, strategy["entry_rules"], strategy["exit_rules"], strategy["stop_loss"],
+                              strategy["take_profit"], strategy["allocation"])
+        expected = performance_metrics(result["equity"], result["trades"])
+        assert metrics["trade_count"][column] == expected["trade_count"], strategy["strategy_id"]
+        for field in FIELDS:
+            assert metrics[field][column] == pytest.approx(expected[field], rel=1e-9, abs=1e-9), field
+        np.testing.assert_allclose(metrics["equity"][:, column], result["equity"].to_numpy(), rtol=1e-12)
+
+
+def test_described_rules_match_the_bank_signals(df, genomes):
+    bank = SignalBank(df)
+    entry, exit = bank.signals(genomes)
+    for column, genome in enumerate(genomes[:10]):
+        strategy = describe(genome)
+        assert np.array_equal(evaluate_rules(df, strategy["entry_rules"]), entry[:, column])
+        assert np.array_equal(evaluate_rules(df, strategy["exit_rules"]), exit[:, column])
+
+
+def test_signal_cache_matches_evaluate_rules(df):
+    cache = SignalCache(df)
+    rules = [
+        "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+        "(df['rsi_14'] < 30) | (df['close'] < df['bb_lower'])",
+        "df['close'] > df['close'].rolling(50).max().shift(1)",
+    ]
+    for rule in rules:
+        assert np.array_equal(cache.evaluate(rule), evaluate_rules(df, rule))
+        assert np.array_equal(cache.evaluate(rule), evaluate_rules(df, rule))
+
+
+def test_search_scores_agree_with_run_backtest(df):
+    search = StrategySearch(df, objective="return", min_trades=1, seed=1)
+    search.random(64)
+    for genome in search.top(3):
+        strategy = describe(genome)
+        result = run_backtest(df, strategy["entry_rules"], strategy["exit_rules"], strategy["stop_loss"],
+                              strategy["take_profit"], strategy["allocation"])
+        expected = performance_metrics(result["equity"], result["trades"])
+        assert search.scores[genome] == pytest.approx(expected["total_return"], rel=1e-9)
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+
+from ledger import TradeLedger
+from mock_exchange import MockAPIError, MockExchange, synthetic_ohlcv
+from notifier import NotificationDispatcher
+from trader import RECONCILE_TICKS, CryptoTrader, floor_to_step
+from tsdb import TimeSeriesStore
+
+STRATEGY = {
+    "strategy_id": "test_hold",
+    "coin_symbol": "BTCUSDT",
+    "timeframe": "1h",
+    "entry_rules": "df['close'] < 0",
+    "exit_rules": "df['close'] < 0",
+    "stop_loss": 50,
+    "take_profit": 50,
+    "allocation": 50,
+}
+
+
+class LaggingExchange(MockExchange):
+    """Mock exchange whose account balances can be frozen for a number of get_account calls"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stale_account = None
+        self.stale_calls = 0
+
+    def freeze_balances(self, calls: int):
+        self.stale_account = self.get_account()
+        self.stale_calls = calls
+
+    def get_account(self, **params) -> dict:
+        if self.stale_calls > 0:
+            self.stale_calls -= 1
+            return self.stale_account
+        return super().get_account(**params)
+
+
+@pytest.fixture
+def make_trader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    strategy_file = tmp_path / "strategy.json"
+    strategy_file.write_text(json.dumps({"strategy": STRATEGY, "performance": {}}))
+    traders = []
+
+    def make(**exchange_kwargs):
+        exchange = LaggingExchange("BTCUSDT", "1h", candles=synthetic_ohlcv(1100, "1h"), cursor=1010, **exchange_kwargs)
+        trader = CryptoTrader("Test", strategy_file=str(strategy_file), data_client=exchange,
+                              trading_client=exchange, clock=exchange.now, notifier=NotificationDispatcher([]),
+                              candle_bus=False, ledger=TradeLedger(":memory:"),
+                              telemetry=TimeSeriesStore(":memory:", clock=exchange.now))
+        traders.append(trader)
+        return trader, exchange
+
+    yield make
+    for trader in traders:
+        trader.close()
+
+
+def tick(trader, exchange):
+    exchange.advance()
+    trader.refresh()
+    trader.post_trade.join()
+
+
+def test_injected_stores_leave_no_files(make_trader, tmp_path):
+    trader, exchange = make_trader()
+    for _ in range(3):
+        tick(trader, exchange)
+    trader.telemetry.compact()
+    assert not (tmp_path / "output").exists()
+
+
+def test_buy_not_yet_in_balance_keeps_entry_price(make_trader):
+    trader, exchange = make_trader()
+    exchange.freeze_balances(calls=1)
+    trader.buy_order()
+    filled, entry = trader.position, trader.entry_price
+    assert filled > 0 and entry > 0
+
+    tick(trader, exchange)
+    assert trader.position == filled
+    assert trader.entry_price == entry
+    assert trader._pending_reconcile == "buy"
+
+    tick(trader, exchange)
+    assert trader._pending_reconcile is None
+    assert trader.position == pytest.approx(exchange.balances["BTC"])
+    assert trader.entry_price == entry
+    assert trader.ledger.count() == 1
+
+
+def test_reconcile_trusts_exchange_after_retries(make_trader):
+    trader, exchange = make_trader()
+    trader.buy_order()
+    exchange.balances["BTC"] = 0.0
+
+    for _ in range(RECONCILE_TICKS):
+        tick(trader, exchange)
+    assert trader._pending_reconcile is None
+    assert trader.position == 0
+    assert trader.entry_price == 0
+
+
+def test_sell_reconcile_clears_entry_price(make_trader):
+    trader, exchange = make_trader()
+    trader.buy_order()
+    tick(trader, exchange)
+    assert trader.sell_order() is not None
+    tick(trader, exchange)
+    assert trader._pending_reconcile is None
+    assert not trader.has_position()
+    assert trader.entry_price == 0
+    assert [row["side"] for row in trader.ledger.page(limit=10)] == ["SELL", "BUY"]
+
+
+def test_dust_from_an_earlier_run_is_not_a_position(make_trader):
+    trader, exchange = make_trader(balances={"USDT": 10000.0, "BTC": 0.000004})
+    assert trader.lot_step == exchange.step_size
+    assert trader.position == pytest.approx(0.000004)
+    assert not trader.has_position()
+    assert trader.entry_price == 0
+    assert trader.sell_order() is None
+    assert trader.buy_order() is not None
+
+
+def test_quantities_are_floored_to_the_lot_step():
+    assert floor_to_step(0.29, 0.01) == 0.29
+    assert floor_to_step(0.00099999, 0.00001) == 0.00099
+    assert floor_to_step(0.1234567, 0.000001) == 0.123456
+    assert floor_to_step(12.7, 1.0) == 12
+
+
+def test_selling_the_whole_balance_passes_the_exchange_filters(make_trader):
+    trader, exchange = make_trader(balances={"USDT": 10000.0, "BTC": 0.00099999})
+    with pytest.raises(MockAPIError, match="insufficient balance"):
+        exchange.order_market_sell(symbol="BTCUSDT", quantity=round(0.00099999, 5))
+    with pytest.raises(MockAPIError, match="LOT_SIZE"):
+        exchange.order_market_sell(symbol="BTCUSDT", quantity=0.00099999)
+
+    order = trader.sell_order()
+    assert order is not None and float(order["executedQty"]) == 0.00099
+    assert exchange.balances["BTC"] == pytest.approx(0.00000999)
+
+
+def test_sell_below_min_notional_is_rejected_without_changing_state(make_trader):
+    trader, exchange = make_trader()
+    dust = floor_to_step(4.0 / exchange.price, exchange.step_size)
+    exchange.balances["BTC"] = dust
+    trader._force_portfolio_update()
+    assert trader.has_position()
+
+    assert trader.sell_order() is None
+    assert trader.position == pytest.approx(dust)
+    assert exchange.orders == []
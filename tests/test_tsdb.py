@@ -0,0 +1,114 @@
+import pytest
+
+from tsdb import TIERS, TimeSeriesStore
+
+START = 1_700_000_000.0 - 1_700_000_000.0 % 3600
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock(START)
+
+
+@pytest.fixture
+def store(clock):
+    store = TimeSeriesStore(":memory:", raw_retention=3600, flush_interval=3600, clock=clock)
+    yield store
+    store.close()
+
+
+def record(store, clock, seconds: int, step: int = 10):
+    for i in range(0, seconds, step):
+        clock.now = START + i
+        store.write("equity", 1000 + i)
+
+
+def test_recent_queries_return_raw_samples(store, clock):
+    record(store, clock, 600)
+    points = store.query("equity", clock.now - 300)
+    assert len(points) == 31
+    assert points[-1] == (clock.now, 1590.0)
+
+
+def test_minute_rollups_keep_ohlc(store, clock):
+    record(store, clock, 180)
+    store.flush()
+    rows = store._conn.execute("SELECT ts, open, high, low, close, mean, count FROM rollup_60 ORDER BY ts").fetchall()
+    assert rows[0] == (START, 1000, 1050, 1000, 1050, 1025, 6)
+    assert len(rows) == 2
+
+    points = store.query("equity", START, resolution=60)
+    assert [ts for ts, _ in points] == [START, START + 60, START + 120]
+    assert points[-1][1] == 1170
+
+
+def test_resolution_follows_the_store_clock(store, clock):
+    clock.now = START
+    assert store._resolution_for(START - 1800) == 0
+    assert store._resolution_for(START - 2 * 3600) == TIERS[0][0]
+    assert store._resolution_for(START - 30 * 24 * 3600) == TIERS[1][0]
+
+
+def test_compaction_prunes_by_the_store_clock(store, clock):
+    record(store, clock, 2 * 3600, step=60)
+    store.compact()
+    raw = store.raw["equity"]
+    assert raw[0][0] >= clock.now - 3600
+    assert len(raw) == 61
+
+    clock.now += 8 * 24 * 3600
+    store.write("equity", 1.0)
+    store.compact()
+    assert store._conn.execute("SELECT COUNT(*) FROM rollup_60").fetchone()[0] == 0
+    assert store._conn.execute("SELECT COUNT(*) FROM rollup_3600").fetchone()[0] == 2
+
+
+def test_simulated_past_is_not_pruned_as_stale(clock):
+    clock.now = 1_500_000_000.0
+    store = TimeSeriesStore(":memory:", flush_interval=3600, clock=clock)
+    store.write_many({"equity": 10_000.0, "position": 0.5})
+    store.compact()
+    assert store.query("equity", clock.now - 3600) == [(clock.now, 10_000.0)]
+    assert store.query("position", clock.now - 3600) == [(clock.now, 0.5)]
+    store.close()
+
+
+def test_rollups_survive_reopen(tmp_path, clock):
+    path = str(tmp_path / "telemetry.db")
+    store = TimeSeriesStore(path, flush_interval=3600, clock=clock)
+    record(store, clock, 300)
+    store.close()
+
+    reopened = TimeSeriesStore(path, flush_interval=3600, clock=clock)
+    points = reopened.query("equity", START, resolution=60)
+    assert [ts for ts, _ in points] == [START + i * 60 for i in range(5)]
+    reopened.close()
+
+
+def test_restart_inside_a_bucket_merges_both_sessions(tmp_path, clock):
+    path = str(tmp_path / "telemetry.db")
+    store = TimeSeriesStore(path, flush_interval=3600, clock=clock)
+    for i, value in enumerate((10, 30, 20)):
+        clock.now = START + i
+        store.write("equity", value)
+    store.close()
+
+    reopened = TimeSeriesStore(path, flush_interval=3600, clock=clock)
+    for i, value in enumerate((5, 25)):
+        clock.now = START + 10 + i
+        reopened.write("equity", value)
+    reopened.close()
+
+    check = TimeSeriesStore(path, flush_interval=3600, clock=clock)
+    for seconds, _ in TIERS:
+        row = check._conn.execute(f"SELECT ts, open, high, low, close, mean, count FROM rollup_{seconds}").fetchall()
+        assert row == [(START, 10, 30, 5, 25, 18, 5)]
+    check.close()
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from crypto.backtest import evaluate_rules, performance_metrics, run_backtest
+from crypto.tools.fetch_tool import add_indicators
+from crypto.validation import make_windows, robustness, run_segments, stitch, validate
+from mock_exchange import synthetic_ohlcv
+
+STRATEGIES = [
+    {"strategy_id": "ema_cross", "stop_loss": 3.0, "take_profit": 6.0, "allocation": 100.0,
+     "entry_rules": "(df['ema_10'] > df['ema_20']) & (df['ema_10'].shift(1) <= df['ema_20'].shift(1))",
+     "exit_rules": "(df['ema_10'] < df['ema_20']) & (df['ema_10'].shift(1) >= df['ema_20'].shift(1))"},
+    {"strategy_id": "rsi_reversion", "stop_loss": 5.0, "take_profit": 4.0, "allocation": 50.0,
+     "entry_rules": "df['rsi_14'] < 30", "exit_rules": "df['rsi_14'] > 70"},
+]
+
+
+@pytest.fixture(scope="module")
+def df():
+    return add_indicators(synthetic_ohlcv(2000, volatility=0.01, seed=11, kind="choppy")).bfill().ffill()
+
+
+def test_walk_forward_windows_never_train_on_the_future():
+    windows = make_windows(1000, "walk_forward", folds=4, train_frac=0.5, embargo=5)
+    assert [w["test"] for w in windows] == [(500, 625), (625, 750), (750, 875), (875, 1000)]
+    for window in windows:
+        (start, end), = window["train"]
+        assert end == window["test"][0] - 5
+        assert end - start == 495
+
+    anchored = make_windows(1000, "walk_forward", folds=4, anchored=True)
+    assert all(w["train"] == [(0, w["test"][0])] for w in anchored)
+
+
+def test_kfold_windows_cover_every_bar_once():
+    windows = make_windows(1003, "kfold", folds=5, embargo=3)
+    tested = [bar for w in windows for bar in range(*w["test"])]
+    assert tested == list(range(1003))
+    assert windows[0]["train"] == [(203, 1003)]
+    assert windows[2]["train"] == [(0, 397), (603, 1003)]
+
+
+def test_too_little_history_is_rejected():
+    with pytest.raises(ValueError):
+        make_windows(60, "walk_forward", folds=5)
+    with pytest.raises(ValueError):
+        make_windows(1000, "kfold", folds=1)
+
+
+def test_single_segment_stitch_matches_run_backtest(df):
+    close = df["close"].to_numpy(dtype=float)
+    entry = np.column_stack([evaluate_rules(df, s["entry_rules"]) for s in STRATEGIES])
+    exit = np.column_stack([evaluate_rules(df, s["exit_rules"]) for s in STRATEGIES])
+    params = [np.array([s[key] for s in STRATEGIES]) for key in ("stop_loss", "take_profit", "allocation")]
+    runs = run_segments(close, entry, exit, *params, [(0, len(df)), (0, 700)])
+    full = stitch(runs, [(0, np.arange(len(STRATEGIES)))])
+
+    for i, strategy in enumerate(STRATEGIES):
+        result = run_backtest(df, strategy["entry_rules"], strategy["exit_rules"], strategy["stop_loss"],
+                              strategy["take_profit"], strategy["allocation"])
+        expected = performance_metrics(result["equity"], result["trades"])
+        assert full["trade_count"][i] == expected["trade_count"]
+        for field in ("total_return", "max_drawdown", "sharpe_ratio", "win_rate"):
+            assert full[field][i] == pytest.approx(expected[field], rel=1e-9, abs=1e-9)
+
+        short = run_backtest(df.iloc[:700], strategy["entry_rules"], strategy["exit_rules"], strategy["stop_loss"],
+                             strategy["take_profit"], strategy["allocation"])
+        padded = stitch(runs, [(1, [i])])
+        assert padded["total_return"][0] == pytest.approx(
+            performance_metrics(short["equity"], short["trades"])["total_return"], rel=1e-9, abs=1e-9)
+
+
+def test_robustness_rewards_consistent_out_of_sample_gains():
+    train = np.array([[2.0, 2.0], [2.0, 2.0]])
+    test = np.array([[2.0, -1.0], [2.0, 3.0]])
+    trades = np.array([[3, 0], [2, 4]])
+    scores = robustness(train, test, trades, np.array([100, 100]), np.array([100, 100]))
+    assert scores[0] == pytest.approx(100.0)
+    assert 0 < scores[1] < scores[0]
+
+
+def test_validate_reports_every_strategy_and_window(df):
+    report = validate(df, STRATEGIES, method="walk_forward", folds=3)
+    assert report["bars"] == len(df)
+    assert {r["strategy"]["strategy_id"] for r in report["results"]} == {"ema_cross", "rsi_reversion"}
+    for result in report["results"]:
+        assert 0 <= result["robustness"] <= 100
+        assert len(result["windows"]) == 3
+        assert result["out_of_sample"]["trade_count"] == sum(w["test_trades"] for w in result["windows"])
+    assert len(report["selection"]["picked"]) == 3
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from worker import BackgroundWorker
+
+
+class Flaky:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = []
+
+    def __call__(self, value):
+        self.calls.append(time.monotonic())
+        if len(self.calls) <= self.failures:
+            raise RuntimeError("exchange unavailable")
+        self.value = value
+
+
+def test_job_is_retried_until_it_succeeds():
+    worker = BackgroundWorker("test", retries=3, backoff=0.01)
+    job = Flaky(failures=2)
+    worker.submit(job, 42)
+    assert worker.join(timeout=5)
+    assert len(job.calls) == 3
+    assert job.value == 42
+    assert worker.failed == 0
+
+
+def test_backoff_doubles_between_attempts():
+    worker = BackgroundWorker("test", retries=3, backoff=0.05)
+    job = Flaky(failures=5)
+    worker.submit(job, 1)
+    assert worker.join(timeout=5)
+    gaps = [b - a for a, b in zip(job.calls, job.calls[1:])]
+    assert len(job.calls) == 3
+    assert gaps[0] >= 0.05 and gaps[1] >= 0.1
+    assert worker.failed == 1
+
+
+def test_per_job_retries_override_the_default():
+    worker = BackgroundWorker("test", retries=5, backoff=0.01)
+    job = Flaky(failures=5)
+    worker.submit(job, 1, retries=1)
+    assert worker.join(timeout=5)
+    assert len(job.calls) == 1
+    assert worker.failed == 1
+
+
+def test_full_queue_drops_without_blocking():
+    worker = BackgroundWorker("test", max_queue=2, retries=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    worker.submit(blocker)
+    started.wait(5)
+    assert worker.submit(lambda: None)
+    assert worker.submit(lambda: None)
+    began = time.monotonic()
+    assert not worker.submit(lambda: None)
+    assert time.monotonic() - began < 0.1
+    assert worker.dropped == 1
+
+    assert not worker.join(timeout=0.05)
+    release.set()
+    assert worker.join(timeout=5)
@@ -1,18 +1,24 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import json
+import math
+from decimal import Decimal
 import os
 from pathlib import Path
 from datetime import datetime
 from binance.client import Client
 from dotenv import load_dotenv
 from util import Color
+from worker import BackgroundWorker
+from ledger import TradeLedger
+from tsdb import TimeSeriesStore
+from notifier import NotificationDispatcher
+from metrics import metrics
+from candlebus import CandleRingWriter, open_reader
+from events import bus
+from logger import get_logger, log_ring
+import logging
 import time
 import numpy as np
-import ta
-import asyncio
-import requests
 
 load_dotenv(override=True)
 
@@ -21,13 +27,26 @@ mainnet_api_secret = os.getenv("BINANCE_API_SECRET")
 testnet_api_key = os.getenv("TESTNET_API_KEY")
 testnet_api_secret = os.getenv("TESTNET_SECRET")
 
+log = get_logger("trader")
+
+# ticks to wait for a buy fill to show up in the account balance before trusting the exchange's view
+RECONCILE_TICKS = 3
+
+
+def floor_to_step(quantity: float, step_size: float) -> float:
+    """Round a quantity down to the LOT_SIZE step; rounding up could ask for more than the free balance"""
+    precision = max(0, -Decimal(repr(step_size)).normalize().as_tuple().exponent)
+    return round(math.floor(quantity / step_size + 1e-9) * step_size, precision)
+
 class CryptoTrader:
-    def __init__(self, name: str = "CryptoBot", strategy_file: str = "output/backtest_results.json"):
+    def __init__(self, name: str = "CryptoBot", strategy_file: str = "output/backtest_results.json",
+                 data_client=None, trading_client=None, clock=None, notifier=None, candle_bus: bool = None,
+                 ledger: TradeLedger = None, telemetry: TimeSeriesStore = None):
         self.name = name
+        self.clock = clock or time.time
         self.strategy_file = strategy_file
         self.strategy = None
         self.performance = None
-        self.logs = []
         self.last_refresh_log = 0
         self.last_price_log = 0
         
@@ -39,8 +58,9 @@ class CryptoTrader:
         self.symbol = symbol
         self.timeframe = timeframe
         self.buffer_size = self._calculate_buffer_size()
-        self.data_client = Client(mainnet_api_key, mainnet_api_secret)
-        self.trading_client = Client(testnet_api_key, testnet_api_secret, testnet=True)
+        self._price_chart = None
+        self.data_client = data_client or Client(mainnet_api_key, mainnet_api_secret)
+        self.trading_client = trading_client or Client(testnet_api_key, testnet_api_secret, testnet=True)
         
         self.data_buffer = None
         self.latest_price = None
@@ -51,8 +71,18 @@ class CryptoTrader:
         self.initial_portfolio_value = 0
         self.usdt_balance = 0
         self.last_account_update = 0
-        self.transactions = []
+        self.ledger = ledger or TradeLedger(os.getenv("TRADE_LEDGER", "output/trades.db"))
+        self.telemetry = telemetry or TimeSeriesStore(os.getenv("TELEMETRY_DB", "output/telemetry.db"), clock=self.clock)
         self.position_initialized = False
+        self.lot_step = 0
+        self._balance_snapshot = None
+        self.post_trade = BackgroundWorker("post-trade", max_queue=100, retries=3)
+        self._pending_reconcile = None
+        self._reconcile_attempts = 0
+        self.notifier = notifier or NotificationDispatcher.from_env()
+        self.use_candle_bus = os.getenv("CANDLE_BUS", "1") != "0" if candle_bus is None else candle_bus
+        self.candle_feed = None
+        self.candle_source = None
         
         if self.strategy:
             try:
@@ -79,7 +109,7 @@ class CryptoTrader:
             server_time = res['serverTime']
             local_time = int(time.time() * 1000)
             time_diff = local_time - server_time
-            print(f"🕐 Server time: {server_time} | Local time: {local_time} | Difference: {time_diff}ms")
+            log.debug("🕐 Server time: %s | Local time: %s | Difference: %sms", server_time, local_time, time_diff)
             return server_time
         except Exception as e:
             try:
@@ -87,21 +117,21 @@ class CryptoTrader:
                 server_time = res['serverTime']
                 local_time = int(time.time() * 1000)
                 time_diff = local_time - server_time
-                print(f"🕐 Server time (data client): {server_time} | Local time: {local_time} | Difference: {time_diff}ms")
+                log.debug("🕐 Server time (data client): %s | Local time: %s | Difference: %sms", server_time, local_time, time_diff)
                 return server_time
             except Exception as e2:
                 self.add_log("error", f"Failed to get server time: {e2}")
                 local_time = int(time.time() * 1000)
-                print(f"🕐 Using local time as fallback: {local_time}")
+                log.warning("🕐 Using local time as fallback: %s", local_time)
                 return local_time
 
     def _force_portfolio_update(self):
         try:
             # Log timestamps before making the API call
-            server_time = self._get_server_time()
-            local_time = int(time.time() * 1000)
-            time_diff = local_time - server_time
-            print(f"🕐 Before portfolio update - Server: {server_time}, Local: {local_time}, Diff: {time_diff}ms")
+            if log.isEnabledFor(logging.DEBUG):
+                server_time = self._get_server_time()
+                local_time = int(time.time() * 1000)
+                log.debug("🕐 Before portfolio update - Server: %s, Local: %s, Diff: %sms", server_time, local_time, local_time - server_time)
             
             account = self.trading_client.get_account()
             total_balance = 0
@@ -124,9 +154,9 @@ class CryptoTrader:
             self.portfolio_value = total_balance
             self.usdt_balance = usdt_balance
             self.position = coin_balance
-            self.last_account_update = time.time()
+            self.last_account_update = self.clock()
             
-            if coin_balance > 0 and not self.position_initialized:
+            if self.has_position() and not self.position_initialized:
                 self.add_log("info", f"Position initialized: {coin_balance:.6f} {self.symbol.replace('USDT', '')}")
                 if self.entry_price == 0 and hasattr(self, 'data_buffer') and self.data_buffer is not None:
                     self.entry_price = self.data_buffer['close'].iloc[-1]
@@ -136,6 +166,7 @@ class CryptoTrader:
             if self.initial_portfolio_value == 0:
                 self.initial_portfolio_value = total_balance
                 self.add_log("info", f"Initial portfolio value set: {self.initial_portfolio_value:.2f} USDT")
+            return True
                     
         except Exception as e:
             # Log timestamps when error occurs
@@ -143,7 +174,8 @@ class CryptoTrader:
             local_time = int(time.time() * 1000)
             time_diff = local_time - server_time
             self.add_log("error", f"Failed to update portfolio: {e}")
-            print(f"🕐 Error timestamps - Server: {server_time}, Local: {local_time}, Diff: {time_diff}ms")
+            log.warning("🕐 Error timestamps - Server: %s, Local: %s, Diff: %sms", server_time, local_time, time_diff)
+            return False
 
     def load_strategy(self):
         try:
@@ -158,13 +190,9 @@ class CryptoTrader:
         except Exception as e:
             self.add_log("error", f"Error loading strategy: {e}")
 
-    def add_log(self, log_type: str, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.logs.append((timestamp, log_type, message))
-        if len(self.logs) > 50:
-            self.logs = self.logs[-50:]
-        
-        print(f"{timestamp} [{log_type.upper()}] {message}")
+    def add_log(self, log_type: str, message: str, **fields):
+        level = logging.ERROR if log_type == "error" else logging.INFO
+        log.log(level, message, extra={"log_type": log_type, "fields": fields})
 
     def get_title(self) -> str:
         return ""
@@ -228,178 +256,29 @@ class CryptoTrader:
         """
         return info
 
-    def get_coin_price_chart(self):
-        if not hasattr(self, 'data_buffer') or self.data_buffer is None:
-            fig = go.Figure()
-            fig.update_layout(
-                height=400,
-                xaxis_title="Time",
-                yaxis_title=f"{self.symbol} Price",
-                paper_bgcolor="rgba(0,0,0,0)",
-                plot_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="white", size=12),
-                title=dict(
-                    text=f"{self.symbol} Price Chart",
-                    font=dict(size=16, color="white"),
-                    x=0.5
-                ),
-                showlegend=False,
-                xaxis=dict(
-                    gridcolor="rgba(255,255,255,0.1)",
-                    linecolor="rgba(255,255,255,0.2)",
-                    tickfont=dict(size=10, color="white")
-                ),
-                yaxis=dict(
-                    gridcolor="rgba(255,255,255,0.1)", 
-                    linecolor="rgba(255,255,255,0.2)",
-                    tickfont=dict(size=10, color="white")
-                )
-            )
-            fig.add_annotation(
-                text="No market data available",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=14, color="gray"),
-                align="center"
-            )
-            return fig
-        
-        chart_data = self.data_buffer.tail(200).copy()
-        chart_data = chart_data.reset_index()
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=chart_data['timestamp'],
-            y=chart_data['close'],
-            mode='lines',
-            name='Price',
-            line=dict(color='#00d4aa', width=2),
-            hovertemplate='<b>%{x}</b><br>Price: $%{y:.2f}<extra></extra>'
-        ))
-        
-        if 'ema_10' in chart_data.columns:
-            fig.add_trace(go.Scatter(
-                x=chart_data['timestamp'],
-                y=chart_data['ema_10'],
-                mode='lines',
-                name='EMA 10',
-                line=dict(color='#ff6b6b', width=1, dash='dash'),
-                opacity=0.7,
-                hovertemplate='<b>%{x}</b><br>EMA 10: $%{y:.2f}<extra></extra>'
-            ))
-        
-        if 'ema_20' in chart_data.columns:
-            fig.add_trace(go.Scatter(
-                x=chart_data['timestamp'],
-                y=chart_data['ema_20'],
-                mode='lines',
-                name='EMA 20',
-                line=dict(color='#4dabf7', width=1, dash='dash'),
-                opacity=0.7,
-                hovertemplate='<b>%{x}</b><br>EMA 20: $%{y:.2f}<extra></extra>'
-            ))
-        
-        if 'bb_upper' in chart_data.columns and 'bb_lower' in chart_data.columns:
-            fig.add_trace(go.Scatter(
-                x=chart_data['timestamp'],
-                y=chart_data['bb_upper'],
-                mode='lines',
-                name='BB Upper',
-                line=dict(color='rgba(255,255,255,0.3)', width=1),
-                opacity=0.5,
-                showlegend=False,
-                hovertemplate='<b>%{x}</b><br>BB Upper: $%{y:.2f}<extra></extra>'
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=chart_data['timestamp'],
-                y=chart_data['bb_lower'],
-                mode='lines',
-                name='BB Lower',
-                line=dict(color='rgba(255,255,255,0.3)', width=1),
-                opacity=0.5,
-                fill='tonexty',
-                fillcolor='rgba(255,255,255,0.05)',
-                showlegend=False,
-                hovertemplate='<b>%{x}</b><br>BB Lower: $%{y:.2f}<extra></extra>'
-            ))
-        
-        signals = self.check_strategy_signals(self.strategy) if self.strategy else {'entry': False, 'exit': False}
-        current_price = chart_data['close'].iloc[-1]
-        
-        if signals['entry']:
-            fig.add_trace(go.Scatter(
-                x=[chart_data['timestamp'].iloc[-1]],
-                y=[current_price],
-                mode='markers',
-                name='Entry Signal',
-                marker=dict(
-                    color='#00d4aa',
-                    size=15,
-                    symbol='triangle-up',
-                    line=dict(color='white', width=2)
-                ),
-                hovertemplate='<b>Entry Signal</b><br>Price: $%{y:.2f}<extra></extra>'
-            ))
-        
-        if signals['exit']:
-            fig.add_trace(go.Scatter(
-                x=[chart_data['timestamp'].iloc[-1]],
-                y=[current_price],
-                mode='markers',
-                name='Exit Signal',
-                marker=dict(
-                    color='#ff6b6b',
-                    size=15,
-                    symbol='triangle-down',
-                    line=dict(color='white', width=2)
-                ),
-                hovertemplate='<b>Exit Signal</b><br>Price: $%{y:.2f}<extra></extra>'
-            ))
-        
-        fig.update_layout(
-            height=400,
-            margin=dict(l=50, r=30, t=60, b=50),
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            font=dict(color="white", size=12),
-            title=dict(
-                text=f"{self.symbol} Price Chart with Technical Indicators",
-                font=dict(size=16, color="white"),
-                x=0.5,
-                xanchor="center"
-            ),
-            xaxis=dict(
-                gridcolor="rgba(255,255,255,0.1)",
-                linecolor="rgba(255,255,255,0.2)",
-                tickformat="%m/%d %H:%M",
-                tickangle=45,
-                tickfont=dict(size=10, color="white")
-            ),
-            yaxis=dict(
-                gridcolor="rgba(255,255,255,0.1)",
-                linecolor="rgba(255,255,255,0.2)", 
-                tickformat=",.2f",
-                tickfont=dict(size=10, color="white")
-            ),
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor="rgba(0,0,0,0.5)",
-                bordercolor="rgba(255,255,255,0.2)"
-            ),
-            hovermode='x unified'
+    @property
+    def price_chart(self):
+        """Created on first use so headless runs never import plotly"""
+        if self._price_chart is None:
+            from chart import PriceChart
+            self._price_chart = PriceChart(self.symbol)
+        return self._price_chart
+
+    def get_coin_price_chart(self, view: str = "Live"):
+        data_buffer = self.data_buffer if hasattr(self, 'data_buffer') else None
+        return self.price_chart.figure(
+            data_buffer,
+            lambda: self.check_strategy_signals(self.strategy) if self.strategy else {'entry': False, 'exit': False},
+            view=view
         )
-        
-        return fig
+
+    def get_equity_chart(self, view: str = "Live"):
+        from chart import VIEWS, equity_figure
+        span = VIEWS.get(view) or pd.Timedelta(hours=6)
+        start = 0 if span is pd.Timedelta.max else self.clock() - span.total_seconds()
+        return equity_figure(self.telemetry.query("equity", start), self.symbol)
 
     def get_holdings_df(self) -> pd.DataFrame:
-        self.get_portfolio_value()
-        self.get_actual_position()
-        
         holdings = []
         
         if self.usdt_balance > 0:
@@ -423,32 +302,29 @@ class CryptoTrader:
             return pd.DataFrame(holdings)
         return pd.DataFrame(columns=["Symbol", "Quantity", "Value (USDT)"])
 
-    def get_transactions_df(self) -> pd.DataFrame:
-        if not self.transactions:
+    def get_transactions_df(self, page: int = 0, page_size: int = 20) -> pd.DataFrame:
+        trades = self.ledger.page(offset=page * page_size, limit=page_size)
+        if not trades:
             return pd.DataFrame(columns=["Timestamp", "Symbol", "Quantity", "Price", "Type", "Value", "P&L"])
         
         df_data = []
-        for tx in self.transactions:
-            row = {
-                "Timestamp": tx["timestamp"],
-                "Symbol": tx["symbol"],
-                "Quantity": tx["quantity"],
-                "Price": tx["price"],
-                "Type": tx["type"],
-                "Value": tx["value"]
-            }
-            if tx["type"] == "SELL" and "pnl" in tx:
-                row["P&L"] = tx["pnl"]
-            else:
-                row["P&L"] = "-"
-            df_data.append(row)
+        for tx in trades:
+            df_data.append({
+                "Timestamp": datetime.fromtimestamp(tx["ts"]).strftime("%Y-%m-%d %H:%M:%S"),
+                "Symbol": tx["symbol"].replace('USDT', ''),
+                "Quantity": f"{tx['quantity']:.6f}",
+                "Price": f"{tx['price']:.2f}",
+                "Type": tx["side"],
+                "Value": f"{tx['value']:.2f}",
+                "P&L": f"{tx['pnl_pct']:+.2f}%" if tx["pnl_pct"] is not None else "-"
+            })
         
         return pd.DataFrame(df_data)
 
+    def get_transaction_pages(self, page_size: int = 20) -> int:
+        return max(1, -(-self.ledger.count() // page_size))
+
     def get_portfolio_value_display(self) -> str:
-        self.get_portfolio_value()
-        self.get_actual_position()
-        
         if self.initial_portfolio_value > 0:
             total_pnl = ((self.portfolio_value - self.initial_portfolio_value) / self.initial_portfolio_value) * 100
             pnl_class = "positive-pnl" if total_pnl >= 0 else "negative-pnl"
@@ -476,6 +352,7 @@ class CryptoTrader:
                     Initial: {self.initial_portfolio_value:,.2f} USDT
                 </div>
                 {position_pnl_text}
+                {self._realized_pnl_text()}
             </div>
             """
         
@@ -492,8 +369,61 @@ class CryptoTrader:
         </div>
         """
 
+    def get_latency_html(self) -> str:
+        snapshot = metrics.snapshot()
+        if not snapshot:
+            return """
+            <div class='logs-console'>
+                <div style='color: #666; text-align: center; padding: 20px;'>
+                    ⏱️ No latency samples yet
+                </div>
+            </div>
+            """
+        
+        rows = ""
+        for stage, stats in snapshot.items():
+            rows += f"""
+            <tr>
+                <td style='padding: 4px 12px; color: #e0e0e0;'>{stage}</td>
+                <td style='padding: 4px 12px; text-align: right;'>{stats['count']}</td>
+                <td style='padding: 4px 12px; text-align: right;'>{stats['p50']:.1f}</td>
+                <td style='padding: 4px 12px; text-align: right;'>{stats['p95']:.1f}</td>
+                <td style='padding: 4px 12px; text-align: right;'>{stats['p99']:.1f}</td>
+                <td style='padding: 4px 12px; text-align: right;'>{stats['max']:.1f}</td>
+            </tr>
+            """
+        
+        return f"""
+        <div class='logs-console'>
+            <table style='width: 100%; border-collapse: collapse;'>
+                <tr style='color: #00d4aa; border-bottom: 1px solid #00d4aa;'>
+                    <th style='padding: 4px 12px; text-align: left;'>Stage</th>
+                    <th style='padding: 4px 12px; text-align: right;'>Count</th>
+                    <th style='padding: 4px 12px; text-align: right;'>p50 ms</th>
+                    <th style='padding: 4px 12px; text-align: right;'>p95 ms</th>
+                    <th style='padding: 4px 12px; text-align: right;'>p99 ms</th>
+                    <th style='padding: 4px 12px; text-align: right;'>Max ms</th>
+                </tr>
+                {rows}
+            </table>
+        </div>
+        """
+
+    def _realized_pnl_text(self) -> str:
+        summary = self.ledger.realized_pnl(symbol=self.symbol)
+        if not summary['closed']:
+            return ""
+        pnl_class = "positive-pnl" if summary['realized_pnl'] >= 0 else "negative-pnl"
+        return f"""
+                <div class='subtitle' style='font-size: 0.9rem; margin-top: 4px;'>
+                    Realized P&L: <span class='{pnl_class}'>{summary['realized_pnl']:+,.2f} USDT</span>
+                    ({summary['closed']} closed, {summary['win_rate']:.0f}% wins)
+                </div>
+                """
+
     def get_logs_html(self, previous=None) -> str:
-        if not self.logs:
+        logs = log_ring.recent(15)
+        if not logs:
             return """
             <div class='logs-console'>
                 <div style='color: #666; text-align: center; padding: 20px;'>
@@ -509,11 +439,11 @@ class CryptoTrader:
             "error": "#ff6b6b",
             "info": "#ffd93d",
             "portfolio": "#4dabf7",
+            "warning": "#ffd93d",
         }
         
         response = ""
-        for log in self.logs[-15:]:
-            timestamp, log_type, message = log
+        for timestamp, log_type, message in logs:
             color = mapper.get(log_type, "#87CEEB")
             icon = {
                 "trace": "🔍",
@@ -522,6 +452,7 @@ class CryptoTrader:
                 "error": "❌",
                 "info": "ℹ️",
                 "portfolio": "💰",
+                "warning": "⚠️",
             }.get(log_type, "📝")
             
             response += f"""
@@ -543,20 +474,61 @@ class CryptoTrader:
         """
 
 
+    def close(self, timeout: float = 10.0):
+        """Drain post-trade jobs and notifications, then close the ledger and telemetry store"""
+        self.post_trade.join(timeout)
+        self.notifier.close(timeout)
+        for ring in (self.candle_feed, self.candle_source):
+            if ring is not None:
+                ring.close()
+        self.telemetry.close()
+        self.ledger.close()
+
     def refresh(self):
-        current_time = time.time()
+        with metrics.span("tick"):
+            self._refresh()
+        self._record_telemetry()
+        self._publish_balance_if_changed()
+
+    def _record_telemetry(self):
+        price = self.latest_price
+        if self.data_buffer is not None:
+            price = float(self.data_buffer['close'].iloc[-1])
+        values = {"position": self.position, "usdt_balance": self.usdt_balance}
+        if price:
+            values["price"] = price
+            values["equity"] = self.usdt_balance + self.position * price
+        elif self.portfolio_value:
+            values["equity"] = self.portfolio_value
+        self.telemetry.write_many(values, self.clock())
+        bus.publish("tick")
+
+    def _publish_balance_if_changed(self):
+        snapshot = (self.portfolio_value, self.usdt_balance, self.position, self.entry_price)
+        if snapshot != self._balance_snapshot:
+            self._balance_snapshot = snapshot
+            bus.publish("balance")
+
+    def _refresh(self):
+        current_time = self.clock()
         
         if current_time - self.last_refresh_log > 120:
             self.add_log("info", "Refreshing data...")
             self.last_refresh_log = current_time
         
-        self.get_portfolio_value()
-        self.get_actual_position()
+        if self._pending_reconcile:
+            self._reconcile_portfolio()
+        else:
+            with metrics.span("portfolio_refresh"):
+                self.get_portfolio_value()
+                self.get_actual_position()
         
         if hasattr(self, 'data_buffer') and self.data_buffer is not None:
-            new_candle = self.check_for_new_candle()
+            with metrics.span("candle_detect"):
+                new_candle = self.check_for_new_candle()
             if new_candle:
-                self.update_with_new_candle(new_candle)
+                with metrics.span("indicator_update"):
+                    self.update_with_new_candle(new_candle)
                 self._debug_log_metrics()
                 self._check_and_execute_trades()
         
@@ -569,67 +541,49 @@ class CryptoTrader:
                     self._debug_log_status()
 
     def _debug_log_metrics(self):
+        if not log.isEnabledFor(logging.DEBUG):
+            return
         if not hasattr(self, 'data_buffer') or self.data_buffer is None:
             return
             
         latest = self.get_latest_data()
-        current_price = latest['close']
-        
-        print(f"\n{'='*60}")
-        print(f"📊 LIVE TRADING METRICS - {datetime.now().strftime('%H:%M:%S')}")
-        print(f"{'='*60}")
-        
-        print(f"💰 Portfolio Value: {self.portfolio_value:.2f} USDT")
-        if self.initial_portfolio_value > 0:
-            total_pnl = ((self.portfolio_value - self.initial_portfolio_value) / self.initial_portfolio_value) * 100
-            print(f"📈 Total P&L: {total_pnl:+.2f}% (Initial: {self.initial_portfolio_value:.2f} USDT)")
-        
-        print(f"🪙 Position: {self.position:.6f} {self.symbol.replace('USDT', '')}")
-        if self.position > 0 and self.entry_price > 0:
-            position_pnl = ((current_price - self.entry_price) / self.entry_price) * 100
-            print(f"📊 Position P&L: {position_pnl:+.2f}% (Entry: {self.entry_price:.2f} USDT)")
-        
-        print(f"💵 USDT Balance: {self.usdt_balance:.2f}")
-        
-        print(f"💲 Current Price: {current_price:.2f} USDT")
-        if 'ema_10' in latest and not pd.isna(latest['ema_10']):
-            print(f"📈 EMA 10: {latest['ema_10']:.2f}")
-        if 'ema_20' in latest and not pd.isna(latest['ema_20']):
-            print(f"📈 EMA 20: {latest['ema_20']:.2f}")
-        if 'rsi_14' in latest and not pd.isna(latest['rsi_14']):
-            print(f"📊 RSI 14: {latest['rsi_14']:.2f}")
+        fields = {
+            "price": float(latest['close']),
+            "portfolio_value": self.portfolio_value,
+            "initial_portfolio_value": self.initial_portfolio_value,
+            "position": self.position,
+            "entry_price": self.entry_price,
+            "usdt_balance": self.usdt_balance,
+        }
+        for column in ('ema_10', 'ema_20', 'rsi_14'):
+            if column in latest and not pd.isna(latest[column]):
+                fields[column] = float(latest[column])
         
         if self.strategy:
             signals = self.check_strategy_signals(self.strategy)
-            print(f"🎯 Entry Signal: {'✅ YES' if signals['entry'] else '❌ NO'}")
-            print(f"🎯 Exit Signal: {'✅ YES' if signals['exit'] else '❌ NO'}")
-            
-            allocation = self.strategy.get('allocation', 0)
-            print(f"⚙️  Allocation: {allocation}%")
-                
+            fields.update(
+                entry_signal=signals['entry'],
+                exit_signal=signals['exit'],
+                allocation=self.strategy.get('allocation', 0),
+                stop_loss=self.strategy.get('stop_loss', 0),
+                take_profit=self.strategy.get('take_profit', 0),
+            )
             if self.position > 0 and self.entry_price > 0:
-                stop_loss_percent = self.strategy.get('stop_loss', 0)
-                take_profit_percent = self.strategy.get('take_profit', 0)
-                stop_loss_price = self.entry_price * (1 - stop_loss_percent / 100)
-                take_profit_price = self.entry_price * (1 + take_profit_percent / 100)
-                
-                print(f"🛡️  Stop Loss: {stop_loss_percent}% (${stop_loss_price:.2f})")
-                print(f"🎯 Take Profit: {take_profit_percent}% (${take_profit_price:.2f})")
-            else:
-                print(f"🛡️  Stop Loss: {self.strategy.get('stop_loss', 0)}%")
-                print(f"🎯 Take Profit: {self.strategy.get('take_profit', 0)}%")
+                fields["stop_loss_price"] = self.entry_price * (1 - fields["stop_loss"] / 100)
+                fields["take_profit_price"] = self.entry_price * (1 + fields["take_profit"] / 100)
         
-        print(f"{'='*60}\n")
+        log.debug("📊 LIVE TRADING METRICS %s", fields, extra={"fields": fields})
 
     def _debug_log_status(self):
-        print(f"\n🔄 STATUS UPDATE - {datetime.now().strftime('%H:%M:%S')}")
-        print(f"Portfolio: {self.portfolio_value:.2f} USDT | Position: {self.position:.6f} | Price: {self.get_latest_data()['close']:.2f} USDT")
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+        log.debug("🔄 STATUS UPDATE - Portfolio: %.2f USDT | Position: %.6f | Price: %.2f USDT",
+                  self.portfolio_value, self.position, self.get_latest_data()['close'])
         
         if self.strategy:
             signals = self.check_strategy_signals(self.strategy)
             if signals['entry'] or signals['exit']:
-                print(f"🚨 TRADING SIGNAL: {'ENTRY' if signals['entry'] else 'EXIT'}")
-        print()
+                log.debug("🚨 TRADING SIGNAL: %s", 'ENTRY' if signals['entry'] else 'EXIT')
 
     def force_gui_refresh(self):
         self._force_portfolio_update()
@@ -637,7 +591,7 @@ class CryptoTrader:
 
     def _check_and_execute_trades(self):
         if not self.strategy:
-            print("⚠️ No strategy loaded for trading")
+            log.warning("⚠️ No strategy loaded for trading")
             return
             
         signals = self.check_strategy_signals(self.strategy)
@@ -645,14 +599,10 @@ class CryptoTrader:
         latest = self.get_latest_data()
         current_price = latest['close']
         
-        print(f"\n🔍 SIGNAL DEBUG:")
-        print(f"   Open: {latest['open']:.2f}")
-        print(f"   Close: {latest['close']:.2f}")
-        print(f"   Current Position: {self.position:.6f}")
-        print(f"   Entry Signal: {signals['entry']}")
-        print(f"   Exit Signal: {signals['exit']}")
+        log.debug("🔍 SIGNAL DEBUG: Open: %.2f | Close: %.2f | Position: %.6f | Entry: %s | Exit: %s",
+                  latest['open'], latest['close'], self.position, signals['entry'], signals['exit'])
         
-        if self.position > 0 and self.entry_price > 0:
+        if self.has_position() and self.entry_price > 0:
             stop_loss_percent = self.strategy.get('stop_loss', 0)
             take_profit_percent = self.strategy.get('take_profit', 0)
             
@@ -660,36 +610,26 @@ class CryptoTrader:
             take_profit_price = self.entry_price * (1 + take_profit_percent / 100)
             
             if current_price <= stop_loss_price:
-                print(f"\n🛑 STOP LOSS TRIGGERED!")
-                print(f"   Entry Price: {self.entry_price:.2f}")
-                print(f"   Current Price: {current_price:.2f}")
-                print(f"   Stop Loss Price: {stop_loss_price:.2f}")
-                print(f"   Loss: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%")
-                self.add_log("strategy", f"🛑 STOP LOSS TRIGGERED! Loss: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%")
+                self.add_log("strategy", f"🛑 STOP LOSS TRIGGERED! Loss: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%",
+                             entry_price=self.entry_price, price=current_price, stop_loss_price=stop_loss_price)
                 self.sell_order()
                 return
             
             if current_price >= take_profit_price:
-                print(f"\n🎯 TAKE PROFIT TRIGGERED!")
-                print(f"   Entry Price: {self.entry_price:.2f}")
-                print(f"   Current Price: {current_price:.2f}")
-                print(f"   Take Profit Price: {take_profit_price:.2f}")
-                print(f"   Profit: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%")
-                self.add_log("strategy", f"🎯 TAKE PROFIT TRIGGERED! Profit: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%")
+                self.add_log("strategy", f"🎯 TAKE PROFIT TRIGGERED! Profit: {((current_price - self.entry_price) / self.entry_price) * 100:.2f}%",
+                             entry_price=self.entry_price, price=current_price, take_profit_price=take_profit_price)
                 self.sell_order()
                 return
         
-        if signals['entry'] and self.position == 0:
-            print(f"\n🎯 ENTRY SIGNAL DETECTED - Attempting to buy...")
+        if signals['entry'] and not self.has_position():
             self.add_log("strategy", f"🎯 ENTRY SIGNAL DETECTED - Attempting to buy...")
             self.buy_order()
             
-        elif signals['exit'] and self.position > 0:
-            print(f"\n🎯 EXIT SIGNAL DETECTED - Attempting to sell...")
+        elif signals['exit'] and self.has_position():
             self.add_log("strategy", f"🎯 EXIT SIGNAL DETECTED - Attempting to sell...")
             self.sell_order()
         else:
-            print(f"   No action taken - Position: {self.position:.6f}, Entry: {signals['entry']}, Exit: {signals['exit']}")
+            log.debug("No action taken - Position: %.6f, Entry: %s, Exit: %s", self.position, signals['entry'], signals['exit'])
 
     def _calculate_buffer_size(self):
         timeframe_minutes = self._timeframe_to_minutes(self.timeframe)
@@ -732,7 +672,7 @@ class CryptoTrader:
                     endTime=end_time
                 )
             except Exception as e:
-                print(f"API Error: {e}")
+                log.error("API Error: %s", e)
                 break
             
             if not klines:
@@ -764,6 +704,7 @@ class CryptoTrader:
         return final_df
     
     def add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        import ta
         for period in [10, 20, 50, 100, 200]:
             df[f"ema_{period}"] = df["close"].ewm(span=period).mean()
             df[f"sma_{period}"] = df["close"].rolling(window=period).mean()
@@ -789,14 +730,60 @@ class CryptoTrader:
         return df
 
     def initialize(self):
-        self.data_buffer = self.fetch_historical_data()
-        self.data_buffer = self.add_indicators(self.data_buffer)
+        self._load_lot_step()
+        if self.use_candle_bus:
+            self.candle_source = open_reader(self.symbol, self.timeframe)
+        if self.candle_source is not None:
+            self.data_buffer = self.candle_source.frame(self.buffer_size)
+            self.add_log("info", f"Reading {self.symbol} {self.timeframe} candles from the shared candle bus")
+        else:
+            self.data_buffer = self.fetch_historical_data()
+            self.data_buffer = self.add_indicators(self.data_buffer)
+            self._start_candle_feed()
         self.last_candle_time = self.data_buffer.index[-1]
-        print(f"✅ Initialized with {len(self.data_buffer)} candles")
-        print(f"Latest candle: {self.last_candle_time}")
-        print(f"Latest close price: ${self.data_buffer['close'].iloc[-1]:.2f}")
+        log.debug("✅ Initialized with %d candles | Latest candle: %s | Latest close price: $%.2f",
+                  len(self.data_buffer), self.last_candle_time, self.data_buffer['close'].iloc[-1])
+
+    def _load_lot_step(self):
+        """Read the LOT_SIZE step up front so fee dust left by an earlier run is not taken for a position"""
+        try:
+            symbol_info = self.trading_client.get_symbol_info(self.symbol) or {}
+            lot_size_filter = next((f for f in symbol_info.get('filters', []) if f['filterType'] == 'LOT_SIZE'), None)
+            if lot_size_filter:
+                self.lot_step = float(lot_size_filter['stepSize'])
+        except Exception as e:
+            log.warning("⚠️ Could not read LOT_SIZE for %s: %s", self.symbol, e)
+
+    def _start_candle_feed(self):
+        """Publish candles and indicators on the shared candle bus so other local processes skip the API"""
+        if not self.use_candle_bus:
+            return
+        try:
+            self.candle_feed = CandleRingWriter(self.symbol, self.timeframe, self.data_buffer.columns,
+                                                capacity=max(self.buffer_size, 4096))
+            self.candle_feed.publish_frame(self.data_buffer)
+        except Exception as e:
+            self.candle_feed = None
+            log.warning("⚠️ Candle bus unavailable for %s %s: %s", self.symbol, self.timeframe, e)
+
+    def _check_candle_bus(self):
+        source = self.candle_source
+        if source.replaced() or not source.writer_alive():
+            source.close()
+            self.candle_source = open_reader(self.symbol, self.timeframe)
+            if self.candle_source is None:
+                self.add_log("info", f"Candle bus feed for {self.symbol} stopped, fetching from the API")
+                self._start_candle_feed()
+                return self.check_for_new_candle()
+            source = self.candle_source
+        latest = source.window(1)
+        if len(latest) and pd.to_datetime(int(latest.timestamps[0]), unit='ms') > self.last_candle_time:
+            return latest
+        return False
 
     def check_for_new_candle(self):
+        if self.candle_source is not None:
+            return self._check_candle_bus()
         latest_klines = self.data_client.get_klines(
             symbol=self.symbol,
             interval=self.timeframe,
@@ -813,6 +800,12 @@ class CryptoTrader:
         return False
     
     def update_with_new_candle(self, new_candle):
+        if self.candle_source is not None:
+            self.data_buffer = self.candle_source.frame(self.buffer_size)
+            self.last_candle_time = self.data_buffer.index[-1]
+            bus.publish("candle")
+            return True
+
         df = pd.DataFrame([new_candle], columns=[
             'timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time',
             'quote_asset_volume', 'number_of_trades', 'taker_buy_base_asset_volume',
@@ -827,8 +820,11 @@ class CryptoTrader:
         self.data_buffer = self.data_buffer.tail(self.buffer_size)
         self.data_buffer = self.add_indicators(self.data_buffer)
         self.last_candle_time = df.index[0]
+        if self.candle_feed is not None:
+            self.candle_feed.append(self.last_candle_time, self.data_buffer.iloc[-1])
+        bus.publish("candle")
         
-        print(f"📊 New candle: {self.last_candle_time} | Close: ${self.data_buffer['close'].iloc[-1]:.2f}")
+        log.debug("📊 New candle: %s | Close: $%.2f", self.last_candle_time, self.data_buffer['close'].iloc[-1])
         
         return True
     
@@ -836,14 +832,14 @@ class CryptoTrader:
         return self.data_buffer.iloc[-1]
 
     def get_portfolio_value(self):
-        current_time = time.time()
+        current_time = self.clock()
         
         if current_time - self.last_account_update > 300:
             try:
-                server_time = self._get_server_time()
-                local_time = int(time.time() * 1000)
-                time_diff = local_time - server_time
-                print(f"🕐 Before portfolio value update - Server: {server_time}, Local: {local_time}, Diff: {time_diff}ms")
+                if log.isEnabledFor(logging.DEBUG):
+                    server_time = self._get_server_time()
+                    local_time = int(time.time() * 1000)
+                    log.debug("🕐 Before portfolio value update - Server: %s, Local: %s, Diff: %sms", server_time, local_time, local_time - server_time)
                 
                 account = self.trading_client.get_account()
                 total_balance = 0
@@ -870,11 +866,15 @@ class CryptoTrader:
                 server_time = self._get_server_time()
                 local_time = int(time.time() * 1000)
                 time_diff = local_time - server_time
-                print(f"⚠️ Failed to update portfolio value: {e}")
-                print(f"🕐 Error timestamps - Server: {server_time}, Local: {local_time}, Diff: {time_diff}ms")
+                log.warning("⚠️ Failed to update portfolio value: %s", e)
+                log.warning("🕐 Error timestamps - Server: %s, Local: %s, Diff: %sms", server_time, local_time, time_diff)
         
         return self.portfolio_value
     
+    def has_position(self) -> bool:
+        """Balances below one lot step (fee dust left after a sell) cannot be sold and do not count as a position"""
+        return self.position > 0 and self.position >= self.lot_step
+
     def get_actual_position(self):
         try:
             account = self.trading_client.get_account()
@@ -894,204 +894,199 @@ class CryptoTrader:
     def buy_order(self, quantity=None):
         if quantity is None:
             if not self.strategy:
-                print("❌ No strategy loaded for allocation calculation")
+                log.warning("❌ No strategy loaded for allocation calculation")
                 return None
             
             allocation = self.strategy.get('allocation', 0) / 100.0
             if allocation <= 0:
-                print("❌ Invalid allocation percentage")
+                log.warning("❌ Invalid allocation percentage")
                 return None
             
             if self.usdt_balance <= 0:
-                print("❌ No USDT balance available")
+                log.warning("❌ No USDT balance available")
                 return None
             
             current_price = self.get_latest_data()['close'] if hasattr(self, 'data_buffer') and self.data_buffer is not None else 0
             if current_price <= 0:
-                print("❌ Unable to get current price")
+                log.warning("❌ Unable to get current price")
                 return None
             
 
             usdt_to_spend = self.usdt_balance * allocation * 0.99
             quantity = usdt_to_spend / current_price
             try:
-                exchange_info = self.trading_client.get_exchange_info()
+                with metrics.span("exchange_info"):
+                    exchange_info = self.trading_client.get_exchange_info()
                 symbol_info = next((s for s in exchange_info['symbols'] if s['symbol'] == self.symbol), None)
                 if symbol_info:
                     filters = symbol_info['filters']
                     lot_size_filter = next((f for f in filters if f['filterType'] == 'LOT_SIZE'), None)
                     if lot_size_filter:
                         step_size = float(lot_size_filter['stepSize'])
-                        precision = len(str(step_size).split('.')[-1].rstrip('0'))
-                        quantity = round(quantity, precision)
+                        self.lot_step = step_size
+                        quantity = floor_to_step(quantity, step_size)
                     else:
                         quantity = round(quantity, 3)
                 else:
                     quantity = round(quantity, 3)
             except Exception as e:
-                print(f"⚠️ Could not get exchange info, using default precision: {e}")
+                log.warning("⚠️ Could not get exchange info, using default precision: %s", e)
                 quantity = round(quantity, 3)
             
-            print(f"💰 Buying with {allocation*100:.1f}% allocation: {usdt_to_spend:.2f} USDT")
-            print(f"💰 Calculated quantity: {quantity:.6f} (rounded to 3 decimals)")
+            log.debug("💰 Buying with %.1f%% allocation: %.2f USDT, quantity %.6f", allocation * 100, usdt_to_spend, quantity)
         
         if quantity <= 0:
-            print("❌ Invalid quantity: must be > 0")
+            log.warning("❌ Invalid quantity: must be > 0")
             return None
             
-        if self.position > 0:
-            print("⚠️ Already in position, skipping buy")
+        if self.has_position():
+            log.warning("⚠️ Already in position, skipping buy")
             return None
         
         try:
-            order = self.trading_client.order_market_buy(
-                symbol=self.symbol,
-                quantity=quantity
-            )
-            print(f"\n🟢 BUY ORDER EXECUTED!")
-            print(f"   Order ID: {order['orderId']}")
-            print(f"   Quantity: {quantity:.6f} {self.symbol.replace('USDT', '')}")
-            print(f"   Price: {self.data_buffer['close'].iloc[-1]:.2f} USDT")
-            print(f"   Value: {quantity * self.data_buffer['close'].iloc[-1]:.2f} USDT")
-            
-            self.add_log("trade", f"🟢 BUY ORDER EXECUTED! Order ID: {order['orderId']}")
-            self.add_log("trade", f"Quantity: {quantity:.6f} {self.symbol.replace('USDT', '')}")
-            self.add_log("trade", f"Price: {self.data_buffer['close'].iloc[-1]:.2f} USDT")
-            self.add_log("trade", f"Value: {quantity * self.data_buffer['close'].iloc[-1]:.2f} USDT")
-            
-            current_price = self.data_buffer['close'].iloc[-1]
-            transaction = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "symbol": self.symbol.replace('USDT', ''),
-                "quantity": f"{quantity:.6f}",
-                "price": f"{current_price:.2f}",
-                "type": "BUY",
-                "value": f"{quantity * current_price:.2f}",
-                "order_id": order['orderId']
-            }
-            self.transactions.append(transaction)
-            if len(self.transactions) > 20:
-                self.transactions = self.transactions[-20:]
-            
-            self._force_portfolio_update()
-            
-            
-            if self.position > 0:  
-                self.entry_price = current_price
-                self.add_log("info", f"Entry price set: {self.entry_price:.2f} USDT")
-            
-            self.add_log("portfolio", f"Portfolio updated after buy: {self.portfolio_value:.2f} USDT")
-            
-            notification_msg = f"🟢 BUY ORDER EXECUTED!\n{self.symbol.replace('USDT', '')}: {quantity:.6f} @ ${current_price:.2f}\nValue: ${quantity * current_price:.2f} USDT"
-            self.push_notification(notification_msg)
-            
-            return order
+            with metrics.span("order_submit"):
+                order = self.trading_client.order_market_buy(
+                    symbol=self.symbol,
+                    quantity=quantity
+                )
         except Exception as e:
             self.add_log("error", f"❌ BUY ORDER FAILED: {e}")
-            print(f"\n❌ BUY ORDER FAILED: {e}")
             return None
+
+        current_price = self.data_buffer['close'].iloc[-1]
+        self.position = float(order.get('executedQty', quantity))
+        self.entry_price = current_price
+        self.post_trade.submit(self._record_buy, order, quantity, current_price, retries=1)
+        self._pending_reconcile, self._reconcile_attempts = "buy", 0
+        return order
+
+    def _record_buy(self, order, quantity, current_price):
+        self.add_log("trade", f"🟢 BUY ORDER EXECUTED! Order ID: {order['orderId']} | {quantity:.6f} {self.symbol.replace('USDT', '')} @ {current_price:.2f} USDT | Value: {quantity * current_price:.2f} USDT",
+                     side="BUY", order_id=order['orderId'], quantity=quantity, price=current_price)
+        self.add_log("info", f"Entry price set: {current_price:.2f} USDT")
+        
+        self.ledger.record(
+            "BUY", self.symbol, self.strategy.get('strategy_id', 'manual') if self.strategy else 'manual',
+            quantity, current_price, order_id=order['orderId'], ts=self.clock()
+        )
+        bus.publish("fill")
+        
+        notification_msg = f"🟢 BUY ORDER EXECUTED!\n{self.symbol.replace('USDT', '')}: {quantity:.6f} @ ${current_price:.2f}\nValue: ${quantity * current_price:.2f} USDT"
+        self.push_notification(notification_msg)
+
+    def _reconcile_portfolio(self):
+        """Sync balances with the exchange at the start of the tick after an order
+
+        Runs on the trading thread, so it never races buy/sell or the stop-loss/take-profit checks. A failed
+        update stays pending for the next tick. A buy whose fill is not in the balance yet keeps the local
+        position and entry price for up to RECONCILE_TICKS ticks instead of dropping SL/TP protection.
+        """
+        side = self._pending_reconcile
+        filled = self.position
+        with metrics.span("portfolio_refresh"):
+            updated = self._force_portfolio_update()
+        if not updated:
+            return
+        self._reconcile_attempts += 1
+        if side == "buy" and filled > 0 and not self.has_position() and self._reconcile_attempts < RECONCILE_TICKS:
+            self.position = filled
+            return
+        self._pending_reconcile = None
+        if not self.has_position():
+            self.entry_price = 0
+        self._publish_balance_if_changed()
+        self.add_log("portfolio", f"Portfolio updated after {side}: {self.portfolio_value:.2f} USDT")
     
     def sell_order(self, quantity=None):
         if quantity is None:
-            if self.position <= 0:
-                print("❌ No position to sell")
+            if not self.has_position():
+                log.warning("❌ No position to sell")
                 return None
             quantity = self.position
             
             try:
-                exchange_info = self.trading_client.get_exchange_info()
+                with metrics.span("exchange_info"):
+                    exchange_info = self.trading_client.get_exchange_info()
                 symbol_info = next((s for s in exchange_info['symbols'] if s['symbol'] == self.symbol), None)
                 if symbol_info:
                     filters = symbol_info['filters']
                     lot_size_filter = next((f for f in filters if f['filterType'] == 'LOT_SIZE'), None)
                     if lot_size_filter:
                         step_size = float(lot_size_filter['stepSize'])
-                        precision = len(str(step_size).split('.')[-1].rstrip('0'))
-                        quantity = round(quantity, precision)
+                        self.lot_step = step_size
+                        quantity = floor_to_step(quantity, step_size)
                     else:
                         quantity = round(quantity, 3)
                 else:
                     quantity = round(quantity, 3)
             except Exception as e:
-                print(f"⚠️ Could not get exchange info for sell, using default precision: {e}")
+                log.warning("⚠️ Could not get exchange info for sell, using default precision: %s", e)
                 quantity = round(quantity, 3)
             
-            print(f"💰 Selling entire position: {quantity:.6f} {self.symbol.replace('USDT', '')}")
+            log.debug("💰 Selling entire position: %.6f %s", quantity, self.symbol.replace('USDT', ''))
         
         if quantity <= 0:
-            print("❌ Invalid quantity: must be > 0")
+            log.warning("❌ Invalid quantity: must be > 0")
             return None
             
         if self.position < quantity:
-            print(f"❌ Insufficient position: {self.position:.6f} < {quantity:.6f}")
+            log.warning("❌ Insufficient position: %.6f < %.6f", self.position, quantity)
             return None
             
+        current_price = self.data_buffer['close'].iloc[-1]
         try:
-            current_price = self.data_buffer['close'].iloc[-1]
-            order = self.trading_client.order_market_sell(
-                symbol=self.symbol,
-                quantity=quantity
-            )
-            print(f"\n🔴 SELL ORDER EXECUTED!")
-            print(f"   Order ID: {order['orderId']}")
-            print(f"   Quantity: {quantity:.6f} {self.symbol.replace('USDT', '')}")
-            print(f"   Price: {current_price:.2f} USDT")
-            print(f"   Value: {quantity * current_price:.2f} USDT")
-            
-            self.add_log("trade", f"🔴 SELL ORDER EXECUTED! Order ID: {order['orderId']}")
-            self.add_log("trade", f"Quantity: {quantity:.6f} {self.symbol.replace('USDT', '')}")
-            self.add_log("trade", f"Price: {current_price:.2f} USDT")
-            self.add_log("trade", f"Value: {quantity * current_price:.2f} USDT")
-            
-            position_pnl_percent = 0
-            position_pnl_value = 0
-            if self.entry_price > 0:
-                position_pnl_percent = ((current_price - self.entry_price) / self.entry_price) * 100
-                position_pnl_value = (current_price - self.entry_price) * quantity
-                print(f"   P&L: {position_pnl_percent:+.2f}% ({position_pnl_value:+.2f} USDT)")
-                self.add_log("trade", f"P&L: {position_pnl_percent:+.2f}% ({position_pnl_value:+.2f} USDT)")
-            
-            total_pnl_percent = 0
-            total_pnl_value = 0
-            if self.initial_portfolio_value > 0:
-                total_pnl_percent = ((self.portfolio_value - self.initial_portfolio_value) / self.initial_portfolio_value) * 100
-                total_pnl_value = self.portfolio_value - self.initial_portfolio_value
-            
-            transaction = {
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "symbol": self.symbol.replace('USDT', ''),
-                "quantity": f"{quantity:.6f}",
-                "price": f"{current_price:.2f}",
-                "type": "SELL",
-                "value": f"{quantity * current_price:.2f}",
-                "order_id": order['orderId'],
-                "pnl": f"{position_pnl_percent:+.2f}%",
-                "pnl_value": f"{position_pnl_value:+.2f}"
-            }
-            self.transactions.append(transaction)
-            if len(self.transactions) > 20:
-                self.transactions = self.transactions[-20:]
-            
-            self._force_portfolio_update()
-            
-            if self.position == 0:  
-                self.entry_price = 0
-                self.add_log("info", f"Entry price reset - position closed")
-            
-            self.add_log("portfolio", f"Portfolio updated after sell: {self.portfolio_value:.2f} USDT")
-            
-            position_pnl_text = f"P&L: {position_pnl_percent:+.2f}% (${position_pnl_value:+.2f})" if position_pnl_percent != 0 else "P&L: N/A"
-            total_pnl_text = f"P&L: {total_pnl_percent:+.2f}% (${total_pnl_value:+.2f})" if total_pnl_percent != 0 else "Total P&L: N/A"
-            notification_msg = f"🔴 SELL ORDER EXECUTED!\n{self.symbol.replace('USDT', '')}: {quantity:.6f} @ ${current_price:.2f}\nValue: ${quantity * current_price:.2f} USDT\nPosition P&L: {position_pnl_text}\nTotal P&L: {total_pnl_text}"
-            self.push_notification(notification_msg)
-            
-            return order
+            with metrics.span("order_submit"):
+                order = self.trading_client.order_market_sell(
+                    symbol=self.symbol,
+                    quantity=quantity
+                )
         except Exception as e:
             self.add_log("error", f"❌ SELL ORDER FAILED: {e}")
-            print(f"\n❌ SELL ORDER FAILED: {e}")
             return None
+
+        entry_price = self.entry_price
+        self.position = max(self.position - float(order.get('executedQty', quantity)), 0)
+        if not self.has_position():
+            self.entry_price = 0
+        self.post_trade.submit(self._record_sell, order, quantity, current_price, entry_price, retries=1)
+        self._pending_reconcile, self._reconcile_attempts = "sell", 0
+        return order
+
+    def _record_sell(self, order, quantity, current_price, entry_price):
+        self.add_log("trade", f"🔴 SELL ORDER EXECUTED! Order ID: {order['orderId']} | {quantity:.6f} {self.symbol.replace('USDT', '')} @ {current_price:.2f} USDT | Value: {quantity * current_price:.2f} USDT",
+                     side="SELL", order_id=order['orderId'], quantity=quantity, price=current_price)
+        
+        position_pnl_percent = 0
+        position_pnl_value = 0
+        if entry_price > 0:
+            position_pnl_percent = ((current_price - entry_price) / entry_price) * 100
+            position_pnl_value = (current_price - entry_price) * quantity
+            self.add_log("trade", f"P&L: {position_pnl_percent:+.2f}% ({position_pnl_value:+.2f} USDT)")
+        
+        total_pnl_percent = 0
+        total_pnl_value = 0
+        if self.initial_portfolio_value > 0:
+            total_pnl_percent = ((self.portfolio_value - self.initial_portfolio_value) / self.initial_portfolio_value) * 100
+            total_pnl_value = self.portfolio_value - self.initial_portfolio_value
+        
+        self.ledger.record(
+            "SELL", self.symbol, self.strategy.get('strategy_id', 'manual') if self.strategy else 'manual',
+            quantity, current_price, order_id=order['orderId'],
+            pnl_pct=position_pnl_percent if entry_price > 0 else None,
+            pnl_value=position_pnl_value if entry_price > 0 else None, ts=self.clock()
+        )
+        bus.publish("fill")
+        
+        position_pnl_text = f"P&L: {position_pnl_percent:+.2f}% (${position_pnl_value:+.2f})" if position_pnl_percent != 0 else "P&L: N/A"
+        total_pnl_text = f"P&L: {total_pnl_percent:+.2f}% (${total_pnl_value:+.2f})" if total_pnl_percent != 0 else "Total P&L: N/A"
+        notification_msg = f"🔴 SELL ORDER EXECUTED!\n{self.symbol.replace('USDT', '')}: {quantity:.6f} @ ${current_price:.2f}\nValue: ${quantity * current_price:.2f} USDT\nPosition P&L: {position_pnl_text}\nTotal P&L: {total_pnl_text}"
+        self.push_notification(notification_msg)
     
     def check_strategy_signals(self, strategy):
+        with metrics.span("rule_eval"):
+            return self._evaluate_rules(strategy)
+
+    def _evaluate_rules(self, strategy):
         latest_data = self.data_buffer.tail(10)
         safe_ns = {"df": latest_data, "np": np}
         
@@ -1112,29 +1107,9 @@ class CryptoTrader:
             }
             
         except Exception as e:
-            print(f"Error evaluating strategy rules: {e}")
+            log.error("Error evaluating strategy rules: %s", e)
             return {'entry': False, 'exit': False}
 
     def push_notification(self, message):
-        """Send a push notification via ntfy"""
-        try:
-            ntfy_topic = os.getenv("NTFY_TOPIC")
-            ntfy_server = os.getenv("NTFY_SERVER", "https://ntfy.sh")
-            
-            if ntfy_topic:
-                ntfy_url = f"{ntfy_server}/{ntfy_topic}"
-                
-                full_message = f"🚀 {message}"
-                
-                response = requests.post(ntfy_url, data=full_message.encode(encoding='utf-8'))
-                if response.status_code == 200:
-                    print(f"📱 Push notification sent: {message}")
-                else:
-                    print(f"❌ Failed to send notification: {response.status_code} - {response.text}")
-            else:
-                print(f"⚠️ Push notification not configured: {message}")
-                
-        except Exception as e:
-            print(f"❌ Failed to send push notification: {e}")
-
-                
\ No newline at end of file
+        """Queue a push notification via ntfy without blocking"""
+        self.notifier.notify(f"🚀 {message}")
@@ -0,0 +1,165 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from logger import get_logger
+
+log = get_logger("tsdb")
+
+# (bucket seconds, retention seconds) for each rollup tier
+TIERS = ((60, 7 * 24 * 3600), (3600, 365 * 24 * 3600))
+
+
+class Bucket:
+    __slots__ = ("start", "open", "high", "low", "close", "total", "count")
+
+    def __init__(self, start: float, value: float):
+        self.start = start
+        self.open = self.high = self.low = self.close = value
+        self.total = value
+        self.count = 1
+
+    def add(self, value: float):
+        self.high = max(self.high, value)
+        self.low = min(self.low, value)
+        self.close = value
+        self.total += value
+        self.count += 1
+
+    def row(self, metric: str):
+        return (metric, self.start, self.open, self.high, self.low, self.close, self.total / self.count, self.count)
+
+
+class TimeSeriesStore:
+    """Embedded telemetry store: raw samples in memory, 1m/1h OHLC rollups compacted into SQLite"""
+
+    def __init__(self, path: str = "output/telemetry.db", raw_retention: float = 6 * 3600,
+                 raw_capacity: int = 20000, flush_interval: float = 30.0, clock=None):
+        self.path = path
+        self.clock = clock or time.time
+        self.raw_retention = raw_retention
+        self.raw_capacity = raw_capacity
+        self.flush_interval = flush_interval
+        self.raw = {}
+        self.open_buckets = {}
+        self.closed = []
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._conn:
+            for seconds, _ in TIERS:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS rollup_{seconds} ("
+                    "metric TEXT NOT NULL, ts REAL NOT NULL, open REAL, high REAL, low REAL, close REAL, "
+                    "mean REAL, count INTEGER, PRIMARY KEY (metric, ts))"
+                )
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tsdb-compactor", daemon=True)
+        self._thread.start()
+
+    def write(self, metric: str, value: float, ts: float = None):
+        """O(1) in-memory append; rollups are flushed to disk by the compactor thread"""
+        ts = self.clock() if ts is None else ts
+        value = float(value)
+        with self._lock:
+            series = self.raw.get(metric)
+            if series is None:
+                series = self.raw[metric] = deque(maxlen=self.raw_capacity)
+            series.append((ts, value))
+            for seconds, _ in TIERS:
+                start = ts - ts % seconds
+                key = (metric, seconds)
+                bucket = self.open_buckets.get(key)
+                if bucket is None or bucket.start != start:
+                    if bucket is not None:
+                        self.closed.append((seconds, bucket.row(metric)))
+                    self.open_buckets[key] = Bucket(start, value)
+                else:
+                    bucket.add(value)
+
+    def write_many(self, values: dict, ts: float = None):
+        ts = self.clock() if ts is None else ts
+        for metric, value in values.items():
+            self.write(metric, value, ts)
+
+    def query(self, metric: str, start: float, end: float = None, resolution: int = None) -> list:
+        """(ts, value) points; picks raw, 1m or 1h resolution from how far back start is"""
+        end = math.inf if end is None else end
+        if resolution is None:
+            resolution = self._resolution_for(start)
+        if resolution == 0:
+            with self._lock:
+                series = list(self.raw.get(metric, ()))
+            return [(ts, value) for ts, value in series if start <= ts < end]
+
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT ts, close FROM rollup_{resolution} WHERE metric = ? AND ts >= ? AND ts < ? ORDER BY ts",
+                (metric, start - start % resolution, end),
+            ).fetchall()
+        with self._lock:
+            bucket = self.open_buckets.get((metric, resolution))
+            if bucket is not None and start <= bucket.start < end:
+                rows.append((bucket.start, bucket.close))
+        return rows
+
+    def _resolution_for(self, start: float) -> int:
+        age = self.clock() - start
+        if age <= self.raw_retention:
+            return 0
+        for seconds, retention in TIERS:
+            if age <= retention:
+                return seconds
+        return TIERS[-1][0]
+
+    def flush(self):
+        """Write closed buckets, merging into any row saved for the same bucket before a restart"""
+        with self._lock:
+            closed, self.closed = self.closed, []
+        if not closed:
+            return
+        with self._db_lock, self._conn:
+            for seconds, row in closed:
+                self._conn.execute(
+                    f"INSERT INTO rollup_{seconds} (metric, ts, open, high, low, close, mean, count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (metric, ts) DO UPDATE SET "
+                    "high = MAX(high, excluded.high), low = MIN(low, excluded.low), close = excluded.close, "
+                    "mean = (mean * count + excluded.mean * excluded.count) / (count + excluded.count), "
+                    "count = count + excluded.count",
+                    row,
+                )
+
+    def compact(self):
+        """Flush closed buckets and drop raw samples and rollups past their retention"""
+        now = self.clock()
+        self.flush()
+        with self._lock:
+            for series in self.raw.values():
+                while series and series[0][0] < now - self.raw_retention:
+                    series.popleft()
+        with self._db_lock, self._conn:
+            for seconds, retention in TIERS:
+                self._conn.execute(f"DELETE FROM rollup_{seconds} WHERE ts < ?", (now - retention,))
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.compact()
+            except Exception as e:
+                log.error("Telemetry compaction failed: %s", e)
+
+    def close(self):
+        """Stop the compactor and persist everything, including the buckets still open"""
+        self._stop.set()
+        with self._lock:
+            self.closed.extend((seconds, bucket.row(metric)) for (metric, seconds), bucket in self.open_buckets.items())
+            self.open_buckets.clear()
+        self.compact()
+        with self._db_lock:
+            self._conn.close()
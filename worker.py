@@ -0,0 +1,63 @@
+import queue
+import threading
+import time
+
+from logger import get_logger
+
+log = get_logger("worker")
+
+
+class BackgroundWorker:
+    """Bounded job queue drained by a daemon thread, with retry and backoff"""
+
+    def __init__(self, name: str = "worker", max_queue: int = 100, retries: int = 3, backoff: float = 1.0):
+        self.name = name
+        self.retries = retries
+        self.backoff = backoff
+        self.jobs = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, retries: int = None, **kwargs) -> bool:
+        """Queue a job without blocking; returns False if the queue is full"""
+        attempts = self.retries if retries is None else retries
+        try:
+            self.jobs.put_nowait((fn, args, kwargs, attempts))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            log.warning("⚠️ %s queue full, dropped job %s", self.name, getattr(fn, '__name__', fn))
+            return False
+
+    def join(self, timeout: float = None) -> bool:
+        """Wait until every queued job has finished; returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.jobs.unfinished_tasks:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run(self):
+        while True:
+            fn, args, kwargs, attempts = self.jobs.get()
+            try:
+                self._execute(fn, args, kwargs, attempts)
+            finally:
+                self.jobs.task_done()
+
+    def _execute(self, fn, args, kwargs, attempts):
+        for attempt in range(1, attempts + 1):
+            try:
+                fn(*args, **kwargs)
+                return
+            except Exception as e:
+                if attempt == attempts:
+                    self.failed += 1
+                    log.error("❌ %s job %s failed after %d attempts: %s", self.name, getattr(fn, '__name__', fn), attempts, e)
+                    return
+                delay = self.backoff * (2 ** (attempt - 1))
+                log.warning("⚠️ %s job %s failed (%s), retrying in %.1fs", self.name, getattr(fn, '__name__', fn), e, delay)
+                time.sleep(delay)